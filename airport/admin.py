@@ -1,4 +1,7 @@
+from django import forms
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
 from airport.models import (
     Country,
@@ -9,17 +12,146 @@ from airport.models import (
     Airplane,
     Crew,
     Flight,
+    FlightSchedule,
     Order,
-    Ticket
+    Ticket,
+    Seat
 )
+from airport.crew_schedule import flight_crew_errors
+from airport.pagination import EstimatedCountPaginator
 
-admin.site.register(Country)
-admin.site.register(City)
-admin.site.register(Airport)
-admin.site.register(Route)
-admin.site.register(AirplaneType)
-admin.site.register(Airplane)
-admin.site.register(Crew)
-admin.site.register(Flight)
-admin.site.register(Order)
-admin.site.register(Ticket)
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist of a table too big for an exact ``COUNT(*)`` per page"""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Country)
+class CountryAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(City)
+class CityAdmin(admin.ModelAdmin):
+    list_display = ("name", "country")
+    list_select_related = ("country",)
+    search_fields = ("name",)
+    autocomplete_fields = ("country",)
+
+
+@admin.register(Airport)
+class AirportAdmin(admin.ModelAdmin):
+    list_display = ("name", "closest_big_city")
+    list_select_related = ("closest_big_city",)
+    search_fields = ("name",)
+    autocomplete_fields = ("closest_big_city",)
+
+
+@admin.register(Route)
+class RouteAdmin(admin.ModelAdmin):
+    list_display = ("id", "source", "destination", "distance")
+    search_fields = ("source__name", "destination__name")
+    autocomplete_fields = ("source", "destination")
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        # Route.__str__ reads both airports, also in the autocomplete results
+        return super().get_queryset(request).select_related("source", "destination")
+
+
+@admin.register(AirplaneType)
+class AirplaneTypeAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(Airplane)
+class AirplaneAdmin(admin.ModelAdmin):
+    list_display = ("name", "airplane_type", "rows", "seats_in_row")
+    list_select_related = ("airplane_type",)
+    search_fields = ("name",)
+    autocomplete_fields = ("airplane_type",)
+
+
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    list_display = ("first_name", "last_name")
+    search_fields = ("first_name", "last_name")
+
+
+class FlightAdminForm(forms.ModelForm):
+    def clean(self) -> dict:
+        cleaned_data = super().clean()
+        departure_time = cleaned_data.get("departure_time")
+        arrival_time = cleaned_data.get("arrival_time")
+        crews = cleaned_data.get("crews")
+        if departure_time and arrival_time and crews:
+            for error in flight_crew_errors(
+                self.instance.pk,
+                [crew.pk for crew in crews],
+                departure_time,
+                arrival_time
+            ):
+                self.add_error("crews", error)
+        return cleaned_data
+
+
+@admin.register(Flight)
+class FlightAdmin(LargeTableAdmin):
+    form = FlightAdminForm
+    list_display = ("id", "route", "airplane", "departure_time", "arrival_time")
+    search_fields = ("route__source__name", "route__destination__name")
+    autocomplete_fields = ("route", "airplane", "crews")
+    date_hierarchy = "departure_time"
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        # Flight.__str__ reads the route and its airports
+        return super().get_queryset(request).select_related(
+            "route__source",
+            "route__destination",
+            "airplane"
+        )
+
+
+@admin.register(FlightSchedule)
+class FlightScheduleAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "route",
+        "airplane",
+        "departure_time",
+        "start_date",
+        "end_date",
+        "generated_until"
+    )
+    list_select_related = ("route__source", "route__destination", "airplane")
+    autocomplete_fields = ("route", "airplane", "crews")
+    readonly_fields = ("generated_until",)
+
+
+class TicketInline(admin.TabularInline):
+    model = Ticket
+    raw_id_fields = ("flight",)
+    extra = 0
+
+
+@admin.register(Order)
+class OrderAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    date_hierarchy = "created_at"
+    inlines = (TicketInline,)
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "flight", "order", "row", "seat")
+    list_select_related = ("flight__route__source", "flight__route__destination", "order")
+    raw_id_fields = ("flight", "order")
+
+
+@admin.register(Seat)
+class SeatAdmin(LargeTableAdmin):
+    list_display = ("id", "flight_id", "row", "seat", "ticket_id")
+    raw_id_fields = ("flight", "ticket")
@@ -0,0 +1,154 @@
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from airport.models import Flight, FlightSearchRow, Order, Seat, Ticket
+
+ARCHIVED_MODELS = ("flights", "tickets", "orders")
+
+
+class ArchiveBatch(NamedTuple):
+    flights: int
+    tickets: int
+    orders: int
+
+
+def raw_delete(queryset: QuerySet) -> int:
+    """``DELETE ... WHERE`` in one statement, without the cascade collector
+    loading the related rows and without signals"""
+    return queryset._raw_delete(queryset.db)
+
+
+def write_archive(path: Path, rows: list[dict]) -> None:
+    """Write the rows to a complete gzip file on disk.
+
+    The file is written under a temporary name, synced and renamed into
+    place, so an archive file is never a truncated one, and it is on disk
+    before the rows are deleted.
+    """
+    temporary = path.with_name(f"{path.name}.tmp")
+    with open(temporary, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            for row in rows:
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder).encode())
+                archive.write(b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(temporary, path)
+    if os.name == "posix":
+        # Makes the rename itself durable
+        directory = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+def archive_batch(
+        flight_ids: list[int],
+        paths: dict[str, Path]
+) -> tuple[ArchiveBatch, list[Path]]:
+    """Write the flights, their tickets and the orders left without tickets
+    to the archive files of the batch, then delete them with set-based
+    deletes. Returns the counts and the files written, there is none for
+    rows the batch doesn't have.
+
+    Orders that still have tickets of other flights are kept, they are
+    archived and deleted with their last ticket. If the transaction fails
+    after the files are written, the rows stay and the next run archives
+    them again.
+    """
+    with transaction.atomic():
+        flights = list(
+            Flight.objects.select_for_update().filter(pk__in=flight_ids).order_by("pk").values()
+        )
+        crews = {}
+        for flight_id, crew_id in Flight.crews.through.objects.filter(
+            flight_id__in=flight_ids
+        ).values_list("flight_id", "crew_id"):
+            crews.setdefault(flight_id, []).append(crew_id)
+        for flight in flights:
+            flight["crews"] = crews.get(flight["id"], [])
+
+        tickets = list(Ticket.objects.filter(flight_id__in=flight_ids).order_by("pk").values())
+        order_ids = {ticket["order_id"] for ticket in tickets}
+        orders = list(
+            Order.objects.filter(pk__in=order_ids).exclude(
+                tickets__in=Ticket.objects.filter(order_id__in=order_ids).exclude(
+                    flight_id__in=flight_ids
+                )
+            ).order_by("pk").values()
+        )
+
+        written = []
+        for name, rows in (("flights", flights), ("tickets", tickets), ("orders", orders)):
+            if rows:
+                write_archive(paths[name], rows)
+                written.append(paths[name])
+
+        # Rows referencing the flights and tickets go first
+        raw_delete(FlightSearchRow.objects.filter(flight_id__in=flight_ids))
+        raw_delete(Seat.objects.filter(flight_id__in=flight_ids))
+        raw_delete(Flight.crews.through.objects.filter(flight_id__in=flight_ids))
+        raw_delete(Ticket.objects.filter(flight_id__in=flight_ids))
+        raw_delete(Order.objects.filter(pk__in=[order["id"] for order in orders]))
+        raw_delete(Flight.objects.filter(pk__in=flight_ids))
+    return ArchiveBatch(len(flights), len(tickets), len(orders)), written
+
+
+def archive_paths(directory: Path, stamp: str, batch: int) -> dict[str, Path]:
+    return {
+        name: directory / f"{name}-{stamp}-{batch:05d}.jsonl.gz"
+        for name in ARCHIVED_MODELS
+    }
+
+
+def archive_flights(
+        before: datetime,
+        directory: Path,
+        batch_size: int = 500,
+        pause: float = 0.5,
+        max_batches: Optional[int] = None,
+        progress: Optional[Callable[[ArchiveBatch], None]] = None
+) -> tuple[ArchiveBatch, list[Path]]:
+    """Move the flights that departed before ``before`` to gzipped JSON lines
+    files in ``directory``, ``batch_size`` flights per transaction and set
+    of files. Returns the totals and the files written.
+
+    Each batch locks and deletes a bounded number of rows, and the loop
+    sleeps ``pause`` seconds between batches, at least as long as the batch
+    took, so concurrent requests get the database most of the time.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = f"before-{before:%Y%m%d}-{timezone.now():%Y%m%d%H%M%S}"
+    flight_qs = Flight.objects.filter(departure_time__lt=before).order_by("departure_time", "pk")
+    flights = tickets = orders = batches = 0
+    written = []
+
+    elapsed = 0.0
+    while max_batches is None or batches < max_batches:
+        flight_ids = list(flight_qs.values_list("pk", flat=True)[:batch_size])
+        if not flight_ids:
+            break
+        if batches:
+            time.sleep(max(pause, elapsed))
+        started = time.monotonic()
+        batch, paths = archive_batch(flight_ids, archive_paths(directory, stamp, batches))
+        elapsed = time.monotonic() - started
+        flights += batch.flights
+        tickets += batch.tickets
+        orders += batch.orders
+        batches += 1
+        written += paths
+        if progress:
+            progress(batch)
+    return ArchiveBatch(flights, tickets, orders), written
@@ -0,0 +1,109 @@
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Min, OuterRef, Subquery, Sum
+from django.db.models.expressions import CombinedExpression
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from airport.models import Flight, Ticket
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def months(start: date, end: date) -> Iterator[date]:
+    month = month_start(start)
+    while month <= end:
+        yield month
+        month = next_month(month)
+
+
+def calendar_cache_key(route_id: int, month: date) -> str:
+    return f"flight-calendar:{route_id}:{month:%Y-%m}"
+
+
+def available_seats() -> CombinedExpression:
+    """Free seats of a flight, tickets are counted in a subquery so the
+    expression can be aggregated over flights"""
+    tickets_sold = Ticket.objects.filter(
+        flight=OuterRef("pk")
+    ).order_by().values("flight").annotate(count=Count("pk")).values("count")
+    return (
+        F("airplane__rows") * F("airplane__seats_in_row")
+        - Coalesce(Subquery(tickets_sold), 0)
+    )
+
+
+def aggregate_days(route_id: int, start: date, end: date) -> dict[str, dict]:
+    """Flights and available seats per departure day in ``[start, end)``,
+    one ``GROUP BY`` over the flights of the route"""
+    days = Flight.objects.filter(
+        route_id=route_id,
+        departure_time__gte=timezone.make_aware(datetime.combine(start, time.min)),
+        departure_time__lt=timezone.make_aware(datetime.combine(end, time.min))
+    ).annotate(
+        available=available_seats()
+    ).order_by().values(
+        day=TruncDate("departure_time")
+    ).annotate(
+        flights=Count("pk"),
+        min_available_seats=Min("available"),
+        total_available_seats=Sum("available")
+    )
+    return {
+        row.pop("day").isoformat(): row for row in days
+    }
+
+
+def month_days(route_id: int, requested_months: list[date]) -> dict[str, dict]:
+    """Aggregated days of whole months, from the cache when possible.
+
+    Missing months are aggregated together and cached one by one for
+    ``FLIGHT_CALENDAR_CACHE_TIMEOUT`` seconds.
+    """
+    keys = {calendar_cache_key(route_id, month): month for month in requested_months}
+    cached = cache.get_many(keys)
+    missing = [month for key, month in keys.items() if key not in cached]
+
+    days = {}
+    for month_data in cached.values():
+        days.update(month_data)
+    if missing:
+        computed = aggregate_days(route_id, missing[0], next_month(missing[-1]))
+        by_month = {calendar_cache_key(route_id, month): {} for month in missing}
+        for day, row in computed.items():
+            key = calendar_cache_key(route_id, date.fromisoformat(day))
+            if key in by_month:
+                by_month[key][day] = row
+        cache.set_many(by_month, settings.FLIGHT_CALENDAR_CACHE_TIMEOUT)
+        for month_data in by_month.values():
+            days.update(month_data)
+    return days
+
+
+def route_calendar(route_id: Optional[int], start: date, end: date) -> list[dict]:
+    """Every day from ``start`` to ``end`` with its flight count and the
+    minimum and total available seats of these flights"""
+    days = month_days(route_id, list(months(start, end))) if route_id else {}
+    calendar = []
+    day = start
+    while day <= end:
+        row = days.get(day.isoformat(), {})
+        calendar.append(
+            {
+                "date": day,
+                "flights": row.get("flights", 0),
+                "min_available_seats": row.get("min_available_seats"),
+                "total_available_seats": row.get("total_available_seats") or 0
+            }
+        )
+        day += timedelta(days=1)
+    return calendar
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import CharField, F, Value
+from django.utils import timezone
+
+from airport.availability import available_seats
+from airport.models import Airport, Flight
+
+BOARD_FIELDS = (
+    "id",
+    "kind",
+    "source",
+    "destination",
+    "airplane_name",
+    "departure_time",
+    "arrival_time",
+    "available_seats"
+)
+
+
+def board_flights(airport_id: int, size: int) -> list[dict]:
+    """Next ``size`` departures and arrivals of an airport in one query"""
+    now = timezone.now()
+    flight_qs = Flight.objects.annotate(
+        source=F("route__source__name"),
+        destination=F("route__destination__name"),
+        airplane_name=F("airplane__name"),
+        available_seats=available_seats()
+    )
+    departures = flight_qs.filter(
+        route__source_id=airport_id,
+        departure_time__gte=now
+    ).annotate(
+        kind=Value("departure", output_field=CharField())
+    ).order_by("departure_time", "id").values(*BOARD_FIELDS)[:size]
+    arrivals = flight_qs.filter(
+        route__destination_id=airport_id,
+        arrival_time__gte=now
+    ).annotate(
+        kind=Value("arrival", output_field=CharField())
+    ).order_by("arrival_time", "id").values(*BOARD_FIELDS)[:size]
+    return list(departures.union(arrivals, all=True))
+
+
+def build_board(airport_id: int) -> Optional[dict]:
+    airport = Airport.objects.filter(pk=airport_id).values("id", "name").first()
+    if airport is None:
+        return None
+
+    board = {**airport, "departures": [], "arrivals": []}
+    for flight in board_flights(airport_id, settings.AIRPORT_BOARD_SIZE):
+        flight["airplane"] = flight.pop("airplane_name")
+        board[f"{flight.pop('kind')}s"].append(flight)
+    board["departures"].sort(
+        key=lambda flight: (flight["departure_time"], flight["id"])
+    )
+    board["arrivals"].sort(
+        key=lambda flight: (flight["arrival_time"], flight["id"])
+    )
+    board["updated_at"] = timezone.now()
+    return board
+
+
+class BoardCache:
+    """Boards kept in process memory and served stale while refreshing.
+
+    A board older than ``AIRPORT_BOARD_TTL`` seconds is still returned and
+    refreshed by a background thread, so the pollers of an airport cost one
+    rebuild per interval. Boards older than ``AIRPORT_BOARD_MAX_STALE``
+    seconds, or not built yet, are rebuilt by the request, once for all the
+    requests waiting for it. Unknown airports are not cached.
+    """
+
+    def __init__(self) -> None:
+        self.boards: dict[int, tuple[float, Optional[dict]]] = {}
+        self.lock = threading.Lock()
+        self.building: dict[int, threading.Lock] = {}
+        self.refreshing: set[int] = set()
+
+    def get(self, airport_id: int) -> Optional[dict]:
+        entry = self.boards.get(airport_id)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < settings.AIRPORT_BOARD_TTL:
+                return entry[1]
+            if age < settings.AIRPORT_BOARD_MAX_STALE:
+                self.refresh_in_background(airport_id)
+                return entry[1]
+        return self.build(airport_id, entry)
+
+    def build(self, airport_id: int, seen: Optional[tuple] = None) -> Optional[dict]:
+        with self.lock:
+            building = self.building.setdefault(airport_id, threading.Lock())
+        with building:
+            entry = self.boards.get(airport_id)
+            if entry is not None and entry is not seen:
+                return entry[1]
+            board = build_board(airport_id)
+            if board is not None:
+                self.boards[airport_id] = (time.monotonic(), board)
+                return board
+            self.boards.pop(airport_id, None)
+        # Ids come from the URL, unknown ones must not leave a lock behind
+        with self.lock:
+            if self.building.get(airport_id) is building:
+                del self.building[airport_id]
+        return None
+
+    def refresh_in_background(self, airport_id: int) -> None:
+        with self.lock:
+            if airport_id in self.refreshing:
+                return
+            self.refreshing.add(airport_id)
+        threading.Thread(
+            target=self.refresh,
+            args=(airport_id, self.boards.get(airport_id)),
+            name=f"airport-board-{airport_id}",
+            daemon=True
+        ).start()
+
+    def refresh(self, airport_id: int, seen: Optional[tuple]) -> None:
+        try:
+            self.build(airport_id, seen)
+        finally:
+            with self.lock:
+                self.refreshing.discard(airport_id)
+            connection.close()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.boards.clear()
+
+
+board_cache = BoardCache()
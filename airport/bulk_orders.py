@@ -0,0 +1,182 @@
+from collections import defaultdict
+from typing import Optional
+
+from django.contrib.auth.models import AbstractBaseUser
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from airport.models import Flight, Order, Ticket
+from airport.purchase import get_purchase_strategy
+from airport.serializers import BulkOrderSerializer, TicketSerializer
+
+UNIQUE_SEAT_ERROR = "The fields row, seat, flight must make a unique set."
+
+
+def ticket_errors(
+        ticket: dict,
+        flight: Optional[Flight],
+        taken: set[tuple[int, int, int]]
+) -> dict:
+    if flight is None:
+        return {
+            "flight": [f"Invalid pk \"{ticket['flight']}\" - object does not exist."]
+        }
+    if flight.airplane is None:
+        return {"flight": [f"Flight {flight.pk} has no airplane to seat tickets in."]}
+    if "row" not in ticket:
+        return {}
+    try:
+        Ticket.validate_seat_and_row(
+            ticket["seat"],
+            ticket["row"],
+            flight,
+            ValidationError
+        )
+    except ValidationError as error:
+        return error.detail
+    if (flight.pk, ticket["row"], ticket["seat"]) in taken:
+        return {"non_field_errors": [UNIQUE_SEAT_ERROR]}
+    return {}
+
+
+def validate_orders(items: list) -> tuple[dict[int, list[dict]], dict[int, dict]]:
+    """Validate a batch of orders with one query for the flights and one
+    for the sold seats.
+
+    Returns the tickets of the valid orders and the errors of the others,
+    both by position in the batch. A seat requested twice goes to the first
+    order asking for it.
+    """
+    orders, errors = {}, {}
+    for index, item in enumerate(items):
+        serializer = BulkOrderSerializer(data=item)
+        if serializer.is_valid():
+            orders[index] = serializer.validated_data.get("tickets", [])
+        else:
+            errors[index] = serializer.errors
+
+    tickets = [ticket for order_tickets in orders.values() for ticket in order_tickets]
+    flights = Flight.objects.select_related("airplane").in_bulk(
+        {ticket["flight"] for ticket in tickets}
+    )
+    chosen = [ticket for ticket in tickets if "row" in ticket]
+    taken = set()
+    if chosen:
+        taken = set(
+            Ticket.objects.filter(
+                flight_id__in={ticket["flight"] for ticket in chosen},
+                row__in={ticket["row"] for ticket in chosen},
+                seat__in={ticket["seat"] for ticket in chosen}
+            ).values_list("flight_id", "row", "seat")
+        )
+
+    for index, order_tickets in list(orders.items()):
+        claimed = set()
+        order_errors = []
+        for ticket in order_tickets:
+            order_errors.append(
+                ticket_errors(ticket, flights.get(ticket["flight"]), taken | claimed)
+            )
+            if "row" in ticket:
+                claimed.add((ticket["flight"], ticket["row"], ticket["seat"]))
+        if any(order_errors):
+            errors[index] = {"tickets": order_errors}
+            del orders[index]
+            continue
+        taken |= claimed
+        for ticket in order_tickets:
+            ticket["flight"] = flights[ticket["flight"]]
+    return orders, errors
+
+
+def order_result(index: int, order: Order, tickets: list[Ticket]) -> dict:
+    return {
+        "index": index,
+        "status": status.HTTP_201_CREATED,
+        "order": {
+            "id": order.id,
+            "created_at": order.created_at,
+            "user": order.user_id,
+            "tickets": TicketSerializer(tickets, many=True).data
+        }
+    }
+
+
+def error_result(index: int, status_code: int, errors=None) -> dict:
+    result = {"index": index, "status": status_code}
+    if errors is not None:
+        result["errors"] = errors
+    return result
+
+
+def create_orders(
+        user: AbstractBaseUser,
+        items: list,
+        atomic: bool = False
+) -> tuple[list[dict], int]:
+    """Create a batch of orders in one transaction.
+
+    With ``atomic`` the tickets of all orders are created together and
+    nothing is created when one order is invalid. Otherwise every order
+    gets a savepoint and fails on its own. Returns the result of every
+    order, in batch order, and the response status.
+    """
+    orders, errors = validate_orders(items)
+    results = {
+        index: error_result(index, status.HTTP_400_BAD_REQUEST, order_errors)
+        for index, order_errors in errors.items()
+    }
+    if atomic and errors:
+        for index in orders:
+            results[index] = error_result(index, status.HTTP_424_FAILED_DEPENDENCY)
+        results = [results[index] for index in sorted(results)]
+        return results, status.HTTP_400_BAD_REQUEST
+
+    strategy = get_purchase_strategy()
+    tickets_by_order = defaultdict(list)
+    with transaction.atomic():
+        created = dict(
+            zip(
+                orders,
+                Order.objects.bulk_create(Order(user=user) for _ in orders)
+            )
+        )
+        if atomic:
+            tickets = strategy.create_tickets(
+                None,
+                [
+                    {**ticket, "order": created[index]}
+                    for index, order_tickets in orders.items()
+                    for ticket in order_tickets
+                ]
+            )
+            for ticket in tickets:
+                tickets_by_order[ticket.order_id].append(ticket)
+        else:
+            failed = []
+            for index, order in created.items():
+                try:
+                    with transaction.atomic():
+                        tickets_by_order[order.pk] = strategy.create_tickets(
+                            order,
+                            orders[index]
+                        )
+                except APIException as error:
+                    results[index] = error_result(
+                        index,
+                        error.status_code,
+                        error.detail
+                    )
+                    failed.append(order.pk)
+            if failed:
+                Order.objects.filter(pk__in=failed).delete()
+
+    for index, order in created.items():
+        if index not in results:
+            results[index] = order_result(index, order, tickets_by_order[order.pk])
+
+    results = [results[index] for index in sorted(results)]
+    if all(result["status"] == status.HTTP_201_CREATED for result in results):
+        return results, status.HTTP_201_CREATED
+    return results, status.HTTP_207_MULTI_STATUS
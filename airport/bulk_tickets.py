@@ -0,0 +1,113 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+
+from airport.bulk_orders import ticket_errors
+from airport.inventory import inventory_flight_ids
+from airport.models import Flight, Order, Seat, Ticket
+from airport.purchase import SeatTaken, get_purchase_strategy
+from airport.search import refresh_available_seats_on_commit
+from airport.serializers import TicketSeatSerializer
+
+DUPLICATE_SEAT_ERROR = "The seat is requested more than once."
+
+SeatKey = tuple[int, int, int]
+
+
+def validate_seats(order: Order, items: list) -> tuple[list[dict], dict[int, Flight]]:
+    """Validate the wanted seats with one query for the flights and one
+    for the seats sold to other orders"""
+    serializer = TicketSeatSerializer(data=items, many=True)
+    serializer.is_valid(raise_exception=True)
+    tickets = serializer.validated_data
+
+    flights = Flight.objects.select_related("airplane").in_bulk(
+        {ticket["flight"] for ticket in tickets}
+    )
+    taken = set()
+    if tickets:
+        taken = set(
+            Ticket.objects.filter(
+                flight_id__in={ticket["flight"] for ticket in tickets},
+                row__in={ticket["row"] for ticket in tickets},
+                seat__in={ticket["seat"] for ticket in tickets}
+            ).exclude(order=order).values_list("flight_id", "row", "seat")
+        )
+
+    errors, seen = [], set()
+    for ticket in tickets:
+        key = (ticket["flight"], ticket["row"], ticket["seat"])
+        ticket_error = ticket_errors(ticket, flights.get(ticket["flight"]), taken)
+        if not ticket_error and key in seen:
+            ticket_error = {"non_field_errors": [DUPLICATE_SEAT_ERROR]}
+        seen.add(key)
+        errors.append(ticket_error)
+    if any(errors):
+        raise ValidationError(errors)
+    return tickets, flights
+
+
+def replace_tickets(order: Order, items: list) -> list[Ticket]:
+    """Make the tickets of ``order`` hold exactly the wanted seats.
+
+    Tickets on kept seats are not touched. A ticket leaving a seat is moved
+    to a new seat of the same flight, the remaining ones are deleted and the
+    remaining new seats are bought with the purchase strategy. Deletes and
+    moves are one statement each. Tickets of flights with a seat inventory
+    are deleted and bought again rather than moved, so that their seats are
+    claimed from the inventory.
+    """
+    with transaction.atomic():
+        # Concurrent replacements of the same order run one after the other
+        Order.objects.select_for_update().filter(pk=order.pk).first()
+        tickets, flights = validate_seats(order, items)
+
+        existing = {
+            (ticket.flight_id, ticket.row, ticket.seat): ticket
+            for ticket in order.tickets.select_for_update()
+        }
+        wanted: dict[SeatKey, dict] = {
+            (ticket["flight"], ticket["row"], ticket["seat"]): ticket
+            for ticket in tickets
+        }
+        left = [ticket for key, ticket in existing.items() if key not in wanted]
+        new = [ticket for key, ticket in wanted.items() if key not in existing]
+        inventory = inventory_flight_ids(
+            {ticket.flight_id for ticket in left} | {ticket["flight"] for ticket in new}
+        )
+
+        movable = defaultdict(list)
+        deleted = []
+        for ticket in left:
+            if ticket.flight_id in inventory:
+                deleted.append(ticket)
+            else:
+                movable[ticket.flight_id].append(ticket)
+        moved, bought = [], []
+        for ticket_data in new:
+            if movable[ticket_data["flight"]]:
+                ticket = movable[ticket_data["flight"]].pop()
+                ticket.row, ticket.seat = ticket_data["row"], ticket_data["seat"]
+                moved.append(ticket)
+            else:
+                bought.append({**ticket_data, "flight": flights[ticket_data["flight"]]})
+        for flight_tickets in movable.values():
+            deleted += flight_tickets
+
+        if deleted:
+            deleted_ids = [ticket.pk for ticket in deleted]
+            Seat.objects.filter(ticket_id__in=deleted_ids).update(ticket=None)
+            # Without signals, the search rows are refreshed once below
+            Ticket.objects.filter(pk__in=deleted_ids)._raw_delete(Ticket.objects.db)
+            refresh_available_seats_on_commit(ticket.flight_id for ticket in deleted)
+        if moved:
+            try:
+                with transaction.atomic():
+                    Ticket.objects.bulk_update(moved, ["row", "seat"])
+            except IntegrityError:
+                raise SeatTaken()
+        if bought:
+            get_purchase_strategy().create_tickets(order, bought)
+
+    return list(order.tickets.order_by("id"))
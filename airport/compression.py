@@ -0,0 +1,174 @@
+import hashlib
+import re
+import zlib
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+
+from airport.media import accepted_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STRONG_ETAG_RE = re.compile(r'^\s*"')
+
+
+def gzip_compressor():
+    # wbits 31 writes a gzip header and trailer
+    return zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def gzip_compress(data: bytes) -> bytes:
+    compressor = gzip_compressor()
+    return compressor.compress(data) + compressor.flush()
+
+
+class GzipStreamCompressor:
+    def __init__(self) -> None:
+        self.compressor = gzip_compressor()
+
+    def process(self, chunk: bytes) -> bytes:
+        # A sync flush sends each chunk as soon as it is produced
+        return self.compressor.compress(chunk) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+def brotli_compress(data: bytes) -> bytes:
+    return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+class BrotliStreamCompressor:
+    def __init__(self) -> None:
+        self.compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def process(self, chunk: bytes) -> bytes:
+        return self.compressor.process(chunk) + self.compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+def available_encodings() -> dict[str, tuple[Callable, type]]:
+    """Encodings by preference with their body and stream compressors"""
+    encodings = {}
+    if brotli is not None:
+        encodings["br"] = (brotli_compress, BrotliStreamCompressor)
+    encodings["gzip"] = (gzip_compress, GzipStreamCompressor)
+    return encodings
+
+
+def choose_encoding(request: HttpRequest) -> Optional[str]:
+    accepted = accepted_encodings(request)
+    for encoding in available_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compressible(response: HttpResponseBase) -> bool:
+    content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+    return (
+        content_type in settings.COMPRESSION_CONTENT_TYPES
+        and not response.has_header("Content-Encoding")
+        # Byte ranges refer to the uncompressed body
+        and not response.has_header("Accept-Ranges")
+        and response.status_code != 206
+    )
+
+
+def compressed_cache_key(encoding: str, content: bytes) -> str:
+    digest = hashlib.blake2b(content, digest_size=20).hexdigest()
+    return f"compressed:{encoding}:{len(content)}:{digest}"
+
+
+def compress_content(encoding: str, content: bytes) -> bytes:
+    """Compress a body, reusing the compressed copy of an identical body.
+
+    Hot reads (cached boards, calendars, unchanged lists) send the same
+    bytes again and again, hashing them is much cheaper than compressing.
+    Bodies above ``COMPRESSION_CACHE_MAX_SIZE`` are compressed every time.
+    """
+    compress = available_encodings()[encoding][0]
+    timeout = settings.COMPRESSION_CACHE_TIMEOUT
+    if not timeout or len(content) > settings.COMPRESSION_CACHE_MAX_SIZE:
+        return compress(content)
+
+    key = compressed_cache_key(encoding, content)
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(content)
+        cache.set(key, compressed, timeout)
+    return compressed
+
+
+def compress_stream(compressor, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield compressor.process(chunk)
+    yield compressor.finish()
+
+
+async def compress_async_stream(
+        compressor,
+        chunks: AsyncIterator[bytes]
+) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield compressor.process(chunk)
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses with Brotli (when installed) or gzip.
+
+    Only ``COMPRESSION_CONTENT_TYPES`` are compressed, bodies shorter than
+    ``COMPRESSION_MIN_SIZE`` bytes are sent as they are. Streamed responses
+    are compressed chunk by chunk and flushed after each chunk. Place it
+    above the middleware that change the body, and below
+    ``UpdateCacheMiddleware`` so the cache stores compressed responses.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = self.get_response(request)
+        if not compressible(response):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            compressor = available_encodings()[encoding][1]()
+            if response.is_async:
+                response.streaming_content = compress_async_stream(
+                    compressor, response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    compressor, response.streaming_content
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed = compress_content(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and STRONG_ETAG_RE.match(etag):
+            # The compressed body is no longer byte for byte the same
+            response.headers["ETag"] = f"W/{etag}"
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,215 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+from rest_framework.exceptions import ValidationError
+
+from airport.models import Crew, Flight
+
+FLIGHT_TABLE = Flight._meta.db_table
+CREWS_TABLE = Flight.crews.through._meta.db_table
+
+# Assignments overlapping a proposed one: the GiST index on the flight span
+# finds the flights in the time window, then the crew of each is checked.
+# Proposed assignments overlapping each other come from the second part.
+ASSIGNMENT_CONFLICTS_SQL = f"""
+WITH proposed AS (
+    SELECT *
+    FROM unnest(
+        %s::bigint[], %s::bigint[], %s::timestamptz[], %s::timestamptz[]
+    ) AS p(crew_id, flight_id, departure_time, arrival_time)
+)
+SELECT p.crew_id, p.flight_id, f.id
+FROM proposed p
+JOIN {FLIGHT_TABLE} f
+    ON TSTZRANGE(f.departure_time, f.arrival_time)
+    && TSTZRANGE(p.departure_time, p.arrival_time)
+JOIN {CREWS_TABLE} fc ON fc.flight_id = f.id AND fc.crew_id = p.crew_id
+WHERE f.id IS DISTINCT FROM p.flight_id
+UNION
+SELECT a.crew_id, a.flight_id, b.flight_id
+FROM proposed a
+JOIN proposed b
+    ON a.crew_id = b.crew_id
+    AND a.flight_id < b.flight_id
+    AND TSTZRANGE(a.departure_time, a.arrival_time)
+    && TSTZRANGE(b.departure_time, b.arrival_time)
+ORDER BY 1, 2, 3
+"""
+
+# Every pair of overlapping flights of the same crew member in a period,
+# in one pass over the assignments of the flights in the period.
+ROSTER_CONFLICTS_SQL = f"""
+WITH spans AS (
+    SELECT fc.crew_id, f.id AS flight_id,
+           TSTZRANGE(f.departure_time, f.arrival_time) AS span
+    FROM {FLIGHT_TABLE} f
+    JOIN {CREWS_TABLE} fc ON fc.flight_id = f.id
+    WHERE TSTZRANGE(f.departure_time, f.arrival_time) && TSTZRANGE(%s, %s)
+)
+SELECT a.crew_id, a.flight_id, b.flight_id
+FROM spans a
+JOIN spans b
+    ON a.crew_id = b.crew_id
+    AND a.flight_id < b.flight_id
+    AND a.span && b.span
+ORDER BY 1, 2, 3
+"""
+
+
+class Assignment(NamedTuple):
+    crew_id: int
+    flight_id: Optional[int]
+    departure_time: datetime
+    arrival_time: datetime
+
+
+class Conflict(NamedTuple):
+    crew: int
+    flight: Optional[int]
+    conflicting_flight: int
+
+
+def assignment_conflicts(assignments: list[Assignment]) -> list[Conflict]:
+    """Conflicts of the proposed assignments with the crews' other flights
+    and with each other, in one query.
+
+    ``flight_id`` is ``None`` for a flight not saved yet. The current
+    assignments of a proposed flight are ignored, so a flight moved to other
+    times is checked against its new times only.
+    """
+    if not assignments:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            ASSIGNMENT_CONFLICTS_SQL,
+            [list(column) for column in zip(*assignments)]
+        )
+        return [Conflict(*row) for row in cursor.fetchall()]
+
+
+def roster_conflicts(start: datetime, end: datetime) -> list[Conflict]:
+    """Overlapping flights of the same crew member between start and end"""
+    with connection.cursor() as cursor:
+        cursor.execute(ROSTER_CONFLICTS_SQL, [start, end])
+        return [Conflict(*row) for row in cursor.fetchall()]
+
+
+def conflict_message(conflict: Conflict) -> str:
+    return (
+        f"Crew member {conflict.crew} is on the overlapping "
+        f"flight {conflict.conflicting_flight}."
+    )
+
+
+def flight_crew_errors(
+        flight_id: Optional[int],
+        crew_ids: Iterable[int],
+        departure_time: datetime,
+        arrival_time: datetime
+) -> list[str]:
+    """Overlaps of one flight with the other flights of its crew"""
+    conflicts = assignment_conflicts(
+        [
+            Assignment(crew_id, flight_id, departure_time, arrival_time)
+            for crew_id in sorted(set(crew_ids))
+        ]
+    )
+    return [conflict_message(conflict) for conflict in conflicts]
+
+
+def lock_crews(crew_ids: set[int]) -> None:
+    """Serialize concurrent assignments of the same crew members until the
+    end of the transaction, so two overlapping flights can't both pass the
+    check. Locked in id order to avoid deadlocks."""
+    list(
+        Crew.objects.select_for_update().filter(
+            pk__in=crew_ids
+        ).order_by("pk").values_list("pk", flat=True)
+    )
+
+
+def assign_crews(assignments: list[dict]) -> None:
+    """Add ``{"crew", "flight"}`` assignments, all or none.
+
+    The existence of the crew members and flights and the overlaps with
+    the crews' other flights and with each other are checked with three
+    queries whatever the number of assignments. Errors are listed in the
+    order of ``assignments``. Existing assignments are left as they are.
+    """
+    pairs = [(assignment["crew"], assignment["flight"]) for assignment in assignments]
+    crew_ids = {crew_id for crew_id, _ in pairs}
+    with transaction.atomic():
+        lock_crews(crew_ids)
+        crews = set(Crew.objects.filter(pk__in=crew_ids).values_list("pk", flat=True))
+        flights = Flight.objects.only("departure_time", "arrival_time").in_bulk(
+            {flight_id for _, flight_id in pairs}
+        )
+
+        errors = []
+        for crew_id, flight_id in pairs:
+            error = {}
+            if crew_id not in crews:
+                error["crew"] = [f"Invalid pk \"{crew_id}\" - object does not exist."]
+            if flight_id not in flights:
+                error["flight"] = [f"Invalid pk \"{flight_id}\" - object does not exist."]
+            errors.append(error)
+        if any(errors):
+            raise ValidationError(errors)
+
+        unique_pairs = sorted(set(pairs))
+        conflicts = defaultdict(set)
+        for conflict in assignment_conflicts(
+            [
+                Assignment(
+                    crew_id,
+                    flight_id,
+                    flights[flight_id].departure_time,
+                    flights[flight_id].arrival_time
+                )
+                for crew_id, flight_id in unique_pairs
+            ]
+        ):
+            conflicts[conflict.crew, conflict.flight].add(conflict_message(conflict))
+            # Both proposed flights of an overlap get the error
+            conflicts[conflict.crew, conflict.conflicting_flight].add(
+                f"Crew member {conflict.crew} is on the overlapping "
+                f"flight {conflict.flight}."
+            )
+        if conflicts:
+            raise ValidationError(
+                [
+                    {"non_field_errors": sorted(conflicts[pair])} if pair in conflicts else {}
+                    for pair in pairs
+                ]
+            )
+
+        Flight.crews.through.objects.bulk_create(
+            [
+                Flight.crews.through(crew_id=crew_id, flight_id=flight_id)
+                for crew_id, flight_id in unique_pairs
+            ],
+            ignore_conflicts=True
+        )
+
+
+def roster_queryset() -> QuerySet:
+    """Compact roster rows of all crew members: one row per assignment
+    with the flight's airports, airplane and times, in one query"""
+    return Flight.crews.through.objects.annotate(
+        departure_time=F("flight__departure_time"),
+        arrival_time=F("flight__arrival_time"),
+        source=F("flight__route__source__name"),
+        destination=F("flight__route__destination__name"),
+        airplane=F("flight__airplane__name")
+    ).values(
+        "crew_id",
+        "flight_id",
+        "source",
+        "destination",
+        "airplane",
+        "departure_time",
+        "arrival_time"
+    )
@@ -0,0 +1,61 @@
+from typing import Optional
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+EXPAND_PARAM = "expand"
+
+
+def field_names(request: Request, param: str) -> Optional[set[str]]:
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def field_requested(request: Optional[Request], name: str) -> bool:
+    """Whether the response of a read will render the top-level field.
+
+    Views use it to skip the joins, prefetches and annotations of the
+    fields left out with ``?fields=`` or ``?omit=``.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return True
+    only = field_names(request, FIELDS_PARAM)
+    omit = field_names(request, OMIT_PARAM) or set()
+    return (only is None or name in only) and name not in omit
+
+
+def field_expanded(request: Optional[Request], name: str) -> bool:
+    """Whether ``?expand=`` asks for the field as a nested object"""
+    if request is None:
+        return False
+    return name in (field_names(request, EXPAND_PARAM) or set())
+
+
+class SparseFieldsetsMixin:
+    """Render only ``?fields=a,b`` and drop ``?omit=a,b`` on reads.
+
+    Only the serializer of the response itself is trimmed, not the ones
+    nested in it. Unknown names are ignored.
+    """
+
+    def get_fields(self) -> dict:
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+
+        parent = getattr(self, "parent", None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+
+        return {
+            name: field for name, field in fields.items()
+            if field_requested(request, name)
+        }
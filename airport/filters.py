@@ -1,15 +1,38 @@
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import QuerySet
+from django.utils import timezone
 from django_filters import rest_framework as filters
 
 
-class FlightFilter(filters.FilterSet):
-    start_departure_date = filters.DateTimeFilter(
-        field_name="departure_time",
-        lookup_expr="date__gte"
-    )
-    end_departure_date = filters.DateFilter(
-        field_name="departure_time",
-        lookup_expr="date__lte"
-    )
+def start_of_day(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.get_current_timezone())
+
+
+class DepartureDateFilter(filters.FilterSet):
+    """Departure date window turned into a departure time range rather than
+    compared with ``departure_time__date``, so that the departure time
+    indexes are used and only the partitions of the window are read."""
+
+    start_departure_date = filters.DateTimeFilter(method="filter_start_departure_date")
+    end_departure_date = filters.DateFilter(method="filter_end_departure_date")
+
+    def filter_start_departure_date(
+            self,
+            queryset: QuerySet,
+            name: str,
+            value: datetime
+    ) -> QuerySet:
+        day = timezone.localtime(value).date()
+        return queryset.filter(departure_time__gte=start_of_day(day))
+
+    def filter_end_departure_date(self, queryset: QuerySet, name: str, value: date) -> QuerySet:
+        return queryset.filter(
+            departure_time__lt=start_of_day(value + timedelta(days=1))
+        )
+
+
+class FlightFilter(DepartureDateFilter):
     start_arrival_date = filters.DateFilter(
         field_name="arrival_time",
         lookup_expr="date__gte"
@@ -24,3 +47,36 @@ class FlightFilter(filters.FilterSet):
     destination = filters.CharFilter(
         field_name="route__destination__name"
     )
+
+
+class FlightSearchFilter(DepartureDateFilter):
+    """``FlightFilter`` on the search table, plus city and country"""
+
+    start_arrival_date = filters.DateFilter(
+        field_name="arrival_time",
+        lookup_expr="date__gte"
+    )
+    end_arrival_date = filters.DateFilter(
+        field_name="arrival_time",
+        lookup_expr="date__lte"
+    )
+    source = filters.CharFilter(field_name="source_name")
+    destination = filters.CharFilter(field_name="destination_name")
+    source_city = filters.CharFilter(field_name="source_city")
+    destination_city = filters.CharFilter(field_name="destination_city")
+    source_country = filters.CharFilter(field_name="source_country")
+    destination_country = filters.CharFilter(field_name="destination_country")
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
+
+
+class CrewRosterFilter(DepartureDateFilter):
+    """Date window of ``/crews/{id}/roster/``, the crew comes from the URL"""
+
+
+class CrewRostersFilter(CrewRosterFilter):
+    """Crew members and date window of ``/crews/rosters/``"""
+
+    crews = NumberInFilter(field_name="crew_id")
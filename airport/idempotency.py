@@ -0,0 +1,88 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from airport.models import IdempotencyKey
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyMismatch(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "The Idempotency-Key was already used for another request."
+    default_code = "idempotency_key_mismatch"
+
+
+def request_hash(request: Request) -> str:
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    payload = json.dumps(
+        [request.method, request.path, data],
+        sort_keys=True,
+        cls=DjangoJSONEncoder,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """Replay the stored response when a create request is retried.
+
+    The key row is inserted in the same transaction as the created objects.
+    A concurrent retry waits on the unique index until the first request
+    commits and then replays its response, or takes over when it rolled back.
+    Error responses are not stored, so the request can simply be retried.
+    """
+
+    def create(self, request: Request, *args, **kwargs) -> Response:
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                {
+                    IDEMPOTENCY_KEY_HEADER: f"Ensure this header has no more "
+                                            f"than {MAX_KEY_LENGTH} characters."
+                }
+            )
+
+        now = timezone.now()
+        user_keys = IdempotencyKey.objects.filter(user=request.user, key=key)
+        with transaction.atomic():
+            user_keys.filter(expires_at__lte=now).delete()
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user=request.user,
+                        key=key,
+                        request_hash=request_hash(request),
+                        expires_at=now + settings.IDEMPOTENCY_KEY_TTL
+                    )
+            except IntegrityError:
+                return self.replay(request, user_keys.get())
+
+            response = super().create(request, *args, **kwargs)
+            record.response_status = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=("response_status", "response_body"))
+        return response
+
+    @staticmethod
+    def replay(request: Request, record: IdempotencyKey) -> Response:
+        if record.request_hash != request_hash(request):
+            raise IdempotencyKeyMismatch()
+        return Response(
+            record.response_body,
+            status=record.response_status,
+            headers={"Idempotent-Replayed": "true"}
+        )
@@ -0,0 +1,106 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Optional
+
+from PIL import Image, ImageOps, features
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from jobs.queue import enqueue
+
+
+def variant_format() -> str:
+    image_format = settings.AIRPLANE_IMAGE_VARIANT_FORMAT.upper()
+    if image_format == "WEBP" and not features.check("webp"):
+        return "JPEG"
+    return image_format
+
+
+def variant_name(image_name: str, variant: str) -> str:
+    """Storage name of a resized variant of the uploaded image"""
+    path = PurePosixPath(image_name)
+    extension = "webp" if variant_format() == "WEBP" else "jpg"
+    return str(path.parent / "variants" / f"{path.stem}-{variant}.{extension}")
+
+
+def render_variant(image: Image.Image, size: tuple[int, int]) -> bytes:
+    image_format = variant_format()
+    resized = image.copy()
+    resized.thumbnail(size, Image.Resampling.LANCZOS)
+    if image_format == "JPEG" and resized.mode != "RGB":
+        resized = resized.convert("RGB")
+    elif resized.mode not in ("RGB", "RGBA"):
+        resized = resized.convert("RGBA" if "A" in resized.mode else "RGB")
+
+    # EXIF, ICC and XMP blocks are only written when passed explicitly,
+    # dropping ``info`` keeps them out of the variants.
+    resized.info = {}
+    buffer = BytesIO()
+    resized.save(
+        buffer,
+        format=image_format,
+        quality=settings.AIRPLANE_IMAGE_VARIANT_QUALITY,
+        optimize=image_format == "JPEG"
+    )
+    return buffer.getvalue()
+
+
+def process_airplane_image(airplane_id: int) -> None:
+    """Create every configured variant for the current airplane image"""
+    from airport.models import Airplane
+
+    airplane = Airplane.objects.filter(pk=airplane_id).only("image").first()
+    if airplane is None or not airplane.image:
+        return
+
+    with default_storage.open(airplane.image.name, "rb") as source:
+        with Image.open(source) as original:
+            image = ImageOps.exif_transpose(original)
+            image.load()
+
+    names = {}
+    for variant, size in settings.AIRPLANE_IMAGE_VARIANTS.items():
+        name = variant_name(airplane.image.name, variant)
+        content = render_variant(image, size)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        names[variant] = default_storage.save(name, ContentFile(content))
+
+    # Left alone when another image was uploaded meanwhile
+    Airplane.objects.filter(
+        pk=airplane_id,
+        image=airplane.image.name
+    ).update(image_variant_names=names)
+
+
+def schedule_airplane_image_processing(airplane_id: int) -> None:
+    """Queue the variants, the job is committed together with the upload"""
+    enqueue(
+        "airport.process_airplane_image",
+        {"airplane_id": airplane_id}
+    )
+
+
+def image_variant_urls(
+        image,
+        variant_names: dict[str, str],
+        request=None
+) -> Optional[dict]:
+    """URLs of the image variants, the original is used until the job has
+    recorded them. Storage isn't asked whether the files exist, that would
+    be a round trip per variant on remote storages."""
+    if not image:
+        return None
+
+    urls = {}
+    for variant in settings.AIRPLANE_IMAGE_VARIANTS:
+        name = variant_name(image.name, variant)
+        # Recorded names of an image replaced elsewhere, e.g. in the admin,
+        # don't match
+        if variant_names.get(variant) == name:
+            url = default_storage.url(name)
+        else:
+            url = image.url
+        urls[variant] = request.build_absolute_uri(url) if request else url
+    return urls
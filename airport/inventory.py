@@ -0,0 +1,50 @@
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from airport.models import Flight, Seat, Ticket
+
+
+def inventory_flight_ids(flight_ids: Iterable[int]) -> set[int]:
+    """Flights among ``flight_ids`` that have a seat inventory"""
+    return set(
+        Seat.objects.filter(
+            flight_id__in=list(flight_ids)
+        ).values_list("flight_id", flat=True).distinct()
+    )
+
+
+def generate_seats(flight: Flight, batch_size: int = 1000) -> int:
+    """Create the seat inventory of a flight and mark the seats of its
+    existing tickets as sold. Returns the number of created seats.
+
+    The flight row is locked ``FOR UPDATE``, which waits for the ticket
+    inserts in progress and holds back new ones until the tickets are linked.
+    """
+    with transaction.atomic():
+        flight = Flight.objects.select_for_update(of=("self",)).select_related(
+            "airplane"
+        ).get(pk=flight.pk)
+        if flight.airplane is None or flight.seats.exists():
+            return 0
+
+        airplane = flight.airplane
+        seats = Seat.objects.bulk_create(
+            (
+                Seat(flight=flight, row=row, seat=seat)
+                for row in range(1, airplane.rows + 1)
+                for seat in range(1, airplane.seats_in_row + 1)
+            ),
+            batch_size=batch_size
+        )
+        Seat.objects.filter(flight=flight).update(
+            ticket=Subquery(
+                Ticket.objects.filter(
+                    flight=flight,
+                    row=OuterRef("row"),
+                    seat=OuterRef("seat")
+                ).values("pk")[:1]
+            )
+        )
+        return len(seats)
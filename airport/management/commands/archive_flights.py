@@ -0,0 +1,81 @@
+import argparse
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandParser
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from airport.archive import ArchiveBatch, archive_flights
+
+
+def parse_day(value: str) -> date:
+    day = parse_date(value)
+    if day is None:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a YYYY-MM-DD date")
+    return day
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the flights that departed before a date, their tickets and the "
+        "orders left without tickets to gzipped JSON lines files, deleting "
+        "them in small batches with pauses in between"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--before",
+            type=parse_day,
+            required=True,
+            help="Archive the flights departing before this date (YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=Path(settings.ARCHIVE_DIR),
+            help="Directory of the archive files"
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.5,
+            help="Seconds to wait between batches, at least as long as the last batch took"
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches, the next run continues"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        before = datetime.combine(
+            options["before"],
+            time.min,
+            tzinfo=timezone.get_current_timezone()
+        )
+
+        def progress(batch: ArchiveBatch) -> None:
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"Archived {batch.flights} flights, {batch.tickets} tickets "
+                    f"and {batch.orders} orders"
+                )
+
+        total, paths = archive_flights(
+            before,
+            options["output"],
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            max_batches=options["max_batches"],
+            progress=progress
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {total.flights} flights, {total.tickets} tickets and "
+                f"{total.orders} orders to {len(paths)} files in {options['output']}"
+            )
+        )
@@ -0,0 +1,126 @@
+import io
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Callable
+
+from django.core.management import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    FlightSearchRow,
+    Route
+)
+from airport.parsers import FastJSONParser
+from airport.renderers import FastJSONRenderer, orjson
+from airport.search import rebuild_search_rows
+from airport.serializers import FlightSearchRowSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the time to render and parse a page of the flight list "
+        "with DRF's JSON renderer and parser and the fast ones. The flights "
+        "are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--flights", type=int, default=1000, help="Flights per page")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if orjson is None:
+            self.stdout.write("orjson is not installed, the fast classes use the stdlib")
+
+        with transaction.atomic():
+            page = self.flight_page(options["flights"])
+            transaction.set_rollback(True)
+
+        body = JSONRenderer().render(page)
+        if FastJSONRenderer().render(page) != body:
+            raise CommandError("The fast renderer output differs from JSONRenderer")
+
+        self.stdout.write(
+            f"{options['flights']} flights, {len(body) / 1024:.0f} KiB, "
+            f"{options['repeat']} runs"
+        )
+        self.stdout.write(f"{'':<28}{'best ms':>10}{'median ms':>12}")
+        for name, run in (
+            ("JSONRenderer", lambda: JSONRenderer().render(page)),
+            ("FastJSONRenderer", lambda: FastJSONRenderer().render(page)),
+            ("JSONParser", lambda: JSONParser().parse(io.BytesIO(body))),
+            ("FastJSONParser", lambda: FastJSONParser().parse(io.BytesIO(body))),
+        ):
+            timings = self.measure(run, options["repeat"])
+            self.stdout.write(
+                f"{name:<28}{min(timings):>10.2f}{statistics.median(timings):>12.2f}"
+            )
+
+    @staticmethod
+    def measure(run: Callable, repeat: int) -> list[float]:
+        timings = []
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started_at) * 1000)
+        return timings
+
+    @staticmethod
+    def flight_page(size: int) -> dict:
+        suffix = uuid.uuid4().hex[:8]
+        airplane_type, _ = AirplaneType.objects.get_or_create(name="Benchmark")
+        airplane = Airplane.objects.create(
+            name=f"bench-{suffix}",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=airplane_type
+        )
+        route = Route.objects.create(
+            source=Airport.objects.create(name=f"bench-src-{suffix}"),
+            destination=Airport.objects.create(name=f"bench-dst-{suffix}"),
+            distance=1
+        )
+        crews = Crew.objects.bulk_create(
+            [Crew(first_name="Bench", last_name=f"Crew {number}") for number in range(3)]
+        )
+        now = timezone.now()
+        flights = Flight.objects.bulk_create(
+            [
+                Flight(
+                    route=route,
+                    airplane=airplane,
+                    # Apart from each other, the airplane can't be on two
+                    # flights at once
+                    departure_time=now + timedelta(hours=3 * number),
+                    arrival_time=now + timedelta(hours=3 * number + 2)
+                )
+                for number in range(size)
+            ]
+        )
+        Flight.crews.through.objects.bulk_create(
+            [
+                Flight.crews.through(flight=flight, crew=crew)
+                for flight in flights
+                for crew in crews
+            ]
+        )
+        rebuild_search_rows(Flight.objects.filter(pk__in=[flight.pk for flight in flights]))
+
+        rows = FlightSearchRow.objects.filter(route=route).order_by(
+            "departure_time"
+        ).prefetch_related("flight__crews")
+        return {
+            "count": size,
+            "next": None,
+            "previous": None,
+            "results": FlightSearchRowSerializer(rows, many=True).data
+        }
@@ -0,0 +1,175 @@
+import random
+import threading
+import time
+import uuid
+from datetime import timedelta
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandParser
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+
+from airport.inventory import generate_seats
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Order,
+    Route
+)
+from airport.purchase import STRATEGIES, get_purchase_strategy
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure orders/sec and abort rate of the seat purchase strategies "
+        "with concurrent buyers on one flight. Creates and removes its own "
+        "flight, don't run it against a production database."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--strategy",
+            action="append",
+            dest="strategies",
+            choices=list(STRATEGIES),
+            help="Strategy to measure, can be repeated (default: all)"
+        )
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--orders", type=int, default=50, help="Orders per thread")
+        parser.add_argument("--tickets", type=int, default=2, help="Tickets per order")
+        parser.add_argument("--rows", type=int, default=200)
+        parser.add_argument("--seats-in-row", type=int, default=6)
+        parser.add_argument(
+            "--auto",
+            action="store_true",
+            help="Let the server assign seats instead of picking random ones"
+        )
+        parser.add_argument(
+            "--inventory",
+            action="store_true",
+            help="Generate a seat inventory for the flight, "
+                 "purchases then claim seats from it"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            f"{'strategy':<20}{'orders/s':>10}{'orders':>8}"
+            f"{'aborted':>9}{'abort rate':>12}"
+        )
+        for name in options["strategies"] or list(STRATEGIES):
+            flight, user = self.create_flight(options)
+            try:
+                result = self.run_strategy(name, flight, user, options)
+            finally:
+                self.cleanup(flight, user)
+            total = result["created"] + result["aborted"]
+            self.stdout.write(
+                f"{name:<20}{result['created'] / result['elapsed']:>10.1f}"
+                f"{result['created']:>8}{result['aborted']:>9}"
+                f"{result['aborted'] / max(total, 1):>12.1%}"
+            )
+
+    def run_strategy(
+            self,
+            name: str,
+            flight: Flight,
+            user,
+            options: dict
+    ) -> dict:
+        counters = {"created": 0, "aborted": 0}
+        counters_lock = threading.Lock()
+        start_barrier = threading.Barrier(options["threads"] + 1)
+
+        def buyer(thread_number: int) -> None:
+            rng = random.Random(options["seed"] * 1000 + thread_number)
+            strategy = get_purchase_strategy(name)
+            start_barrier.wait()
+            try:
+                for _ in range(options["orders"]):
+                    tickets_data = self.tickets_data(flight, rng, options)
+                    try:
+                        with transaction.atomic():
+                            order = Order.objects.create(user=user)
+                            strategy.create_tickets(order, tickets_data)
+                        outcome = "created"
+                    except (APIException, DatabaseError):
+                        outcome = "aborted"
+                    with counters_lock:
+                        counters[outcome] += 1
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=buyer, args=(number,))
+            for number in range(options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+        start_barrier.wait()
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        counters["elapsed"] = time.perf_counter() - started_at
+        return counters
+
+    @staticmethod
+    def tickets_data(flight: Flight, rng: random.Random, options: dict) -> list[dict]:
+        if options["auto"]:
+            return [{"flight": flight} for _ in range(options["tickets"])]
+
+        row = rng.randint(1, options["rows"])
+        first_seat = rng.randint(
+            1, max(options["seats_in_row"] - options["tickets"] + 1, 1)
+        )
+        return [
+            {
+                "flight": flight,
+                "row": row,
+                "seat": min(first_seat + offset, options["seats_in_row"])
+            }
+            for offset in range(options["tickets"])
+        ]
+
+    @staticmethod
+    def create_flight(options: dict) -> tuple[Flight, Any]:
+        suffix = uuid.uuid4().hex[:8]
+        airplane_type, _ = AirplaneType.objects.get_or_create(name="Benchmark")
+        airplane = Airplane.objects.create(
+            name=f"bench-{suffix}",
+            rows=options["rows"],
+            seats_in_row=options["seats_in_row"],
+            airplane_type=airplane_type
+        )
+        route = Route.objects.create(
+            source=Airport.objects.create(name=f"bench-src-{suffix}"),
+            destination=Airport.objects.create(name=f"bench-dst-{suffix}"),
+            distance=1
+        )
+        departure_time = timezone.now()
+        flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_time=departure_time,
+            arrival_time=departure_time + timedelta(hours=1)
+        )
+        if options["inventory"]:
+            generate_seats(flight)
+        user = get_user_model().objects.create_user(
+            email=f"bench-{suffix}@example.com"
+        )
+        return flight, user
+
+    @staticmethod
+    def cleanup(flight: Flight, user) -> None:
+        route, airplane = flight.route, flight.airplane
+        user.delete()
+        flight.delete()
+        Airport.objects.filter(
+            pk__in=(route.source_id, route.destination_id)
+        ).delete()
+        airplane.delete()
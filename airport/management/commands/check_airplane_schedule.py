@@ -0,0 +1,61 @@
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError, CommandParser
+from django.utils.dateparse import parse_date
+
+from airport.models import Flight
+
+
+class Command(BaseCommand):
+    help = (
+        "List flights that have their airplane while it is on another "
+        "flight, in one pass over the flights sorted by airplane and "
+        "departure time."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--since",
+            type=parse_date,
+            help="Only flights arriving on or after this date (YYYY-MM-DD)"
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        flight_qs = Flight.objects.filter(airplane__isnull=False)
+        if options["since"]:
+            flight_qs = flight_qs.filter(arrival_time__date__gte=options["since"])
+        rows = flight_qs.order_by(
+            "airplane_id",
+            "departure_time",
+            "id"
+        ).values_list(
+            "id",
+            "airplane_id",
+            "departure_time",
+            "arrival_time"
+        ).iterator(chunk_size=options["chunk_size"])
+
+        conflicts = 0
+        airplane_id = last_flight_id = last_arrival_time = None
+        for flight_id, flight_airplane_id, departure_time, arrival_time in rows:
+            if flight_airplane_id != airplane_id:
+                airplane_id = flight_airplane_id
+                last_flight_id, last_arrival_time = flight_id, arrival_time
+                continue
+            # Flights of the airplane come by departure time, so a flight
+            # overlaps an earlier one only if it departs before the latest
+            # arrival so far
+            if departure_time < last_arrival_time:
+                conflicts += 1
+                self.stdout.write(
+                    f"Airplane {airplane_id}: flight {flight_id} departs at "
+                    f"{departure_time:%Y-%m-%d %H:%M} before flight "
+                    f"{last_flight_id} arrives at {last_arrival_time:%Y-%m-%d %H:%M}"
+                )
+            if arrival_time > last_arrival_time:
+                last_flight_id, last_arrival_time = flight_id, arrival_time
+
+        if conflicts:
+            raise CommandError(f"Found {conflicts} overlapping flights")
+        self.stdout.write(self.style.SUCCESS("No overlapping flights"))
@@ -0,0 +1,48 @@
+from datetime import timedelta
+from typing import Any
+
+from django.core.management import BaseCommand, CommandParser
+from django.db.models import F, Q
+from django.utils import timezone
+
+from airport.models import FlightSchedule
+from airport.schedules import extend_schedule
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the flights of the flight schedules up to --days ahead, "
+        "starting after the last day created before. Run it daily to keep "
+        "the horizon moving."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("schedule_ids", nargs="*", type=int)
+        parser.add_argument("--days", type=int, default=90)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        today = timezone.localdate()
+        until = today + timedelta(days=options["days"])
+        # Schedules that haven't reached their end or the horizon yet
+        schedule_qs = FlightSchedule.objects.filter(
+            Q(generated_until__isnull=True)
+            | Q(generated_until__lt=F("end_date")) & Q(generated_until__lt=until),
+            end_date__gte=today
+        )
+        if options["schedule_ids"]:
+            schedule_qs = schedule_qs.filter(pk__in=options["schedule_ids"])
+
+        created = skipped = crew_conflicts = 0
+        for schedule in schedule_qs.order_by("pk"):
+            extension = extend_schedule(schedule, until, options["batch_size"])
+            created += extension.created
+            skipped += extension.skipped
+            crew_conflicts += extension.crew_conflicts
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} flights up to {until}, skipped {skipped} "
+                f"departures of busy airplanes and {crew_conflicts} "
+                f"assignments of busy crew members"
+            )
+        )
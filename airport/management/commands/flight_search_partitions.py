@@ -0,0 +1,58 @@
+from datetime import date, datetime
+from typing import Any
+
+from django.core.management import BaseCommand, CommandParser
+from django.utils import timezone
+
+from airport.partitions import (
+    create_partition,
+    detach_partition,
+    month_start,
+    next_month,
+    partition_months
+)
+
+
+def parse_month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly partitions of the flight search table ahead of "
+        "time and detach the old ones. Run it daily or monthly."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=3,
+            help="Months after the current one to create partitions for"
+        )
+        parser.add_argument(
+            "--detach-before",
+            type=parse_month,
+            help="Detach the partitions of the months before this one (YYYY-MM)"
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop the detached partitions instead of keeping them as tables"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        month = month_start(timezone.localdate())
+        created = 0
+        for _ in range(options["ahead"] + 1):
+            created += create_partition(month)
+            month = next_month(month)
+        self.stdout.write(self.style.SUCCESS(f"Created {created} partitions"))
+
+        if options["detach_before"]:
+            for month in partition_months():
+                if month >= options["detach_before"]:
+                    break
+                name = detach_partition(month, drop=options["drop"])
+                action = "Dropped" if options["drop"] else "Detached"
+                self.stdout.write(self.style.SUCCESS(f"{action} {name}"))
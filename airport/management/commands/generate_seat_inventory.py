@@ -0,0 +1,59 @@
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError, CommandParser
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from airport.inventory import generate_seats
+from airport.models import Flight, Seat
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the seat inventory of flights, existing tickets mark "
+        "their seats as sold. Flights that already have one are skipped."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("flight_ids", nargs="*", type=int)
+        parser.add_argument(
+            "--upcoming",
+            action="store_true",
+            help="All flights that haven't departed yet"
+        )
+        parser.add_argument(
+            "--remove",
+            action="store_true",
+            help="Drop the inventory, the flights go back to the purchase strategy"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not options["flight_ids"] and not options["upcoming"]:
+            raise CommandError("Give flight ids or --upcoming")
+
+        flight_qs = Flight.objects.all()
+        if options["flight_ids"]:
+            flight_qs = flight_qs.filter(pk__in=options["flight_ids"])
+        if options["upcoming"]:
+            flight_qs = flight_qs.filter(departure_time__gt=timezone.now())
+
+        if options["remove"]:
+            deleted, _ = Seat.objects.filter(flight__in=flight_qs).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} seats"))
+            return
+
+        flight_qs = flight_qs.filter(
+            airplane__isnull=False
+        ).exclude(
+            Exists(Seat.objects.filter(flight=OuterRef("pk")))
+        ).order_by("pk")
+        flights = seats = 0
+        for flight in flight_qs.iterator():
+            created = generate_seats(flight, batch_size=options["batch_size"])
+            if created:
+                flights += 1
+                seats += created
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {seats} seats for {flights} flights")
+        )
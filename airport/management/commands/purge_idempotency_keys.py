@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from airport.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete expired idempotency keys"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted, _ = IdempotencyKey.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys")
+        )
@@ -0,0 +1,23 @@
+from typing import Any
+
+from django.core.management import BaseCommand, CommandParser
+
+from airport.models import Flight
+from airport.search import rebuild_search_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the flight search table, needed after writes that bypass "
+        "the model signals such as QuerySet.update() or raw SQL"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rebuilt = rebuild_search_rows(
+            Flight.objects.all(),
+            batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} search rows"))
@@ -0,0 +1,204 @@
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from django.conf import settings
+from django.conf.urls.static import static
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse
+)
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+from airport.images import variant_name
+
+UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+STREAM_BLOCK_SIZE = 64 * 2 ** 10
+
+
+class MediaFile(NamedTuple):
+    path: str
+    full_path: Path
+    encoding: Optional[str]
+    immutable: bool
+
+
+def cache_control(immutable: bool) -> str:
+    if immutable:
+        return (
+            f"public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable"
+        )
+    return f"public, max-age={settings.MEDIA_MAX_AGE}"
+
+
+def accepted_encodings(request: HttpRequest) -> set[str]:
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    encodings = set()
+    for part in header.split(","):
+        encoding, _, quality = part.partition(";")
+        quality = quality.replace(" ", "").removeprefix("q=")
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            pass
+        encodings.add(encoding.strip().lower())
+    return encodings
+
+
+def resolve_media_file(request: HttpRequest, path: str) -> MediaFile:
+    """Find the file to send for the requested media path.
+
+    ``?variant=`` picks a resized airplane image variant when it exists, a
+    ``.br``/``.gz`` sibling is preferred when the client accepts it. Names
+    with a UUID never change their content and are marked immutable, unless
+    a variant was asked for that isn't generated yet.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    immutable = bool(UUID_RE.search(posixpath.basename(path)))
+    variant = request.GET.get("variant")
+    if variant in settings.AIRPLANE_IMAGE_VARIANTS:
+        variant_path = variant_name(path, variant)
+        if Path(safe_join(settings.MEDIA_ROOT, variant_path)).is_file():
+            path = variant_path
+        else:
+            immutable = False
+
+    full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    if not full_path.is_file():
+        raise Http404("The requested file does not exist.")
+
+    encodings = accepted_encodings(request)
+    for encoding, extension in PRECOMPRESSED_ENCODINGS:
+        compressed_path = full_path.with_name(full_path.name + extension)
+        if encoding in encodings and compressed_path.is_file():
+            return MediaFile(
+                path + extension, compressed_path, encoding, immutable
+            )
+    return MediaFile(path, full_path, None, immutable)
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive offsets.
+
+    Returns None when the header should be ignored and raises ValueError
+    when the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        suffix_length = int(end)
+        if not suffix_length:
+            raise ValueError("Empty suffix range.")
+        return max(size - suffix_length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError("Range is not satisfiable.")
+    return start, end
+
+
+def iter_range(file, start: int, length: int) -> Iterator[bytes]:
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(STREAM_BLOCK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def file_response(request: HttpRequest, full_path: Path) -> HttpResponse:
+    """Send the file from Python with single range support"""
+    size = full_path.stat().st_size
+    byte_range = None
+    range_header = request.META.get("HTTP_RANGE")
+    if_range = request.META.get("HTTP_IF_RANGE")
+    last_modified = http_date(full_path.stat().st_mtime)
+    if range_header and (not if_range or if_range == last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(full_path.open("rb"))
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            iter_range(full_path.open("rb"), start, end - start + 1),
+            status=206
+        )
+        response.headers["Content-Length"] = end - start + 1
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.headers["Accept-Ranges"] = "bytes"
+    return response
+
+
+def offloaded_response(path: str, full_path: Path) -> HttpResponse:
+    """Empty response telling the front server which file to send"""
+    response = HttpResponse()
+    if settings.MEDIA_SERVE_MODE == "x-accel-redirect":
+        prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/")
+        response.headers["X-Accel-Redirect"] = f"{prefix}/{path}"
+    else:
+        response.headers["X-Sendfile"] = str(full_path.resolve())
+    return response
+
+
+@require_safe
+def serve_media(request: HttpRequest, path: str) -> HttpResponse:
+    """Serve a file from MEDIA_ROOT with long-lived cache headers"""
+    media_file = resolve_media_file(request, path)
+    mtime = media_file.full_path.stat().st_mtime
+    if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), mtime):
+        response = HttpResponseNotModified()
+    elif settings.MEDIA_SERVE_MODE in ("x-accel-redirect", "x-sendfile"):
+        response = offloaded_response(media_file.path, media_file.full_path)
+    else:
+        response = file_response(request, media_file.full_path)
+
+    if response.status_code != 304:
+        # guess_type() strips the .br/.gz suffix of precompressed files
+        content_type, _ = mimetypes.guess_type(media_file.full_path.name)
+        response.headers["Content-Type"] = (
+            content_type or "application/octet-stream"
+        )
+    if media_file.encoding:
+        response.headers["Content-Encoding"] = media_file.encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Last-Modified"] = http_date(mtime)
+    response.headers["Cache-Control"] = cache_control(media_file.immutable)
+    return response
+
+
+def media_urlpatterns() -> list:
+    """URL patterns serving MEDIA_URL according to MEDIA_SERVE_MODE.
+
+    ``static`` keeps django.conf.urls.static, which only works with DEBUG.
+    """
+    if settings.MEDIA_SERVE_MODE == "static":
+        return static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    prefix = re.escape(settings.MEDIA_URL.lstrip("/"))
+    return [re_path(rf"^{prefix}(?P<path>.*)$", serve_media, name="media")]
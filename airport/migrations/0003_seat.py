@@ -0,0 +1,31 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0002_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Seat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row', models.PositiveIntegerField()),
+                ('seat', models.PositiveIntegerField()),
+                ('flight', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seats', to='airport.flight')),
+                ('ticket', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='inventory_seat', to='airport.ticket')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('ticket__isnull', True)), fields=['flight', 'row', 'seat'], name='seat_free_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='seat',
+            constraint=models.UniqueConstraint(fields=('flight', 'row', 'seat'), name='unique_inventory_flight_row_seat'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.3 on 2026-10-19 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POPULATE_SQL = """
+INSERT INTO airport_flightsearchrow (
+    flight_id, route_id,
+    source_name, source_city, source_country,
+    destination_name, destination_city, destination_country,
+    airplane_name, departure_time, arrival_time,
+    capacity, available_seats
+)
+SELECT
+    flight.id, flight.route_id,
+    source.name, source_city.name, source_country.name,
+    destination.name, destination_city.name, destination_country.name,
+    airplane.name, flight.departure_time, flight.arrival_time,
+    airplane.rows * airplane.seats_in_row,
+    airplane.rows * airplane.seats_in_row - (
+        SELECT COUNT(*) FROM airport_ticket ticket
+        WHERE ticket.flight_id = flight.id
+    )
+FROM airport_flight flight
+JOIN airport_route route ON route.id = flight.route_id
+JOIN airport_airport source ON source.id = route.source_id
+JOIN airport_airport destination ON destination.id = route.destination_id
+LEFT JOIN airport_city source_city ON source_city.id = source.closest_big_city_id
+LEFT JOIN airport_country source_country ON source_country.id = source_city.country_id
+LEFT JOIN airport_city destination_city
+    ON destination_city.id = destination.closest_big_city_id
+LEFT JOIN airport_country destination_country
+    ON destination_country.id = destination_city.country_id
+LEFT JOIN airport_airplane airplane ON airplane.id = flight.airplane_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0003_seat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlightSearchRow',
+            fields=[
+                ('flight', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_row', serialize=False, to='airport.flight')),
+                ('source_name', models.CharField(max_length=25)),
+                ('source_city', models.CharField(max_length=25, null=True)),
+                ('source_country', models.CharField(max_length=25, null=True)),
+                ('destination_name', models.CharField(max_length=25)),
+                ('destination_city', models.CharField(max_length=25, null=True)),
+                ('destination_country', models.CharField(max_length=25, null=True)),
+                ('airplane_name', models.CharField(max_length=25, null=True)),
+                ('departure_time', models.DateTimeField()),
+                ('arrival_time', models.DateTimeField()),
+                ('capacity', models.PositiveIntegerField(null=True)),
+                ('available_seats', models.IntegerField(null=True)),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='airport.route')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-departure_time', 'flight'], name='search_departure_idx'), models.Index(fields=['source_name', 'departure_time'], name='search_source_idx'), models.Index(fields=['destination_name', 'departure_time'], name='search_destination_idx'), models.Index(fields=['arrival_time'], name='search_arrival_idx')],
+            },
+        ),
+        migrations.RunSQL(POPULATE_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.3 on 2026-10-19 10:17
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to the big tables
+    atomic = False
+
+    dependencies = [
+        ('airport', '0004_flightsearchrow'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='flight',
+            index=models.Index(fields=['departure_time'], name='flight_departure_time_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['created_at'], name='order_created_at_idx'),
+        ),
+    ]
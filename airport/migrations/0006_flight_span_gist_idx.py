@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-19 10:27
+
+import airport.models
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('airport', '0005_flight_order_date_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='flight',
+            index=django.contrib.postgres.indexes.GistIndex(airport.models.TsTzRange('departure_time', 'arrival_time'), name='flight_span_gist_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-19 10:36
+
+import airport.models
+import django.contrib.postgres.constraints
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0006_flight_span_gist_idx'),
+    ]
+
+    # Existing overlaps make the constraint fail, list them first with
+    # manage.py check_airplane_schedule
+    operations = [
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('airplane__isnull', False)), expressions=[(airport.models.Int8Range('airplane', 'airplane', models.Value('[]')), '&&'), (airport.models.TsTzRange('departure_time', 'arrival_time'), '&&')], name='exclude_airplane_overlapping_flights', violation_error_message='The airplane is on another flight at that time.'),
+        ),
+    ]
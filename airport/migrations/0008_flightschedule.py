@@ -0,0 +1,40 @@
+# Generated by Django 5.0.3 on 2026-10-19 10:42
+
+import datetime
+import django.contrib.postgres.fields
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0007_flight_airplane_exclusion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlightSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('departure_time', models.TimeField()),
+                ('duration', models.DurationField()),
+                ('weekdays', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(7)]), default=list, help_text='ISO weekdays of the flight, 1 is Monday, empty for every day', size=None)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('generated_until', models.DateField(blank=True, editable=False, null=True)),
+                ('airplane', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='schedules', to='airport.airplane')),
+                ('crews', models.ManyToManyField(blank=True, related_name='schedules', to='airport.crew')),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='airport.route')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='flightschedule',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gte', models.F('start_date'))), name='schedule_end_date_not_before_start_date'),
+        ),
+        migrations.AddConstraint(
+            model_name='flightschedule',
+            constraint=models.CheckConstraint(check=models.Q(('duration__gt', datetime.timedelta(0))), name='schedule_duration_positive'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+from django.db import migrations
+
+# Index and foreign key names are the ones of 0004_flightsearchrow
+INDEXES_AND_FOREIGN_KEYS = [
+    'CREATE INDEX "airport_flightsearchrow_route_id_6af1ffe8" '
+    'ON "airport_flightsearchrow" ("route_id")',
+    'CREATE INDEX "search_departure_idx" '
+    'ON "airport_flightsearchrow" ("departure_time" DESC, "flight_id")',
+    'CREATE INDEX "search_source_idx" '
+    'ON "airport_flightsearchrow" ("source_name", "departure_time")',
+    'CREATE INDEX "search_destination_idx" '
+    'ON "airport_flightsearchrow" ("destination_name", "departure_time")',
+    'CREATE INDEX "search_arrival_idx" ON "airport_flightsearchrow" ("arrival_time")',
+    'ALTER TABLE "airport_flightsearchrow" '
+    'ADD CONSTRAINT "airport_flightsearchrow_flight_id_391670b8_fk_airport_flight_id" '
+    'FOREIGN KEY ("flight_id") REFERENCES "airport_flight" ("id") '
+    'DEFERRABLE INITIALLY DEFERRED',
+    'ALTER TABLE "airport_flightsearchrow" '
+    'ADD CONSTRAINT "airport_flightsearchrow_route_id_6af1ffe8_fk_airport_route_id" '
+    'FOREIGN KEY ("route_id") REFERENCES "airport_route" ("id") '
+    'DEFERRABLE INITIALLY DEFERRED',
+]
+
+PARTITION_TABLE = [
+    'ALTER TABLE "airport_flightsearchrow" RENAME TO "airport_flightsearchrow_unpartitioned"',
+    'ALTER TABLE "airport_flightsearchrow_unpartitioned" '
+    'RENAME CONSTRAINT "airport_flightsearchrow_pkey" TO "airport_flightsearchrow_unpartitioned_pkey"',
+    # The primary key of a partitioned table has to include the partition key
+    'CREATE TABLE "airport_flightsearchrow" ('
+    'LIKE "airport_flightsearchrow_unpartitioned" INCLUDING DEFAULTS INCLUDING CONSTRAINTS, '
+    'PRIMARY KEY ("flight_id", "departure_time")'
+    ') PARTITION BY RANGE ("departure_time")',
+    'CREATE TABLE "airport_flightsearchrow_default" PARTITION OF "airport_flightsearchrow" DEFAULT',
+    # One partition per month of the existing rows, named like
+    # airport.partitions.partition_name
+    """
+    DO $$
+    DECLARE
+        month date;
+    BEGIN
+        FOR month IN
+            SELECT DISTINCT date_trunc('month', departure_time)::date
+            FROM "airport_flightsearchrow_unpartitioned"
+        LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF "airport_flightsearchrow" '
+                'FOR VALUES FROM (%L) TO (%L)',
+                'airport_flightsearchrow_' || to_char(month, 'YYYYMM'),
+                month::timestamptz,
+                (month + interval '1 month')::timestamptz
+            );
+        END LOOP;
+    END
+    $$
+    """,
+    'INSERT INTO "airport_flightsearchrow" SELECT * FROM "airport_flightsearchrow_unpartitioned"',
+    'DROP TABLE "airport_flightsearchrow_unpartitioned"',
+    *INDEXES_AND_FOREIGN_KEYS,
+]
+
+# Detached partitions are left as they are
+UNPARTITION_TABLE = [
+    'ALTER TABLE "airport_flightsearchrow" RENAME TO "airport_flightsearchrow_partitioned"',
+    'ALTER TABLE "airport_flightsearchrow_partitioned" '
+    'RENAME CONSTRAINT "airport_flightsearchrow_pkey" TO "airport_flightsearchrow_partitioned_pkey"',
+    'CREATE TABLE "airport_flightsearchrow" ('
+    'LIKE "airport_flightsearchrow_partitioned" INCLUDING DEFAULTS INCLUDING CONSTRAINTS, '
+    'PRIMARY KEY ("flight_id")'
+    ')',
+    'INSERT INTO "airport_flightsearchrow" SELECT * FROM "airport_flightsearchrow_partitioned"',
+    'DROP TABLE "airport_flightsearchrow_partitioned"',
+    *INDEXES_AND_FOREIGN_KEYS,
+]
+
+
+class Migration(migrations.Migration):
+    """Turns the flight search table into monthly partitions by departure
+    time, whatever the settings, so every database has the same schema.
+
+    The DDL is written out here rather than imported from
+    airport.partitions, so later changes to that module don't change what
+    this migration does. The months of the existing rows get a partition,
+    later months go to the default partition until
+    ``python manage.py flight_search_partitions`` creates theirs.
+
+    Flight and Ticket stay plain tables: a partitioned table can't be
+    referenced by the foreign keys of tickets, seats and crews unless they
+    include the departure time.
+    """
+
+    dependencies = [
+        ('airport', '0008_flightschedule'),
+    ]
+
+    operations = [
+        migrations.RunSQL(PARTITION_TABLE, UNPARTITION_TABLE),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport', '0009_flight_search_partitioning'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='airplane',
+            name='image_variant_names',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
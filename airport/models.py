@@ -1,7 +1,19 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import (
+    ArrayField,
+    BigIntegerRangeField,
+    DateTimeRangeField,
+    RangeOperators
+)
+from django.contrib.postgres.indexes import GistIndex
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Q, F
+from django.db.models import Q, F, Func, Value
 
 from airport.helpers import airplane_image_file_path
 
@@ -105,6 +117,9 @@ class Airplane(models.Model):
         null=True,
         blank=True
     )
+    # Storage names of the resized variants of ``image`` by variant, set by
+    # ``airport.images.process_airplane_image`` once they are saved
+    image_variant_names = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         ordering = ["name"]
@@ -128,6 +143,19 @@ class Crew(models.Model):
         return f"{self.first_name} {self.last_name}"
 
 
+class TsTzRange(Func):
+    """``[start, end)`` range of two timestamps, ranges that only touch
+    don't overlap"""
+
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+class Int8Range(Func):
+    function = "INT8RANGE"
+    output_field = BigIntegerRangeField()
+
+
 class Flight(models.Model):
     route = models.ForeignKey(
         Route,
@@ -149,6 +177,14 @@ class Flight(models.Model):
 
     class Meta:
         ordering = ["-departure_time"]
+        indexes = [
+            models.Index(fields=["departure_time"], name="flight_departure_time_idx"),
+            # Overlap (&&) lookups of crew and airplane schedules
+            GistIndex(
+                TsTzRange("departure_time", "arrival_time"),
+                name="flight_span_gist_idx"
+            )
+        ]
         constraints = [
             models.CheckConstraint(
                 check=Q(arrival_time__gt=F("departure_time")),
@@ -157,6 +193,20 @@ class Flight(models.Model):
             models.UniqueConstraint(
                 fields=["route", "airplane", "departure_time"],
                 name="unique_route_airplane_departure_time"
+            ),
+            ExclusionConstraint(
+                name="exclude_airplane_overlapping_flights",
+                expressions=[
+                    # [airplane, airplane] ranges overlap for the same airplane,
+                    # which needs no btree_gist extension unlike = on the id
+                    (
+                        Int8Range("airplane", "airplane", Value("[]")),
+                        RangeOperators.OVERLAPS
+                    ),
+                    (TsTzRange("departure_time", "arrival_time"), RangeOperators.OVERLAPS)
+                ],
+                condition=Q(airplane__isnull=False),
+                violation_error_message="The airplane is on another flight at that time."
             )
         ]
 
@@ -164,6 +214,60 @@ class Flight(models.Model):
         return f"{self.route} | {self.departure_time}"
 
 
+class FlightSchedule(models.Model):
+    """Template of a recurring flight, e.g. daily at 06:00 except Sundays.
+
+    ``python manage.py extend_flight_schedules`` creates its flights from
+    ``start_date`` to ``end_date`` ahead of time, ``generated_until`` is the
+    last day whose flights have been created.
+    """
+
+    route = models.ForeignKey(
+        Route,
+        on_delete=models.CASCADE,
+        related_name="schedules"
+    )
+    airplane = models.ForeignKey(
+        Airplane,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="schedules"
+    )
+    crews = models.ManyToManyField(
+        Crew,
+        blank=True,
+        related_name="schedules"
+    )
+    departure_time = models.TimeField()
+    duration = models.DurationField()
+    weekdays = ArrayField(
+        models.PositiveSmallIntegerField(
+            validators=[MinValueValidator(1), MaxValueValidator(7)]
+        ),
+        default=list,
+        help_text="ISO weekdays of the flight, 1 is Monday, empty for every day"
+    )
+    start_date = models.DateField()
+    end_date = models.DateField()
+    generated_until = models.DateField(null=True, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=Q(end_date__gte=F("start_date")),
+                name="schedule_end_date_not_before_start_date"
+            ),
+            models.CheckConstraint(
+                check=Q(duration__gt=timedelta(0)),
+                name="schedule_duration_positive"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.route} | {self.departure_time:%H:%M}"
+
+
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
@@ -174,6 +278,9 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="order_created_at_idx")
+        ]
 
     def __str__(self) -> str:
         return f"{self.id}. {self.created_at}"
@@ -236,3 +343,123 @@ class Ticket(models.Model):
             self.flight,
             ValidationError
         )
+
+
+class Seat(models.Model):
+    """Seat inventory of a flight, generated for flights that sell out fast.
+
+    A seat is free while ``ticket`` is empty. Purchases claim free seats
+    with ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent buyers never
+    wait on each other.
+    """
+
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="seats"
+    )
+    row = models.PositiveIntegerField()
+    seat = models.PositiveIntegerField()
+    ticket = models.OneToOneField(
+        Ticket,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="inventory_seat"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("flight", "row", "seat"),
+                name="unique_inventory_flight_row_seat"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=("flight", "row", "seat"),
+                condition=Q(ticket__isnull=True),
+                name="seat_free_idx"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"Flight ID:{self.flight_id}. Seat; {self.seat}. Row; {self.row}"
+
+
+class FlightSearchRow(models.Model):
+    """Flat copy of a flight for the flight list and its filters.
+
+    Kept in sync by ``airport.search`` on writes, rebuilt with
+    ``python manage.py rebuild_flight_search``.
+    """
+
+    flight = models.OneToOneField(
+        Flight,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_row"
+    )
+    route = models.ForeignKey(
+        Route,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+    source_name = models.CharField(max_length=25)
+    source_city = models.CharField(max_length=25, null=True)
+    source_country = models.CharField(max_length=25, null=True)
+    destination_name = models.CharField(max_length=25)
+    destination_city = models.CharField(max_length=25, null=True)
+    destination_country = models.CharField(max_length=25, null=True)
+    airplane_name = models.CharField(max_length=25, null=True)
+    departure_time = models.DateTimeField()
+    arrival_time = models.DateTimeField()
+    capacity = models.PositiveIntegerField(null=True)
+    available_seats = models.IntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=("-departure_time", "flight"),
+                name="search_departure_idx"
+            ),
+            models.Index(
+                fields=("source_name", "departure_time"),
+                name="search_source_idx"
+            ),
+            models.Index(
+                fields=("destination_name", "departure_time"),
+                name="search_destination_idx"
+            ),
+            models.Index(fields=("arrival_time",), name="search_arrival_idx")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.source_name} - {self.destination_name} | {self.departure_time}"
+
+
+class IdempotencyKey(models.Model):
+    """Response of a create request, replayed when it is retried"""
+
+    key = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys"
+    )
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("user", "key"),
+                name="unique_user_idempotency_key"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id}. {self.key}"
@@ -0,0 +1,158 @@
+import hashlib
+import json
+from typing import Optional, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+def planner_estimate(queryset: QuerySet) -> Optional[int]:
+    """Rows PostgreSQL expects the queryset to return, ``None`` elsewhere"""
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(queryset: QuerySet, timeout: int) -> int:
+    """Exact count of the queryset, reused for ``timeout`` seconds"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.blake2b(f"{sql}{params!r}".encode(), digest_size=20).hexdigest()
+    key = f"count:{queryset.db}:{digest}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+def estimated_count(
+        queryset: QuerySet,
+        threshold: Optional[int] = None
+) -> tuple[int, bool]:
+    """Number of rows of the queryset and whether it may be off.
+
+    ``EXPLAIN`` costs the same on any table size, an exact ``COUNT(*)``
+    reads every matching row. Below ``threshold`` estimated rows the count
+    is exact. Above it the planner estimate is returned, or with
+    ``ESTIMATED_COUNT_CACHE_TIMEOUT`` an exact count that can be as old as
+    the timeout.
+    """
+    if threshold is None:
+        threshold = settings.ESTIMATED_COUNT_THRESHOLD
+    estimate = planner_estimate(queryset)
+    if estimate is None or estimate < threshold:
+        return queryset.count(), False
+    if settings.ESTIMATED_COUNT_CACHE_TIMEOUT:
+        return cached_count(queryset, settings.ESTIMATED_COUNT_CACHE_TIMEOUT), True
+    return estimate, True
+
+
+class EstimatedPage(Page):
+    """Page that knows from one extra row whether another page follows"""
+
+    def __init__(
+            self,
+            object_list: list,
+            number: int,
+            paginator: Paginator,
+            has_next: bool
+    ) -> None:
+        super().__init__(object_list, number, paginator)
+        self.next_exists = has_next
+
+    def has_next(self) -> bool:
+        return self.next_exists
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting big querysets with ``estimated_count``.
+
+    While the count is approximate, pages past the estimated last page are
+    served as long as they have rows, and the next page is detected by
+    fetching one row more. The last page turns the count exact.
+    """
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self) -> int:
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.count_is_estimate = estimated_count(self.object_list)
+        return count
+
+    def validate_number(self, number: Union[int, float, str]) -> int:
+        if not (self.count and self.count_is_estimate):
+            return super().validate_number(number)
+        # The real count may be above the estimate, ``page()`` checks the
+        # pages past the estimated last one for rows instead
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number: Union[int, float, str]) -> Page:
+        if not (self.count and self.count_is_estimate):
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        has_next = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if not object_list and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        if not has_next:
+            self.count = bottom + len(object_list)
+            self.count_is_estimate = False
+            self.__dict__.pop("num_pages", None)
+        return EstimatedPage(object_list, number, self, has_next)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """Page number pagination for big lists, see ``EstimatedCountPaginator``.
+
+    ``count_is_estimate`` tells whether ``count`` is approximate.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response({
+            "count": self.page.paginator.count,
+            "count_is_estimate": self.page.paginator.count_is_estimate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        properties = response_schema["properties"]
+        response_schema["properties"] = {
+            "count": properties.pop("count"),
+            "count_is_estimate": {"type": "boolean", "example": False},
+            **properties
+        }
+        return response_schema
+
+
+class RosterPagination(CursorPagination):
+    """Keyset pagination of roster rows by departure time, each page is
+    read from the index position of the previous one however deep it is"""
+
+    ordering = ("departure_time", "flight_id", "crew_id")
+    page_size_query_param = "page_size"
+    max_page_size = 500
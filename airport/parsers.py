@@ -0,0 +1,47 @@
+import io
+from typing import Any, Optional
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from airport.renderers import FastJSONRenderer, orjson
+
+# Maps digits to "0" and everything else to " " to look for long numbers
+# with a substring search, much faster than a regular expression.
+DIGITS = bytes(
+    ord("0") if ord("0") <= code <= ord("9") else ord(" ")
+    for code in range(256)
+)
+# orjson reads integers from -2 ** 63 to 2 ** 64 - 1 exactly, 19 digits
+# can already be out of that range when negative
+LONG_NUMBER = b"0" * 19
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` decoding UTF-8 bodies with ``orjson`` when it is installed.
+
+    ``orjson`` reads integers beyond 64 bits as floats, so bodies with runs
+    of 19 digits or more, other encodings and bodies ``orjson`` rejects are
+    parsed by the stdlib, which keeps its results and error messages.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(
+            self,
+            stream: Any,
+            media_type: Optional[str] = None,
+            parser_context: Optional[dict] = None
+    ) -> Any:
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_NUMBER not in body.translate(DIGITS):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,121 @@
+"""Monthly PostgreSQL partitions of the flight search table.
+
+The 0009 migration turns ``FlightSearchRow`` into a table partitioned by
+``departure_time`` range, one partition per month and a default one for
+months without a partition.
+Flight list queries with a departure date window only read the partitions
+of the window, and old months can be detached instead of deleted row by row.
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from airport.models import FlightSearchRow
+
+TABLE = FlightSearchRow._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_{month:%Y%m}"
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    tz = timezone.get_current_timezone()
+    return (
+        datetime.combine(month, time.min, tzinfo=tz),
+        datetime.combine(next_month(month), time.min, tzinfo=tz)
+    )
+
+
+def is_partitioned() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT FROM pg_partitioned_table WHERE partrelid = %s::regclass)",
+            [TABLE]
+        )
+        return cursor.fetchone()[0]
+
+
+def partition_months() -> list[date]:
+    """Months that have a partition, oldest first"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [TABLE]
+        )
+        names = [name for name, in cursor.fetchall() if name != DEFAULT_PARTITION]
+    return sorted(
+        datetime.strptime(name.rsplit("_", 1)[1], "%Y%m").date() for name in names
+    )
+
+
+def create_partition(month: date) -> bool:
+    """Add the partition of a month unless it exists. Rows of the month that
+    went to the default partition are moved to it before it is attached."""
+    month = month_start(month)
+    if month in partition_months():
+        return False
+    name = partition_name(month)
+    start, end = month_bounds(month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE "{name}" '
+            f'(LIKE "{TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM "{DEFAULT_PARTITION}"
+                WHERE departure_time >= %s AND departure_time < %s
+                RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+            """,
+            [start, end]
+        )
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [start, end]
+        )
+    return True
+
+
+def detach_partition(month: date, drop: bool = False) -> str:
+    """Take the partition of a month out of the table, the detached table
+    keeps its rows unless dropped. Returns the partition name.
+
+    A detached partition keeps the foreign keys it inherited, they are
+    dropped so the flights and routes of its rows can still be deleted.
+    """
+    name = partition_name(month_start(month))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"')
+        if drop:
+            cursor.execute(f'DROP TABLE "{name}"')
+            return name
+        # Deferred foreign key checks of rows written in this transaction
+        # would block the ALTER TABLE statements
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [name]
+        )
+        for constraint_name, in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE "{name}" DROP CONSTRAINT "{constraint_name}"')
+    return name
@@ -0,0 +1,335 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from airport.inventory import inventory_flight_ids
+from airport.models import Flight, Order, Seat, Ticket
+from airport.search import refresh_available_seats_on_commit
+from airport.seating import SeatMap, assign_missing_seats
+
+ADVISORY_LOCK_NAMESPACE = 0x464C54
+
+
+class SeatTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The seat has just been taken by another order."
+    default_code = "seat_taken"
+
+
+def group_by_flight(tickets_data: list[dict]) -> dict[int, list[dict]]:
+    tickets_by_flight = defaultdict(list)
+    for ticket in tickets_data:
+        tickets_by_flight[ticket["flight"].pk].append(ticket)
+    return tickets_by_flight
+
+
+def seat_tickets(
+        seat_map: SeatMap,
+        flight_id: int,
+        tickets: list[dict],
+        reject_taken: bool
+) -> None:
+    """Take the requested seats and assign seats to the other tickets"""
+    unassigned = []
+    for ticket in tickets:
+        if ticket.get("row") is None:
+            unassigned.append(ticket)
+        elif reject_taken and not seat_map.is_free(ticket["row"], ticket["seat"]):
+            raise SeatTaken(
+                f"Row {ticket['row']} seat {ticket['seat']} of "
+                f"flight {flight_id} is already taken."
+            )
+        else:
+            seat_map.take(ticket["row"], ticket["seat"])
+
+    if not unassigned:
+        return
+    seats = seat_map.allocate(len(unassigned))
+    if seats is None:
+        raise SeatTaken(
+            f"Flight {flight_id} doesn't have {len(unassigned)} free seats."
+        )
+    for ticket, (row, seat) in zip(unassigned, seats):
+        ticket["row"], ticket["seat"] = row, seat
+
+
+def claim_seats(flight_id: int, tickets: list[dict]) -> list[Seat]:
+    """Lock free seats of the flight for ``tickets`` and fill in the
+    ``row``/``seat`` of the tickets sent without them.
+
+    Seats locked by other transactions are skipped rather than waited for,
+    a requested seat that is sold or being bought raises ``SeatTaken``.
+    Has to be called inside a transaction.
+    """
+    free_seats = Seat.objects.select_for_update(skip_locked=True).filter(
+        flight_id=flight_id,
+        ticket__isnull=True
+    )
+    requested = [ticket for ticket in tickets if ticket.get("row") is not None]
+    unassigned = [ticket for ticket in tickets if ticket.get("row") is None]
+
+    claimed = []
+    if requested:
+        positions = {(ticket["row"], ticket["seat"]) for ticket in requested}
+        claimed = list(
+            free_seats.filter(
+                reduce(or_, (Q(row=row, seat=seat) for row, seat in positions))
+            )
+        )
+        missing = positions - {(seat.row, seat.seat) for seat in claimed}
+        if missing:
+            row, seat = min(missing)
+            raise SeatTaken(
+                f"Row {row} seat {seat} of flight {flight_id} is already taken."
+            )
+
+    if unassigned:
+        assigned = list(
+            free_seats.exclude(
+                pk__in=[seat.pk for seat in claimed]
+            ).order_by("row", "seat")[:len(unassigned)]
+        )
+        if len(assigned) < len(unassigned):
+            raise SeatTaken(
+                f"Flight {flight_id} doesn't have {len(unassigned)} free seats."
+            )
+        for ticket, seat in zip(unassigned, assigned):
+            ticket["row"], ticket["seat"] = seat.row, seat.seat
+        claimed += assigned
+
+    return claimed
+
+
+def create_inventory_tickets(tickets_data: list[dict]) -> list[Ticket]:
+    """Create tickets on flights with a seat inventory and mark their
+    seats as sold"""
+    seats = {}
+    for flight_id, flight_tickets in sorted(group_by_flight(tickets_data).items()):
+        for seat in claim_seats(flight_id, flight_tickets):
+            seats[flight_id, seat.row, seat.seat] = seat
+
+    try:
+        with transaction.atomic():
+            tickets = Ticket.objects.bulk_create(
+                Ticket(**ticket) for ticket in tickets_data
+            )
+    except IntegrityError:
+        # a ticket sold before its flight got an inventory
+        raise SeatTaken()
+
+    for ticket in tickets:
+        seats[ticket.flight_id, ticket.row, ticket.seat].ticket = ticket
+    Seat.objects.bulk_update(seats.values(), ["ticket"])
+    return tickets
+
+
+def reseat_ticket(ticket: Ticket) -> None:
+    """Move the inventory seat of a ticket after its flight, row or seat
+    was changed. Has to be called inside a transaction."""
+    Seat.objects.filter(ticket=ticket).update(ticket=None)
+    if not inventory_flight_ids([ticket.flight_id]):
+        return
+    updated = Seat.objects.filter(
+        pk__in=Seat.objects.select_for_update(skip_locked=True).filter(
+            flight_id=ticket.flight_id,
+            row=ticket.row,
+            seat=ticket.seat,
+            ticket__isnull=True
+        ).values("pk")
+    ).update(ticket=ticket)
+    if not updated:
+        raise SeatTaken()
+
+
+class PurchaseStrategy:
+    """Creates the tickets of an order inside the order transaction.
+
+    Tickets on flights with a seat inventory always claim their seats from
+    the inventory, the strategy handles the other flights. Tickets are
+    bulk created without signals, so the search rows are refreshed here.
+    """
+
+    name = None
+
+    def create_tickets(
+            self,
+            order: Optional[Order],
+            tickets_data: list[dict]
+    ) -> list[Ticket]:
+        """Create the tickets of ``order``. Tickets of several orders are
+        created together when every ticket carries its own ``order``."""
+        for ticket in tickets_data:
+            ticket.setdefault("order", order)
+        flight_ids = {ticket["flight"].pk for ticket in tickets_data}
+        refresh_available_seats_on_commit(flight_ids)
+        inventory = inventory_flight_ids(flight_ids)
+        if not inventory:
+            return self.create_flight_tickets(tickets_data)
+
+        tickets = create_inventory_tickets(
+            [ticket for ticket in tickets_data if ticket["flight"].pk in inventory]
+        )
+        other_tickets = [
+            ticket for ticket in tickets_data if ticket["flight"].pk not in inventory
+        ]
+        if other_tickets:
+            tickets += self.create_flight_tickets(other_tickets)
+        return tickets
+
+    def create_flight_tickets(self, tickets_data: list[dict]) -> list[Ticket]:
+        raise NotImplementedError
+
+
+class UniqueConstraintStrategy(PurchaseStrategy):
+    """Insert the tickets and let ``unique_row_seat_flight`` reject taken
+    seats. A conflict aborts the whole order."""
+
+    name = "unique_constraint"
+
+    def create_flight_tickets(self, tickets_data: list[dict]) -> list[Ticket]:
+        assign_missing_seats(tickets_data)
+        try:
+            with transaction.atomic():
+                return Ticket.objects.bulk_create(
+                    Ticket(**ticket) for ticket in tickets_data
+                )
+        except IntegrityError:
+            raise SeatTaken()
+
+
+class LockingStrategy(PurchaseStrategy):
+    """Serialize the purchases of a flight and seat them from a SeatMap.
+
+    Taken seats are found before inserting, so a conflict is reported
+    without an aborted insert.
+    """
+
+    def lock(self, flight_ids: list[int]) -> None:
+        raise NotImplementedError
+
+    def create_flight_tickets(self, tickets_data: list[dict]) -> list[Ticket]:
+        tickets_by_flight = group_by_flight(tickets_data)
+        flight_ids = sorted(tickets_by_flight)
+        self.lock(flight_ids)
+
+        flights = Flight.objects.select_related("airplane").in_bulk(flight_ids)
+        for flight_id in flight_ids:
+            seat_tickets(
+                SeatMap.for_flight(flights[flight_id]),
+                flight_id,
+                tickets_by_flight[flight_id],
+                reject_taken=True
+            )
+
+        return Ticket.objects.bulk_create(
+            Ticket(**ticket) for ticket in tickets_data
+        )
+
+
+class FlightLockStrategy(LockingStrategy):
+    """``SELECT ... FOR NO KEY UPDATE`` on the flight rows, which doesn't
+    block the key-share locks taken by foreign keys to the flight."""
+
+    name = "flight_lock"
+
+    def lock(self, flight_ids: list[int]) -> None:
+        list(
+            Flight.objects.select_for_update(no_key=True).filter(
+                pk__in=flight_ids
+            ).order_by("pk").values_list("pk", flat=True)
+        )
+
+
+class AdvisoryLockStrategy(LockingStrategy):
+    """Transaction-level advisory lock per flight, no row is locked.
+
+    The key is truncated to 31 bits, a collision only serializes two
+    unrelated flights.
+    """
+
+    name = "advisory_lock"
+
+    def lock(self, flight_ids: list[int]) -> None:
+        with connection.cursor() as cursor:
+            for flight_id in flight_ids:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s, %s)",
+                    [ADVISORY_LOCK_NAMESPACE, flight_id & 0x7FFFFFFF]
+                )
+
+
+class OptimisticStrategy(PurchaseStrategy):
+    """Insert every ticket in its own savepoint without locking.
+
+    When the seat was taken in the meantime, only the savepoint is rolled
+    back and the ticket is moved to the nearest free seat, up to
+    ``SEAT_PURCHASE_MAX_RETRIES`` times.
+    """
+
+    name = "optimistic"
+
+    def create_flight_tickets(self, tickets_data: list[dict]) -> list[Ticket]:
+        tickets_by_flight = group_by_flight(tickets_data)
+        flights = Flight.objects.select_related("airplane").in_bulk(
+            tickets_by_flight
+        )
+        tickets = []
+        for flight_id, flight_tickets in tickets_by_flight.items():
+            seat_tickets(
+                SeatMap.for_flight(flights[flight_id]),
+                flight_id,
+                flight_tickets,
+                reject_taken=False
+            )
+            for ticket_data in flight_tickets:
+                tickets.append(
+                    self.insert(Ticket(**ticket_data))
+                )
+        return tickets
+
+    def insert(self, ticket: Ticket) -> Ticket:
+        for _ in range(settings.SEAT_PURCHASE_MAX_RETRIES + 1):
+            try:
+                with transaction.atomic():
+                    ticket.save(force_insert=True)
+                return ticket
+            except IntegrityError:
+                alternative = self.alternative_seat(ticket)
+                if alternative is None:
+                    break
+                ticket.row, ticket.seat = alternative
+        raise SeatTaken()
+
+    @staticmethod
+    def alternative_seat(ticket: Ticket) -> Optional[tuple[int, int]]:
+        return SeatMap.for_flight(ticket.flight).find_near(ticket.row, ticket.seat)
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (
+        UniqueConstraintStrategy,
+        FlightLockStrategy,
+        AdvisoryLockStrategy,
+        OptimisticStrategy
+    )
+}
+
+
+def get_purchase_strategy(name: Optional[str] = None) -> PurchaseStrategy:
+    name = name or settings.SEAT_PURCHASE_STRATEGY
+    try:
+        return STRATEGIES[name]()
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown SEAT_PURCHASE_STRATEGY {name!r}, "
+            f"choose one of: {', '.join(STRATEGIES)}"
+        )
@@ -0,0 +1,59 @@
+from typing import Any, Optional
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+) if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` encoding with ``orjson`` when it is installed.
+
+    Dates, times, decimals, lazy strings and the other types ``json`` can't
+    encode go through DRF's ``JSONEncoder.default``, so they are written
+    exactly as before, and U+2028/U+2029 are still escaped. Indented or
+    ASCII-only output, and whatever ``orjson`` refuses (integers beyond 64
+    bits, errors raised by ``default``), is rendered by the stdlib.
+    NaN and infinity are written as ``null`` instead of raising, and floats
+    in exponent notation without the sign and padding of the exponent
+    (``1e16`` for ``1e+16``, ``1e-7`` for ``1e-07``), the same numbers to
+    any JSON reader.
+    """
+
+    def render(
+            self,
+            data: Any,
+            accepted_media_type: Optional[str] = None,
+            renderer_context: Optional[dict] = None
+    ) -> bytes:
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
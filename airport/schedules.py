@@ -0,0 +1,120 @@
+from datetime import date, datetime, timedelta
+from typing import Iterator, NamedTuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from airport.crew_schedule import Assignment, assignment_conflicts, lock_crews
+from airport.models import Flight, FlightSchedule
+from airport.search import rebuild_search_rows
+
+
+class ScheduleExtension(NamedTuple):
+    created: int
+    # Departures left out because the airplane is on another flight
+    skipped: int
+    # Crew members left off flights overlapping their other flights
+    crew_conflicts: int
+
+
+def schedule_departures(
+        schedule: FlightSchedule,
+        start: date,
+        end: date
+) -> Iterator[datetime]:
+    """Departure times of the schedule from start to end, both included"""
+    tz = timezone.get_current_timezone()
+    day = start
+    while day <= end:
+        if not schedule.weekdays or day.isoweekday() in schedule.weekdays:
+            yield datetime.combine(day, schedule.departure_time, tzinfo=tz)
+        day += timedelta(days=1)
+
+
+def chunks(items: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def extend_schedule(
+        schedule: FlightSchedule,
+        until: date,
+        batch_size: int = 1000
+) -> ScheduleExtension:
+    """Create the flights of the schedule up to ``until``, starting after the
+    last generated day.
+
+    Flights and crew assignments are inserted with ``bulk_create`` a chunk
+    at a time, ``ON CONFLICT DO NOTHING`` leaves out the departures the
+    flight table already has (``unique_route_airplane_departure_time``) and
+    those of an airplane that is on another flight. Existing flights of the
+    schedule get its crew. ``bulk_create`` sends no signals, so the search
+    rows of the new flights are built here.
+    """
+    start = schedule.start_date
+    if schedule.generated_until:
+        start = max(start, schedule.generated_until + timedelta(days=1))
+    end = min(schedule.end_date, until)
+    if start > end:
+        return ScheduleExtension(0, 0, 0)
+
+    created = skipped = crew_conflicts = 0
+    with transaction.atomic():
+        crew_ids = sorted(schedule.crews.values_list("pk", flat=True))
+        lock_crews(set(crew_ids))
+        for departures in chunks(schedule_departures(schedule, start, end), batch_size):
+            flight_qs = Flight.objects.filter(
+                route_id=schedule.route_id,
+                airplane_id=schedule.airplane_id,
+                departure_time__in=departures
+            )
+            existing = set(flight_qs.values_list("pk", flat=True))
+            Flight.objects.bulk_create(
+                [
+                    Flight(
+                        route_id=schedule.route_id,
+                        airplane_id=schedule.airplane_id,
+                        departure_time=departure_time,
+                        arrival_time=departure_time + schedule.duration
+                    )
+                    for departure_time in departures
+                ],
+                ignore_conflicts=True
+            )
+            flights = list(flight_qs.values_list("pk", "departure_time", "arrival_time"))
+            new_ids = [pk for pk, _, _ in flights if pk not in existing]
+            created += len(new_ids)
+            skipped += len(departures) - len(flights)
+
+            conflicts = {
+                (conflict.crew, conflict.flight)
+                for conflict in assignment_conflicts(
+                    [
+                        Assignment(crew_id, pk, departure_time, arrival_time)
+                        for pk, departure_time, arrival_time in flights
+                        for crew_id in crew_ids
+                    ]
+                )
+            }
+            crew_conflicts += len(conflicts)
+            Flight.crews.through.objects.bulk_create(
+                [
+                    Flight.crews.through(crew_id=crew_id, flight_id=pk)
+                    for pk, _, _ in flights
+                    for crew_id in crew_ids
+                    if (crew_id, pk) not in conflicts
+                ],
+                ignore_conflicts=True,
+                batch_size=batch_size
+            )
+            rebuild_search_rows(Flight.objects.filter(pk__in=new_ids), batch_size)
+
+        schedule.generated_until = end
+        schedule.save(update_fields=["generated_until"])
+    return ScheduleExtension(created, skipped, crew_conflicts)
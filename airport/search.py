@@ -0,0 +1,159 @@
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from airport.availability import available_seats
+from airport.models import (
+    Airplane,
+    Airport,
+    City,
+    Country,
+    Flight,
+    FlightSearchRow,
+    Route,
+    Ticket
+)
+
+
+def search_row(flight: Flight) -> FlightSearchRow:
+    source, destination = flight.route.source, flight.route.destination
+    row = FlightSearchRow(
+        flight=flight,
+        route=flight.route,
+        source_name=source.name,
+        destination_name=destination.name,
+        departure_time=flight.departure_time,
+        arrival_time=flight.arrival_time,
+        available_seats=flight.available
+    )
+    for prefix, airport in (("source", source), ("destination", destination)):
+        city = airport.closest_big_city
+        if city is not None:
+            setattr(row, f"{prefix}_city", city.name)
+            setattr(row, f"{prefix}_country", city.country.name)
+    if flight.airplane is not None:
+        row.airplane_name = flight.airplane.name
+        row.capacity = flight.airplane.capacity
+    return row
+
+
+def rebuild_search_rows(flight_qs: QuerySet, batch_size: int = 1000) -> int:
+    """Insert or overwrite the search rows of the flights"""
+    flight_qs = flight_qs.select_related(
+        "route__source__closest_big_city__country",
+        "route__destination__closest_big_city__country",
+        "airplane"
+    ).annotate(
+        available=available_seats()
+    ).order_by("pk")
+
+    rebuilt = 0
+    batch = []
+    for flight in flight_qs.iterator(chunk_size=batch_size):
+        batch.append(search_row(flight))
+        if len(batch) == batch_size:
+            rebuilt += save_search_rows(batch)
+            batch = []
+    if batch:
+        rebuilt += save_search_rows(batch)
+    return rebuilt
+
+
+def save_search_rows(rows: list[FlightSearchRow]) -> int:
+    # The partitioned table is unique on (flight, departure_time) only, an
+    # upsert would give a flight that moved to another month a second row
+    with transaction.atomic():
+        FlightSearchRow.objects.filter(
+            flight_id__in=[row.flight_id for row in rows]
+        )._raw_delete(FlightSearchRow.objects.db)
+        FlightSearchRow.objects.bulk_create(rows)
+    return len(rows)
+
+
+def refresh_available_seats(flight_ids: Iterable[int]) -> None:
+    tickets_sold = Ticket.objects.filter(
+        flight=OuterRef("flight_id")
+    ).order_by().values("flight").annotate(count=Count("pk")).values("count")
+    FlightSearchRow.objects.filter(flight_id__in=list(flight_ids)).update(
+        available_seats=F("capacity") - Coalesce(Subquery(tickets_sold), 0)
+    )
+
+
+def refresh_available_seats_on_commit(flight_ids: Iterable[int]) -> None:
+    """Recount the sold tickets once the ticket writes are committed.
+
+    Counting after the commit keeps the search rows of busy flights from
+    being locked for the whole purchase transaction. The count is not an
+    increment, so refreshes running in any order end up correct.
+    """
+    flight_ids = set(flight_ids)
+    if flight_ids:
+        transaction.on_commit(lambda: refresh_available_seats(flight_ids))
+
+
+def flights_of_airports(airport_qs: QuerySet) -> QuerySet:
+    return Flight.objects.filter(
+        Q(route__source__in=airport_qs) | Q(route__destination__in=airport_qs)
+    )
+
+
+@receiver(post_save, sender=Flight)
+def flight_saved(instance: Flight, **kwargs) -> None:
+    rebuild_search_rows(Flight.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Route)
+def route_saved(instance: Route, **kwargs) -> None:
+    rebuild_search_rows(instance.flights.all())
+
+
+@receiver(post_save, sender=Airport)
+def airport_saved(instance: Airport, **kwargs) -> None:
+    rebuild_search_rows(flights_of_airports(Airport.objects.filter(pk=instance.pk)))
+
+
+@receiver(post_save, sender=City)
+def city_saved(instance: City, **kwargs) -> None:
+    rebuild_search_rows(flights_of_airports(instance.airports.all()))
+
+
+@receiver(post_save, sender=Country)
+def country_saved(instance: Country, **kwargs) -> None:
+    rebuild_search_rows(
+        flights_of_airports(Airport.objects.filter(closest_big_city__country=instance))
+    )
+
+
+@receiver(post_save, sender=Airplane)
+def airplane_saved(instance: Airplane, **kwargs) -> None:
+    rebuild_search_rows(instance.flights.all())
+
+
+@receiver(pre_delete, sender=City)
+@receiver(pre_delete, sender=Airplane)
+def remember_flights(sender, instance, **kwargs) -> None:
+    """Flights whose city or airplane is set to NULL by the delete, which
+    sends no ``post_save``"""
+    if sender is City:
+        flight_qs = flights_of_airports(instance.airports.all())
+    else:
+        flight_qs = instance.flights.all()
+    instance.search_flight_ids = list(flight_qs.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=City)
+@receiver(post_delete, sender=Airplane)
+def rebuild_remembered_flights(instance, **kwargs) -> None:
+    flight_ids = getattr(instance, "search_flight_ids", [])
+    if flight_ids:
+        rebuild_search_rows(Flight.objects.filter(pk__in=flight_ids))
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def ticket_changed(instance: Ticket, **kwargs) -> None:
+    refresh_available_seats_on_commit([instance.flight_id])
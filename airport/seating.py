@@ -0,0 +1,151 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from rest_framework.exceptions import ValidationError
+
+from airport.models import Flight, Ticket
+
+Seat = tuple[int, int]
+
+
+class SeatMap:
+    """Free seats of a flight, one bitmask per row.
+
+    Bit ``n - 1`` of ``free[row - 1]`` is set while seat ``n`` of the row
+    is free, so a row is checked for adjacent free seats with a few integer
+    operations instead of one query per candidate seat.
+    """
+
+    def __init__(
+            self,
+            rows: int,
+            seats_in_row: int,
+            taken: Iterable[Seat] = ()
+    ) -> None:
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.free = [(1 << seats_in_row) - 1] * rows
+        for row, seat in taken:
+            self.take(row, seat)
+
+    @classmethod
+    def for_flight(cls, flight: Flight) -> "SeatMap":
+        taken = Ticket.objects.filter(flight=flight).values_list("row", "seat")
+        return cls(flight.airplane.rows, flight.airplane.seats_in_row, taken)
+
+    @property
+    def free_count(self) -> int:
+        return sum(row.bit_count() for row in self.free)
+
+    def is_free(self, row: int, seat: int) -> bool:
+        return bool(self.free[row - 1] >> (seat - 1) & 1)
+
+    def take(self, row: int, seat: int) -> None:
+        if 0 < row <= self.rows and 0 < seat <= self.seats_in_row:
+            self.free[row - 1] &= ~(1 << (seat - 1))
+
+    def find_adjacent(self, count: int) -> Optional[list[Seat]]:
+        """First ``count`` adjacent free seats in one row"""
+        if not 0 < count <= self.seats_in_row:
+            return None
+        for index, free in enumerate(self.free):
+            runs = free
+            for shift in range(1, count):
+                runs &= free >> shift
+                if not runs:
+                    break
+            if runs:
+                first_seat = (runs & -runs).bit_length()
+                return [
+                    (index + 1, first_seat + offset) for offset in range(count)
+                ]
+        return None
+
+    def find_nearest(self, count: int) -> Optional[list[Seat]]:
+        """Free seats around the row with the most free seats"""
+        if count > self.free_count:
+            return None
+        anchor = max(range(self.rows), key=lambda index: self.free[index].bit_count())
+        rows_by_distance = sorted(
+            range(self.rows),
+            key=lambda index: (abs(index - anchor), index)
+        )
+        seats = []
+        for index in rows_by_distance:
+            free = self.free[index]
+            while free and len(seats) < count:
+                seat = (free & -free).bit_length()
+                seats.append((index + 1, seat))
+                free &= free - 1
+            if len(seats) == count:
+                return seats
+        return None
+
+    def find_near(self, row: int, seat: int) -> Optional[Seat]:
+        """Free seat closest to the given one, preferring the same row"""
+        rows_by_distance = sorted(
+            range(1, self.rows + 1),
+            key=lambda candidate: (abs(candidate - row), candidate)
+        )
+        for candidate_row in rows_by_distance:
+            free = self.free[candidate_row - 1]
+            if free:
+                free_seats = [
+                    index + 1 for index in range(self.seats_in_row)
+                    if free >> index & 1
+                ]
+                return candidate_row, min(
+                    free_seats,
+                    key=lambda candidate: (abs(candidate - seat), candidate)
+                )
+        return None
+
+    def allocate(self, count: int) -> Optional[list[Seat]]:
+        """Take ``count`` seats, adjacent ones when a row has enough of them"""
+        seats = self.find_adjacent(count) or self.find_nearest(count)
+        if seats:
+            for row, seat in seats:
+                self.take(row, seat)
+        return seats
+
+
+def assign_missing_seats(tickets_data: list[dict]) -> None:
+    """Fill in ``row``/``seat`` of the tickets that were sent without them.
+
+    Tickets of the same flight are seated together. The flights are locked
+    with ``SELECT ... FOR NO KEY UPDATE`` (in id order to avoid deadlocks), so two
+    orders assigning seats on the same flight never see the same free seats.
+    Has to be called inside a transaction.
+    """
+    unassigned = defaultdict(list)
+    requested = defaultdict(list)
+    for ticket in tickets_data:
+        if ticket.get("row") is None:
+            unassigned[ticket["flight"].pk].append(ticket)
+        else:
+            requested[ticket["flight"].pk].append((ticket["row"], ticket["seat"]))
+
+    if not unassigned:
+        return
+
+    flights = Flight.objects.select_for_update(
+        of=("self",),
+        no_key=True
+    ).select_related("airplane").filter(pk__in=unassigned).order_by("pk")
+    for flight in flights:
+        if flight.airplane is None:
+            raise ValidationError(
+                {"flight": f"Flight {flight.pk} has no airplane to assign seats in."}
+            )
+        seat_map = SeatMap.for_flight(flight)
+        for row, seat in requested[flight.pk]:
+            seat_map.take(row, seat)
+
+        tickets = unassigned[flight.pk]
+        seats = seat_map.allocate(len(tickets))
+        if seats is None:
+            raise ValidationError(
+                {"tickets": f"Flight {flight.pk} doesn't have {len(tickets)} free seats."}
+            )
+        for ticket, (row, seat) in zip(tickets, seats):
+            ticket["row"], ticket["seat"] = row, seat
@@ -1,8 +1,13 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.validators import UniqueTogetherValidator
 
+from airport.crew_schedule import flight_crew_errors
+from airport.fieldsets import SparseFieldsetsMixin
+from airport.images import image_variant_urls
 from airport.models import (
     Country,
     City,
@@ -13,17 +18,20 @@ from airport.models import (
     AirplaneType,
     Airplane,
     Ticket,
-    Order
+    Order,
+    FlightSearchRow
 )
+from airport.purchase import get_purchase_strategy, reseat_ticket
+from airport.search import refresh_available_seats_on_commit
 
 
-class CountrySerializer(serializers.ModelSerializer):
+class CountrySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Country
         fields = ("id", "name")
 
 
-class CitySerializer(serializers.ModelSerializer):
+class CitySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = City
         fields = ("id", "name", "country")
@@ -33,7 +41,7 @@ class CityListDetailSerializer(CitySerializer):
     country = serializers.CharField(source="country.name", read_only=True)
 
 
-class AirportSerializer(serializers.ModelSerializer):
+class AirportSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Airport
         fields = ("id", "name", "closest_big_city")
@@ -53,7 +61,25 @@ class AirportListDetailSerializer(AirportSerializer):
     )
 
 
-class RouteSerializer(serializers.ModelSerializer):
+class BoardFlightSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    source = serializers.CharField()
+    destination = serializers.CharField()
+    airplane = serializers.CharField(allow_null=True)
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    available_seats = serializers.IntegerField(allow_null=True)
+
+
+class AirportBoardSerializer(SparseFieldsetsMixin, serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    departures = BoardFlightSerializer(many=True)
+    arrivals = BoardFlightSerializer(many=True)
+    updated_at = serializers.DateTimeField()
+
+
+class RouteSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     def validate(self, attrs: dict) -> dict:
         source = attrs.get("source") or self.instance.source
@@ -83,7 +109,7 @@ class RouteListSerializer(RouteSerializer):
     destination = serializers.SlugRelatedField(slug_field="name", read_only=True)
 
 
-class CrewSerializer(serializers.ModelSerializer):
+class CrewSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField(source="get_full_name")
 
     class Meta:
@@ -91,7 +117,34 @@ class CrewSerializer(serializers.ModelSerializer):
         fields = ("id", "first_name", "last_name", "full_name")
 
 
-class FlightShortListSerializer(serializers.Serializer):
+class CrewAssignmentSerializer(serializers.Serializer):
+    """Assignment of ``POST /crews/assignments/``"""
+
+    crew = serializers.IntegerField(min_value=1)
+    flight = serializers.IntegerField(min_value=1)
+
+
+class CrewConflictQuerySerializer(serializers.Serializer):
+    month = serializers.DateField(input_formats=["%Y-%m"])
+
+
+class CrewConflictSerializer(serializers.Serializer):
+    crew = serializers.IntegerField()
+    flight = serializers.IntegerField()
+    conflicting_flight = serializers.IntegerField()
+
+
+class CrewRosterSerializer(serializers.Serializer):
+    crew = serializers.IntegerField(source="crew_id")
+    flight = serializers.IntegerField(source="flight_id")
+    source = serializers.CharField()
+    destination = serializers.CharField()
+    airplane = serializers.CharField(allow_null=True)
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+
+
+class FlightShortListSerializer(SparseFieldsetsMixin, serializers.Serializer):
     flight = serializers.CharField(read_only=True, source="route")
 
     def create(self, validated_data: dict) -> None:
@@ -101,7 +154,7 @@ class FlightShortListSerializer(serializers.Serializer):
         pass
 
 
-class FlightSerializer(serializers.ModelSerializer):
+class FlightSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     def validate(self, data: dict) -> dict:
         departure_time = data.get("departure_time") or self.instance.departure_time
@@ -113,6 +166,38 @@ class FlightSerializer(serializers.ModelSerializer):
                     "non_field_errors": "Arrival_time should be greater than Departure_time"
                 }
             )
+
+        if "airplane" in data:
+            airplane_id = data["airplane"].pk if data["airplane"] else None
+        else:
+            airplane_id = self.instance.airplane_id if self.instance else None
+        if airplane_id is not None:
+            flight = Flight(
+                pk=self.instance.pk if self.instance else None,
+                airplane_id=airplane_id,
+                departure_time=departure_time,
+                arrival_time=arrival_time
+            )
+            # Leaves the flight itself out of the overlap query
+            flight._state.adding = self.instance is None
+            try:
+                # Only the airplane overlap constraint, the route isn't needed
+                flight.validate_constraints(exclude={"route"})
+            except DjangoValidationError as error:
+                raise ValidationError({"airplane": error.messages})
+
+        if "crews" in data:
+            crews = data["crews"]
+        else:
+            crews = self.instance.crews.all() if self.instance else []
+        crew_errors = flight_crew_errors(
+            self.instance.pk if self.instance else None,
+            [crew.pk for crew in crews],
+            departure_time,
+            arrival_time
+        )
+        if crew_errors:
+            raise ValidationError({"crews": crew_errors})
         return data
 
     class Meta:
@@ -156,13 +241,79 @@ class FlightListSerializer(FlightDetailSerializer):
         )
 
 
-class AirplaneTypeSerializer(serializers.ModelSerializer):
+class FlightCalendarQuerySerializer(serializers.Serializer):
+    source = serializers.CharField()
+    destination = serializers.CharField()
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, data: dict) -> dict:
+        days = (data["end"] - data["start"]).days
+        if not 0 <= days < settings.FLIGHT_CALENDAR_MAX_DAYS:
+            raise ValidationError(
+                {
+                    "end": f"End must be on or after start and at most "
+                           f"{settings.FLIGHT_CALENDAR_MAX_DAYS} days later."
+                }
+            )
+        return data
+
+
+class FlightCalendarDaySerializer(SparseFieldsetsMixin, serializers.Serializer):
+    date = serializers.DateField()
+    flights = serializers.IntegerField()
+    min_available_seats = serializers.IntegerField(allow_null=True)
+    total_available_seats = serializers.IntegerField()
+
+
+class FlightSearchRowSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    """Same representation as ``FlightListSerializer``, read from the
+    search table"""
+
+    id = serializers.IntegerField(source="flight_id")
+    route = serializers.SerializerMethodField()
+    crews = serializers.StringRelatedField(source="flight.crews", many=True)
+    airplane = serializers.CharField(source="airplane_name")
+    available_tickets = serializers.IntegerField(source="available_seats")
+
+    class Meta:
+        model = FlightSearchRow
+        fields = (
+            "id",
+            "route",
+            "crews",
+            "airplane",
+            "departure_time",
+            "arrival_time",
+            "available_tickets"
+        )
+
+    def get_route(self, row: FlightSearchRow) -> str:
+        return f"{row.route_id}. {row.source_name} - {row.destination_name}"
+
+
+class AirplaneTypeSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = AirplaneType
         fields = ("id", "name")
 
 
-class AirplaneSerializer(serializers.ModelSerializer):
+class AirplaneImageVariantsMixin(serializers.Serializer):
+    image_variants = serializers.SerializerMethodField()
+
+    def get_image_variants(self, airplane: Airplane) -> dict | None:
+        return image_variant_urls(
+            airplane.image,
+            airplane.image_variant_names,
+            self.context.get("request")
+        )
+
+
+class AirplaneSerializer(
+    SparseFieldsetsMixin,
+    AirplaneImageVariantsMixin,
+    serializers.ModelSerializer
+):
     class Meta:
         model = Airplane
         fields = (
@@ -171,36 +322,103 @@ class AirplaneSerializer(serializers.ModelSerializer):
             "rows",
             "seats_in_row",
             "image",
+            "image_variants",
             "capacity",
             "airplane_type"
         )
         read_only_fields = ("image",)
 
 
-class AirplaneImageSerializer(serializers.ModelSerializer):
+class AirplaneImageSerializer(
+    SparseFieldsetsMixin,
+    AirplaneImageVariantsMixin,
+    serializers.ModelSerializer
+):
     class Meta:
         model = Airplane
-        fields = ("id", "image")
+        fields = ("id", "image", "image_variants")
+
+
+class AssignableSeatUniqueTogetherValidator(UniqueTogetherValidator):
+    """Check the seat only when it was chosen by the client"""
+
+    def __call__(self, attrs: dict, serializer: serializers.Serializer) -> None:
+        seat_chosen = "row" in attrs or "seat" in attrs
+        if serializer.instance is None and not seat_chosen:
+            return
+        super().__call__(attrs, serializer)
 
 
-class TicketSerializer(serializers.ModelSerializer):
+class TicketSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     def validate(self, data: dict) -> dict:
+        seat, row = data.get("seat"), data.get("row")
+        flight = data.get("flight")
+        if self.instance is not None:
+            seat = self.instance.seat if seat is None else seat
+            row = self.instance.row if row is None else row
+            flight = flight or self.instance.flight
+        if flight is not None and flight.airplane is None:
+            raise ValidationError(
+                {"flight": f"Flight {flight.pk} has no airplane to seat tickets in."}
+            )
+        if self.instance is None and seat is None and row is None:
+            return data
+        if seat is None or row is None:
+            raise ValidationError(
+                {
+                    "non_field_errors": "Seat and row have to be given together "
+                                        "or left out for automatic assignment."
+                }
+            )
+
         Ticket.validate_seat_and_row(
-            data.get("seat"),
-            data.get("row"),
-            data.get("flight"),
+            seat,
+            row,
+            flight,
             ValidationError
         )
         return data
 
+    def create(self, validated_data: dict) -> Ticket:
+        order = validated_data.pop("order")
+        with transaction.atomic():
+            return get_purchase_strategy().create_tickets(
+                order,
+                [validated_data]
+            )[0]
+
+    def update(self, instance: Ticket, validated_data: dict) -> Ticket:
+        moved = any(
+            field in validated_data
+            and validated_data[field] != getattr(instance, field)
+            for field in ("flight", "row", "seat")
+        )
+        old_flight_id = instance.flight_id
+        with transaction.atomic():
+            ticket = super().update(instance, validated_data)
+            if moved:
+                reseat_ticket(ticket)
+                refresh_available_seats_on_commit([old_flight_id])
+            return ticket
+
     class Meta:
         model = Ticket
         fields = ("id", "seat", "row", "flight", "order")
         read_only_fields = ("order",)
+        extra_kwargs = {
+            "seat": {"required": False},
+            "row": {"required": False}
+        }
+        validators = [
+            AssignableSeatUniqueTogetherValidator(
+                queryset=Ticket.objects.all(),
+                fields=("row", "seat", "flight")
+            )
+        ]
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ("id", "created_at", "user", "tickets")
@@ -215,11 +433,71 @@ class OrderCreateSerializer(OrderSerializer):
             tickets_data = validated_data.pop("tickets", None)
             order = Order.objects.create(**validated_data)
             if tickets_data:
-                for ticket in tickets_data:
-                    Ticket.objects.create(order=order, **ticket)
+                get_purchase_strategy().create_tickets(order, tickets_data)
             return order
 
 
+class BulkTicketSerializer(serializers.Serializer):
+    """Ticket of a bulk order, flights are looked up for the whole batch"""
+
+    flight = serializers.IntegerField(min_value=1)
+    row = serializers.IntegerField(min_value=1, required=False)
+    seat = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, data: dict) -> dict:
+        if ("row" in data) != ("seat" in data):
+            raise ValidationError(
+                {
+                    "non_field_errors": "Seat and row have to be given together "
+                                        "or left out for automatic assignment."
+                }
+            )
+        return data
+
+
+class BulkOrderSerializer(serializers.Serializer):
+    tickets = BulkTicketSerializer(many=True, required=False)
+
+
+class TicketSeatSerializer(serializers.Serializer):
+    """Wanted seat of ``PUT /orders/{id}/tickets/``"""
+
+    flight = serializers.IntegerField(min_value=1)
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
 class OrderListDetailSerializer(OrderSerializer):
     user = serializers.StringRelatedField()
     tickets = serializers.StringRelatedField(many=True)
+
+
+class TicketFlightSerializer(serializers.ModelSerializer):
+    source = serializers.CharField(source="route.source.name")
+    destination = serializers.CharField(source="route.destination.name")
+    airplane = serializers.CharField(source="airplane.name", allow_null=True)
+
+    class Meta:
+        model = Flight
+        fields = (
+            "id",
+            "source",
+            "destination",
+            "departure_time",
+            "arrival_time",
+            "airplane"
+        )
+
+
+class TicketExpandedSerializer(serializers.ModelSerializer):
+    flight = TicketFlightSerializer(read_only=True)
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "flight")
+
+
+class OrderExpandedSerializer(OrderListDetailSerializer):
+    """Order with the flight of each ticket, for ``?expand=tickets``"""
+
+    tickets = TicketExpandedSerializer(many=True, read_only=True)
@@ -0,0 +1,7 @@
+from airport.images import process_airplane_image
+from jobs.registry import task
+
+
+@task("airport.process_airplane_image")
+def process_airplane_image_task(airplane_id: int) -> None:
+    process_airplane_image(airplane_id)
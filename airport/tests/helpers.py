@@ -6,6 +6,8 @@ from faker import Faker
 
 from airport.models import City, Country, Airport, Route, Airplane, AirplaneType, Flight
 
+fake = Faker()
+
 
 def detail_url(view_name: str, obj_id: id) -> str:
     return reverse(view_name, args=[obj_id])
@@ -41,7 +43,6 @@ def sample_airport(**params) -> Airport:
 
 
 def sample_route(**params) -> Route:
-    fake = Faker()
     source_airport = sample_airport(name=fake.unique.word())
     destination_airport = sample_airport(name=fake.unique.word())
 
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from airport.models import Flight, Order, Ticket
+from airport.pagination import estimated_count
+from airport.tests.helpers import sample_airplane, sample_flight, sample_route
+
+
+class AdminTest(TestCase):
+    def setUp(self) -> None:
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com",
+            password="password1234"
+        )
+        self.client.force_login(self.admin)
+        self.airplane = sample_airplane(rows=10, seats_in_row=10)
+        self.order = Order.objects.create(user=self.admin)
+
+    def add_tickets(self, count: int) -> None:
+        # Each flight of the airplane on its own day
+        first_day = Flight.objects.count() + 1
+        for seat in range(1, count + 1):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                flight=sample_flight(
+                    route=sample_route(),
+                    airplane=self.airplane,
+                    departure_time=datetime(2024, 1, first_day + seat, 6),
+                    arrival_time=datetime(2024, 1, first_day + seat, 8)
+                ),
+                order=self.order
+            )
+
+    def changelist_queries(self, model_name: str) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f"admin:airport_{model_name}_changelist"))
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self) -> None:
+        self.add_tickets(1)
+        queries = {
+            name: self.changelist_queries(name) for name in ("ticket", "flight")
+        }
+
+        self.add_tickets(5)
+
+        for name, count in queries.items():
+            self.assertEqual(self.changelist_queries(name), count, name)
+
+    def test_flight_form_does_not_list_routes(self) -> None:
+        self.add_tickets(3)
+        flight, other_flight = Flight.objects.all()[:2]
+
+        response = self.client.get(
+            reverse("admin:airport_flight_change", args=[flight.id])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'<option value="{flight.route_id}"')
+        self.assertNotContains(response, f'<option value="{other_flight.route_id}"')
+
+    def test_estimated_count(self) -> None:
+        self.add_tickets(3)
+
+        self.assertEqual(estimated_count(Ticket.objects.all()), (3, False))
+        with override_settings(ESTIMATED_COUNT_THRESHOLD=0):
+            self.assertTrue(estimated_count(Ticket.objects.all())[1])
@@ -1,15 +1,21 @@
 import os
 import tempfile
+from unittest import mock
 
 from PIL import Image
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from airport.images import variant_name
 from airport.models import Airplane, AirplaneType
 from airport.serializers import AirplaneSerializer
+from airport.uploads import HEADER_SNIFF_SIZE
+from jobs.queue import run_pending
 from airport.tests.helpers import detail_url, sample_airplane
 
 AIRPLANE_URL = reverse("airport:airplane-list")
@@ -255,3 +261,129 @@ class UploadImageTest(TestCase):
         self.airplane.refresh_from_db()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(os.path.exists(self.airplane.image.path))
+
+    def test_upload_image_creates_variants_without_metadata(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            img = Image.new("RGB", (2000, 1000))
+            exif = img.getexif()
+            exif[0x010E] = "Test description"
+            img.save(ntf, format="JPEG", exif=exif)
+            ntf.seek(0)
+            response = self.client.post(
+                self.upload_url, {"image": ntf}, format="multipart"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(run_pending(), 1)
+        self.airplane.refresh_from_db()
+
+        for variant, (max_width, max_height) in settings.AIRPLANE_IMAGE_VARIANTS.items():
+            with self.subTest(variant=variant):
+                name = variant_name(self.airplane.image.name, variant)
+                self.assertTrue(default_storage.exists(name))
+                with default_storage.open(name) as variant_file:
+                    with Image.open(variant_file) as variant_image:
+                        self.assertLessEqual(variant_image.width, max_width)
+                        self.assertLessEqual(variant_image.height, max_height)
+                        self.assertEqual(len(variant_image.getexif()), 0)
+
+    def test_upload_image_response_contains_variant_urls(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            img = Image.new("RGB", (10, 10))
+            img.save(ntf, format="JPEG")
+            ntf.seek(0)
+            response = self.client.post(
+                self.upload_url, {"image": ntf}, format="multipart"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data["image_variants"]),
+            set(settings.AIRPLANE_IMAGE_VARIANTS)
+        )
+
+    def test_variant_urls_are_recorded_without_probing_storage(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            img = Image.new("RGB", (10, 10))
+            img.save(ntf, format="JPEG")
+            ntf.seek(0)
+            self.client.post(self.upload_url, {"image": ntf}, format="multipart")
+        airplane_url = detail_url(AIRPLANE_DETAIL_VIEW_NAME, self.airplane.id)
+
+        with mock.patch.object(default_storage, "exists") as exists:
+            before = self.client.get(airplane_url).data["image_variants"]
+            exists.assert_not_called()
+        run_pending()
+        with mock.patch.object(default_storage, "exists") as exists:
+            after = self.client.get(airplane_url).data["image_variants"]
+            exists.assert_not_called()
+
+        self.airplane.refresh_from_db()
+        for variant in settings.AIRPLANE_IMAGE_VARIANTS:
+            with self.subTest(variant=variant):
+                name = variant_name(self.airplane.image.name, variant)
+                self.assertEqual(self.airplane.image_variant_names[variant], name)
+                self.assertTrue(before[variant].endswith(self.airplane.image.url))
+                self.assertTrue(after[variant].endswith(default_storage.url(name)))
+
+    def test_upload_is_not_streamed_under_media_root(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            img = Image.new("RGB", (10, 10))
+            img.save(ntf, format="JPEG")
+            ntf.seek(0)
+            with mock.patch(
+                "airport.uploads.tempfile.NamedTemporaryFile",
+                wraps=tempfile.NamedTemporaryFile
+            ) as named_temporary_file:
+                self.client.post(self.upload_url, {"image": ntf}, format="multipart")
+
+        temp_dir = os.path.realpath(named_temporary_file.call_args.kwargs["dir"])
+        media_root = os.path.realpath(settings.MEDIA_ROOT)
+        self.assertNotEqual(os.path.commonpath([temp_dir, media_root]), media_root)
+
+    @override_settings(AIRPLANE_IMAGE_MAX_UPLOAD_SIZE=1024)
+    def test_upload_image_larger_than_max_size_rejected(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".png") as ntf:
+            img = Image.effect_noise((200, 200), 100)
+            img.save(ntf, format="PNG")
+            ntf.seek(0)
+            response = self.client.post(
+                self.upload_url, {"image": ntf}, format="multipart"
+            )
+
+        self.airplane.refresh_from_db()
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+        self.assertFalse(self.airplane.image)
+
+    @override_settings(AIRPLANE_IMAGE_MAX_PIXELS=50)
+    def test_upload_image_with_too_many_pixels_rejected(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            img = Image.new("RGB", (10, 10))
+            img.save(ntf, format="JPEG")
+            ntf.seek(0)
+            response = self.client.post(
+                self.upload_url, {"image": ntf}, format="multipart"
+            )
+
+        self.airplane.refresh_from_db()
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+        self.assertFalse(self.airplane.image)
+
+    def test_upload_image_not_an_image_rejected(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            ntf.write(b"not an image" * HEADER_SNIFF_SIZE)
+            ntf.seek(0)
+            response = self.client.post(
+                self.upload_url, {"image": ntf}, format="multipart"
+            )
+
+        self.airplane.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", response.data)
+        self.assertFalse(self.airplane.image)
@@ -0,0 +1,102 @@
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+
+from airport.models import Flight
+from airport.serializers import FlightSerializer
+from airport.tests.helpers import sample_airplane, sample_flight
+
+
+def flight_at(airplane, day: int, start: int, end: int) -> Flight:
+    return sample_flight(
+        airplane=airplane,
+        departure_time=datetime(2024, 1, day, start),
+        arrival_time=datetime(2024, 1, day, end)
+    )
+
+
+class AirplaneOverlapConstraintTest(TestCase):
+    def setUp(self) -> None:
+        self.airplane = sample_airplane()
+        self.flight = flight_at(self.airplane, 1, 6, 8)
+
+    def test_overlapping_flight_is_rejected(self) -> None:
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            flight_at(self.airplane, 1, 7, 9)
+
+    def test_back_to_back_and_other_airplanes_are_allowed(self) -> None:
+        flight_at(self.airplane, 1, 8, 10)
+        flight_at(sample_airplane(name="Other"), 1, 6, 8)
+        flight_at(None, 1, 6, 8)
+        flight_at(None, 1, 6, 8)
+
+        self.assertEqual(Flight.objects.count(), 5)
+
+    def test_serializer_reports_airplane_overlap(self) -> None:
+        other_flight = flight_at(sample_airplane(name="Other"), 1, 7, 9)
+        other_flight.refresh_from_db()
+
+        serializer = FlightSerializer(
+            other_flight,
+            data={"airplane": self.airplane.id},
+            partial=True
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(
+            serializer.errors["airplane"],
+            ["The airplane is on another flight at that time."]
+        )
+
+    def test_serializer_accepts_moving_flight_of_its_airplane(self) -> None:
+        self.flight.refresh_from_db()
+
+        serializer = FlightSerializer(
+            self.flight,
+            data={"arrival_time": datetime(2024, 1, 1, 9)},
+            partial=True
+        )
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+
+class CheckAirplaneScheduleCommandTest(TestCase):
+    def setUp(self) -> None:
+        # Overlaps that predate the constraint
+        constraint = next(
+            constraint for constraint in Flight._meta.constraints
+            if constraint.name == "exclude_airplane_overlapping_flights"
+        )
+        with connection.schema_editor() as editor:
+            editor.remove_constraint(Flight, constraint)
+
+        self.airplane = sample_airplane()
+        self.long_flight = flight_at(self.airplane, 1, 6, 14)
+        self.inside = flight_at(self.airplane, 1, 8, 9)
+        self.after_inside = flight_at(self.airplane, 1, 10, 11)
+        flight_at(self.airplane, 1, 14, 16)
+        flight_at(sample_airplane(name="Other"), 1, 6, 14)
+
+    def test_overlaps_are_reported(self) -> None:
+        out = StringIO()
+
+        with self.assertRaisesMessage(CommandError, "Found 2 overlapping flights"):
+            with self.assertNumQueries(1):
+                call_command("check_airplane_schedule", stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn(f"flight {self.inside.id} departs", lines[0])
+        # Checked against the latest arrival, not only the previous flight
+        self.assertIn(f"flight {self.after_inside.id} departs", lines[1])
+        self.assertIn(f"before flight {self.long_flight.id} arrives", lines[1])
+
+    def test_no_overlaps(self) -> None:
+        out = StringIO()
+
+        call_command("check_airplane_schedule", since="2024-01-02", stdout=out)
+
+        self.assertIn("No overlapping flights", out.getvalue())
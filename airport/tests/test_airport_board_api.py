@@ -0,0 +1,126 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.boards import board_cache
+from airport.models import Order, Ticket
+from airport.tests.helpers import sample_airplane, sample_flight, sample_route
+
+
+def board_url(airport_id: int) -> str:
+    return reverse("airport:airport-board", args=[airport_id])
+
+
+class AirportBoardApiTest(TestCase):
+    def setUp(self) -> None:
+        board_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.route = sample_route()
+        self.airport = self.route.source
+        return_route = sample_route(
+            source=self.route.destination,
+            destination=self.airport
+        )
+        airplane = sample_airplane(rows=2, seats_in_row=2)
+        now = timezone.now()
+        self.departures = [
+            sample_flight(
+                route=self.route,
+                airplane=airplane,
+                departure_time=now + timedelta(hours=hours),
+                arrival_time=now + timedelta(hours=hours + 2)
+            )
+            for hours in (3, 1)
+        ]
+        sample_flight(
+            route=self.route,
+            airplane=airplane,
+            departure_time=now - timedelta(hours=3),
+            arrival_time=now - timedelta(hours=1)
+        )
+        self.arrival = sample_flight(
+            route=return_route,
+            airplane=airplane,
+            departure_time=now - timedelta(hours=1),
+            arrival_time=now + timedelta(hours=1)
+        )
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=self.departures[1],
+            order=Order.objects.create(user=self.user)
+        )
+
+    def test_board_lists_next_departures_and_arrivals(self) -> None:
+        response = self.client.get(board_url(self.airport.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], self.airport.name)
+        self.assertEqual(
+            [
+                (flight["id"], flight["available_seats"])
+                for flight in response.data["departures"]
+            ],
+            [(self.departures[1].id, 3), (self.departures[0].id, 4)]
+        )
+        self.assertEqual(
+            [flight["id"] for flight in response.data["arrivals"]],
+            [self.arrival.id]
+        )
+        self.assertEqual(
+            response.data["arrivals"][0]["source"],
+            self.route.destination.name
+        )
+
+    @override_settings(AIRPORT_BOARD_SIZE=1)
+    def test_board_size(self) -> None:
+        response = self.client.get(board_url(self.airport.id))
+
+        self.assertEqual(len(response.data["departures"]), 1)
+
+    def test_board_is_served_from_memory(self) -> None:
+        self.client.get(board_url(self.airport.id))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(board_url(self.airport.id))
+        self.assertEqual(len(response.data["departures"]), 2)
+
+    @override_settings(AIRPORT_BOARD_TTL=0)
+    def test_stale_board_is_refreshed_in_background(self) -> None:
+        self.client.get(board_url(self.airport.id))
+        self.departures[0].delete()
+
+        with mock.patch.object(board_cache, "refresh_in_background") as refresh:
+            with self.assertNumQueries(0):
+                response = self.client.get(board_url(self.airport.id))
+
+        refresh.assert_called_once_with(self.airport.id)
+        self.assertEqual(len(response.data["departures"]), 2)
+
+    @override_settings(AIRPORT_BOARD_TTL=0, AIRPORT_BOARD_MAX_STALE=0)
+    def test_expired_board_is_rebuilt(self) -> None:
+        self.client.get(board_url(self.airport.id))
+        self.departures[0].delete()
+
+        response = self.client.get(board_url(self.airport.id))
+
+        self.assertEqual(len(response.data["departures"]), 1)
+
+    def test_unknown_airport(self) -> None:
+        for airport_id in range(1000, 1005):
+            response = self.client.get(board_url(airport_id))
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertNotIn(airport_id, board_cache.building)
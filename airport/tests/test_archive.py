@@ -0,0 +1,159 @@
+import gzip
+import json
+import tempfile
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from airport.archive import archive_flights
+from airport.inventory import generate_seats
+from airport.models import Crew, Flight, FlightSearchRow, Order, Seat, Ticket
+from airport.tests.helpers import sample_airplane, sample_flight
+
+
+def read_archive(paths: list[Path], name: str) -> list[dict]:
+    rows = []
+    for path in sorted(paths):
+        if path.name.startswith(f"{name}-"):
+            with gzip.open(path, "rt", encoding="utf-8") as archive:
+                rows += [json.loads(line) for line in archive]
+    return rows
+
+
+@mock.patch("airport.archive.time.sleep")
+class ArchiveFlightsTest(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+        user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        crew = Crew.objects.create(first_name="John", last_name="Doe")
+        airplane = sample_airplane(rows=2, seats_in_row=2)
+        self.old_flights = [
+            sample_flight(
+                airplane=airplane,
+                departure_time=datetime(2023, 12, day, 6),
+                arrival_time=datetime(2023, 12, day, 8)
+            )
+            for day in (1, 2)
+        ]
+        self.new_flight = sample_flight(
+            airplane=airplane,
+            departure_time=datetime(2024, 1, 1, 6),
+            arrival_time=datetime(2024, 1, 1, 8)
+        )
+        for flight in self.old_flights + [self.new_flight]:
+            flight.crews.add(crew)
+
+        # All tickets on old flights
+        self.old_order = Order.objects.create(user=user)
+        Ticket.objects.create(row=1, seat=1, flight=self.old_flights[0], order=self.old_order)
+        Ticket.objects.create(row=1, seat=1, flight=self.old_flights[1], order=self.old_order)
+        # A ticket on an old flight and one on the new flight
+        self.mixed_order = Order.objects.create(user=user)
+        Ticket.objects.create(row=2, seat=2, flight=self.old_flights[0], order=self.mixed_order)
+        self.kept_ticket = Ticket.objects.create(
+            row=2, seat=2, flight=self.new_flight, order=self.mixed_order
+        )
+        generate_seats(self.old_flights[0])
+        generate_seats(self.new_flight)
+
+    def test_old_flights_are_archived_and_deleted(self, sleep) -> None:
+        total, paths = archive_flights(
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+            self.directory,
+            batch_size=1,
+            pause=2
+        )
+
+        self.assertEqual(total, (2, 3, 1))
+        self.assertEqual(sleep.call_count, 1)
+        self.assertGreaterEqual(sleep.call_args.args[0], 2)
+
+        # One file per model and batch, the first batch has no orders
+        self.assertEqual(len(paths), 5)
+        self.assertEqual(sorted(self.directory.iterdir()), sorted(paths))
+        flights = read_archive(paths, "flights")
+        self.assertEqual(
+            [flight["id"] for flight in flights],
+            [flight.id for flight in self.old_flights]
+        )
+        self.assertEqual(flights[0]["departure_time"], "2023-12-01T06:00:00Z")
+        self.assertEqual(len(flights[0]["crews"]), 1)
+        self.assertEqual(len(read_archive(paths, "tickets")), 3)
+        self.assertEqual(
+            [order["id"] for order in read_archive(paths, "orders")],
+            [self.old_order.id]
+        )
+
+        self.assertEqual(list(Flight.objects.all()), [self.new_flight])
+        self.assertEqual(list(Ticket.objects.all()), [self.kept_ticket])
+        self.assertEqual(list(Order.objects.all()), [self.mixed_order])
+        self.assertFalse(Seat.objects.exclude(flight=self.new_flight).exists())
+        self.assertEqual(Seat.objects.filter(ticket=self.kept_ticket).count(), 1)
+        self.assertEqual(
+            list(FlightSearchRow.objects.values_list("flight_id", flat=True)),
+            [self.new_flight.id]
+        )
+        self.assertEqual(Flight.crews.through.objects.count(), 1)
+
+    def test_max_batches(self, sleep) -> None:
+        total, _ = archive_flights(
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+            self.directory,
+            batch_size=1,
+            max_batches=1
+        )
+
+        self.assertEqual(total, (1, 2, 0))
+        self.assertEqual(Flight.objects.count(), 2)
+        self.assertEqual(Order.objects.count(), 2)
+        sleep.assert_not_called()
+
+    def test_failed_batch_keeps_its_rows_and_a_complete_file(self, sleep) -> None:
+        with mock.patch("airport.archive.raw_delete", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archive_flights(
+                    datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    self.directory,
+                    batch_size=1
+                )
+
+        self.assertEqual(Flight.objects.count(), 3)
+        self.assertEqual(Ticket.objects.count(), 4)
+        paths = list(self.directory.iterdir())
+        self.assertEqual(
+            [flight["id"] for flight in read_archive(paths, "flights")],
+            [self.old_flights[0].id]
+        )
+        self.assertEqual(len(read_archive(paths, "tickets")), 2)
+
+    def test_command(self, sleep) -> None:
+        out = StringIO()
+
+        call_command(
+            "archive_flights",
+            "--before=2024-01-01",
+            f"--output={self.directory}",
+            "--batch-size=10",
+            stdout=out
+        )
+
+        self.assertIn("Archived 2 flights, 3 tickets and 1 orders to 3 files", out.getvalue())
+        self.assertEqual(len(list(self.directory.glob("*.jsonl.gz"))), 3)
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_command_needs_a_date(self, sleep) -> None:
+        with self.assertRaisesMessage(CommandError, "is not a YYYY-MM-DD date"):
+            call_command("archive_flights", "--before=yesterday", stdout=StringIO())
+
+        self.assertEqual(Flight.objects.count(), 3)
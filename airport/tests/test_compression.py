@@ -0,0 +1,78 @@
+import asyncio
+import gzip
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from airport.compression import CompressionMiddleware
+
+BODY = json.dumps([{"id": number, "route": "Kyiv - Lviv"} for number in range(200)]).encode()
+
+
+def json_response(body: bytes = BODY, **headers) -> HttpResponse:
+    return HttpResponse(body, content_type="application/json", headers=headers)
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100, COMPRESSION_CACHE_TIMEOUT=60)
+class CompressionMiddlewareTest(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+    def process(self, response, request=None):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(request or self.request)
+
+    def test_json_is_gzipped(self) -> None:
+        response = self.process(json_response(ETag='"v1"'))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["ETag"], 'W/"v1"')
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    def test_skipped_responses(self) -> None:
+        for response, request in (
+            (json_response(b"{}"), None),
+            (HttpResponse(BODY, content_type="image/webp"), None),
+            (json_response(**{"Content-Encoding": "br"}), None),
+            (json_response(), RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip;q=0")),
+        ):
+            with self.subTest(content_type=response["Content-Type"]):
+                self.assertEqual(self.process(response, request).content, response.content)
+                self.assertNotEqual(response.get("Content-Encoding"), "gzip")
+
+    def test_identical_bodies_are_compressed_once(self) -> None:
+        self.process(json_response())
+
+        with mock.patch("airport.compression.gzip_compress") as compress:
+            response = self.process(json_response())
+
+        compress.assert_not_called()
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    def test_streaming_response_is_compressed_per_chunk(self) -> None:
+        chunks = [BODY[:500], BODY[500:]]
+        response = self.process(StreamingHttpResponse(iter(chunks), content_type="text/csv"))
+
+        compressed = list(response.streaming_content)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(len(compressed), 3)
+        self.assertEqual(gzip.decompress(b"".join(compressed)), BODY)
+
+    def test_async_streaming_response(self) -> None:
+        async def chunks():
+            yield BODY[:500]
+            yield BODY[500:]
+
+        async def consume(response) -> bytes:
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        response = self.process(StreamingHttpResponse(chunks(), content_type="text/csv"))
+
+        self.assertEqual(gzip.decompress(asyncio.run(consume(response))), BODY)
@@ -0,0 +1,124 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Crew, Flight
+from airport.tests.helpers import sample_airplane, sample_flight
+
+BULK_ROSTER_URL = reverse("airport:crew-bulk-roster")
+
+
+def roster_url(crew_id: int) -> str:
+    return reverse("airport:crew-roster", args=[crew_id])
+
+
+class CrewRosterApiTest(TestCase):
+    def setUp(self) -> None:
+        admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=admin)
+
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+        self.other_crew = Crew.objects.create(first_name="Jane", last_name="Doe")
+        airplane = sample_airplane()
+        self.flights = [
+            sample_flight(
+                airplane=airplane if day % 2 else None,
+                departure_time=datetime(2024, 1, day, 6),
+                arrival_time=datetime(2024, 1, day, 8)
+            )
+            for day in range(1, 11)
+        ]
+        Flight.crews.through.objects.bulk_create(
+            [Flight.crews.through(crew=self.crew, flight=flight) for flight in self.flights]
+            + [Flight.crews.through(crew=self.other_crew, flight=self.flights[4])]
+        )
+
+    def follow(self, url: str, params: dict = None) -> list[dict]:
+        rows = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            rows += response.data["results"]
+            if not response.data["next"]:
+                return rows
+            response = self.client.get(response.data["next"])
+
+    def test_roster_rows(self) -> None:
+        with self.assertNumQueries(2):
+            response = self.client.get(roster_url(self.crew.id), {"page_size": 1})
+
+        flight = self.flights[0]
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "crew": self.crew.id,
+                    "flight": flight.id,
+                    "source": flight.route.source.name,
+                    "destination": flight.route.destination.name,
+                    "airplane": "Test Airplane Name",
+                    "departure_time": "2024-01-01T06:00:00Z",
+                    "arrival_time": "2024-01-01T08:00:00Z",
+                }
+            ]
+        )
+        self.assertNotIn("count", response.data)
+
+    def test_roster_pages_follow_departure_time(self) -> None:
+        rows = self.follow(roster_url(self.crew.id), {"page_size": 3})
+
+        self.assertEqual([row["flight"] for row in rows], [flight.id for flight in self.flights])
+        self.assertIsNone(rows[1]["airplane"])
+
+    def test_roster_date_window(self) -> None:
+        rows = self.follow(
+            roster_url(self.crew.id),
+            {"start_departure_date": "2024-01-03", "end_departure_date": "2024-01-05"}
+        )
+
+        self.assertEqual(
+            [row["flight"] for row in rows],
+            [flight.id for flight in self.flights[2:5]]
+        )
+
+    def test_roster_ignores_crews_filter(self) -> None:
+        rows = self.follow(roster_url(self.crew.id), {"crews": self.other_crew.id})
+
+        self.assertEqual(len(rows), len(self.flights))
+        self.assertEqual({row["crew"] for row in rows}, {self.crew.id})
+
+    def test_unknown_crew(self) -> None:
+        response = self.client.get(roster_url(999))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_roster(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                BULK_ROSTER_URL,
+                {
+                    "crews": f"{self.crew.id},{self.other_crew.id}",
+                    "start_departure_date": "2024-01-05",
+                    "end_departure_date": "2024-01-05",
+                }
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["crew"], row["flight"]) for row in response.data["results"]],
+            [(self.crew.id, self.flights[4].id), (self.other_crew.id, self.flights[4].id)]
+        )
+
+    def test_bulk_roster_needs_crews(self) -> None:
+        response = self.client.get(BULK_ROSTER_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("crews", response.data)
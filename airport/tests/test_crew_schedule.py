@@ -0,0 +1,196 @@
+import json
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.forms import modelform_factory
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.admin import FlightAdminForm
+from airport.crew_schedule import roster_conflicts
+from airport.models import Crew, Flight
+from airport.serializers import FlightSerializer
+from airport.tests.helpers import sample_flight
+
+ASSIGNMENTS_URL = reverse("airport:crew-assignments")
+CONFLICTS_URL = reverse("airport:crew-conflicts")
+
+
+def flight_at(day: int, start: int, end: int) -> Flight:
+    return sample_flight(
+        departure_time=datetime(2024, 1, day, start),
+        arrival_time=datetime(2024, 1, day, end)
+    )
+
+
+class CrewScheduleApiTest(TestCase):
+    def setUp(self) -> None:
+        admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=admin)
+
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+        self.other_crew = Crew.objects.create(first_name="Jane", last_name="Doe")
+        self.morning = flight_at(1, 6, 8)
+        self.morning.crews.add(self.crew)
+
+    def assign(self, pairs: list[tuple]):
+        return self.client.post(
+            ASSIGNMENTS_URL,
+            data=json.dumps(
+                [{"crew": crew.id, "flight": flight.id} for crew, flight in pairs]
+            ),
+            content_type="application/json"
+        )
+
+    def test_assignments_are_added(self) -> None:
+        back_to_back = flight_at(1, 8, 10)
+        evenings = [flight_at(day, 18, 20) for day in range(2, 12)]
+
+        with self.assertNumQueries(7):
+            response = self.assign(
+                [(self.crew, back_to_back), (self.other_crew, self.morning)]
+                + [(self.crew, flight) for flight in evenings]
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.crew.flights.count(), 12)
+        self.assertEqual(list(self.other_crew.flights.all()), [self.morning])
+
+    def test_existing_assignments_are_kept(self) -> None:
+        response = self.assign([(self.crew, self.morning)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(list(self.crew.flights.all()), [self.morning])
+
+    def test_overlap_with_assigned_flight(self) -> None:
+        overlapping = flight_at(1, 7, 9)
+        free = flight_at(2, 7, 9)
+
+        response = self.assign([(self.crew, free), (self.crew, overlapping)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(
+            response.data[1]["non_field_errors"],
+            [f"Crew member {self.crew.id} is on the overlapping flight {self.morning.id}."]
+        )
+        self.assertEqual(list(self.crew.flights.all()), [self.morning])
+
+    def test_overlap_between_new_assignments(self) -> None:
+        first, second = flight_at(3, 6, 9), flight_at(3, 8, 10)
+
+        response = self.assign([(self.other_crew, first), (self.other_crew, second)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(second.id), response.data[0]["non_field_errors"][0])
+        self.assertIn(str(first.id), response.data[1]["non_field_errors"][0])
+        self.assertFalse(self.other_crew.flights.exists())
+
+    def test_unknown_crew_and_flight(self) -> None:
+        response = self.client.post(
+            ASSIGNMENTS_URL,
+            data=json.dumps([{"crew": 999, "flight": 999}]),
+            content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("crew", response.data[0])
+        self.assertIn("flight", response.data[0])
+
+    def test_month_conflicts(self) -> None:
+        overlapping = flight_at(1, 7, 9)
+        overlapping.crews.add(self.crew)
+        next_month = sample_flight(
+            departure_time=datetime(2024, 2, 1, 6),
+            arrival_time=datetime(2024, 2, 1, 8)
+        )
+        Flight.crews.through.objects.bulk_create(
+            [
+                Flight.crews.through(crew=self.crew, flight=next_month),
+                Flight.crews.through(
+                    crew=self.crew,
+                    flight=sample_flight(
+                        departure_time=datetime(2024, 2, 1, 7),
+                        arrival_time=datetime(2024, 2, 1, 9)
+                    )
+                ),
+            ]
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(CONFLICTS_URL, {"month": "2024-01"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "crew": self.crew.id,
+                    "flight": self.morning.id,
+                    "conflicting_flight": overlapping.id
+                }
+            ]
+        )
+        self.assertEqual(
+            len(roster_conflicts(datetime(2024, 1, 1), datetime(2024, 3, 1))), 2
+        )
+
+    def test_month_is_required(self) -> None:
+        response = self.client.get(CONFLICTS_URL, {"month": "January"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FlightCrewOverlapValidationTest(TestCase):
+    def setUp(self) -> None:
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+        self.morning = flight_at(1, 6, 8)
+        self.morning.crews.add(self.crew)
+        self.evening = flight_at(1, 18, 20)
+        self.evening.crews.add(self.crew)
+        self.evening.refresh_from_db()
+
+    def test_serializer_rejects_moving_flight_over_crew_flight(self) -> None:
+        serializer = FlightSerializer(
+            self.evening,
+            data={"departure_time": datetime(2024, 1, 1, 7)},
+            partial=True
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("crews", serializer.errors)
+
+    def test_serializer_accepts_own_times(self) -> None:
+        serializer = FlightSerializer(
+            self.evening,
+            data={"departure_time": datetime(2024, 1, 1, 17)},
+            partial=True
+        )
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_admin_form_rejects_overlapping_crew(self) -> None:
+        flight = flight_at(1, 7, 9)
+        form_class = modelform_factory(
+            Flight,
+            form=FlightAdminForm,
+            fields=("route", "crews", "departure_time", "arrival_time")
+        )
+        form = form_class(
+            data={
+                "route": flight.route_id,
+                "crews": [self.crew.id],
+                "departure_time": "2024-01-01 07:00",
+                "arrival_time": "2024-01-01 09:00",
+            },
+            instance=flight
+        )
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("crews", form.errors)
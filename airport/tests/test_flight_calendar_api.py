@@ -0,0 +1,108 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.tests.helpers import sample_airplane, sample_flight, sample_route
+
+FLIGHT_CALENDAR_URL = reverse("airport:flight-calendar")
+
+
+class FlightCalendarApiTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.route = sample_route()
+        small = sample_airplane(name="Small", rows=2, seats_in_row=2)
+        large = sample_airplane(name="Large", rows=10, seats_in_row=2)
+        flight = sample_flight(
+            route=self.route,
+            airplane=small,
+            departure_time=datetime(2024, 1, 30, 6),
+            arrival_time=datetime(2024, 1, 30, 8)
+        )
+        sample_flight(
+            route=self.route,
+            airplane=large,
+            departure_time=datetime(2024, 1, 30, 18),
+            arrival_time=datetime(2024, 1, 30, 20)
+        )
+        sample_flight(
+            route=self.route,
+            airplane=large,
+            departure_time=datetime(2024, 2, 1, 6),
+            arrival_time=datetime(2024, 2, 1, 8)
+        )
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=flight,
+            order=Order.objects.create(user=self.user)
+        )
+
+    def get_calendar(self, **params):
+        query = {
+            "source": self.route.source.name,
+            "destination": self.route.destination.name,
+            "start": "2024-01-30",
+            "end": "2024-02-02",
+        }
+        query.update(params)
+        return self.client.get(FLIGHT_CALENDAR_URL, query)
+
+    def test_calendar_aggregates_flights_per_day(self) -> None:
+        response = self.get_calendar()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                (
+                    day["date"],
+                    day["flights"],
+                    day["min_available_seats"],
+                    day["total_available_seats"]
+                )
+                for day in response.data
+            ],
+            [
+                ("2024-01-30", 2, 3, 23),
+                ("2024-01-31", 0, None, 0),
+                ("2024-02-01", 1, 20, 20),
+                ("2024-02-02", 0, None, 0),
+            ]
+        )
+
+    def test_calendar_months_are_cached(self) -> None:
+        self.get_calendar()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_calendar()
+
+        self.assertEqual(response.data[0]["flights"], 2)
+        self.assertFalse(
+            any("GROUP BY" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_calendar_unknown_route(self) -> None:
+        response = self.get_calendar(destination="Unknown")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sum(day["flights"] for day in response.data), 0)
+
+    def test_calendar_invalid_range(self) -> None:
+        response = self.get_calendar(start="2024-02-02", end="2024-01-30")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
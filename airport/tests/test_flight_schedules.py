@@ -0,0 +1,108 @@
+from datetime import date, datetime, time, timedelta, timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as django_timezone
+
+from airport.models import Crew, Flight, FlightSchedule, FlightSearchRow
+from airport.schedules import extend_schedule
+from airport.tests.helpers import sample_airplane, sample_flight, sample_route
+
+
+def utc(day: date, hour: int) -> datetime:
+    return datetime.combine(day, time(hour), tzinfo=timezone.utc)
+
+
+class FlightScheduleTest(TestCase):
+    def setUp(self) -> None:
+        self.route = sample_route()
+        self.airplane = sample_airplane()
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+        # Monday to Saturday at 06:00 for the first two weeks of 2024
+        self.schedule = FlightSchedule.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=time(6),
+            duration=timedelta(hours=2),
+            weekdays=[1, 2, 3, 4, 5, 6],
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 14)
+        )
+        self.schedule.crews.add(self.crew)
+
+    def test_flights_are_created_in_bulk(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            extension = extend_schedule(self.schedule, date(2024, 12, 31), batch_size=5)
+
+        inserts = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith(('INSERT INTO "airport_flight" ', 'INSERT INTO "airport_flight_crews"'))
+        ]
+        self.assertEqual(len(inserts), 6)
+
+        self.assertEqual(extension.created, 12)
+        flights = Flight.objects.filter(route=self.route).order_by("departure_time")
+        self.assertEqual(
+            [flight.departure_time for flight in flights[:2]],
+            [utc(date(2024, 1, 1), 6), utc(date(2024, 1, 2), 6)]
+        )
+        self.assertNotIn(
+            date(2024, 1, 7),
+            [flight.departure_time.date() for flight in flights]
+        )
+        self.assertEqual(flights[0].arrival_time, utc(date(2024, 1, 1), 8))
+        self.assertEqual(self.crew.flights.count(), 12)
+        self.assertEqual(FlightSearchRow.objects.filter(route=self.route).count(), 12)
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.generated_until, date(2024, 1, 14))
+
+    def test_horizon_is_extended_incrementally(self) -> None:
+        self.assertEqual(extend_schedule(self.schedule, date(2024, 1, 7)).created, 6)
+        self.assertEqual(extend_schedule(self.schedule, date(2024, 1, 7)).created, 0)
+        self.assertEqual(extend_schedule(self.schedule, date(2024, 1, 10)).created, 3)
+
+        self.assertEqual(Flight.objects.filter(route=self.route).count(), 9)
+
+    def test_existing_and_overlapping_flights_are_left_out(self) -> None:
+        existing = sample_flight(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=utc(date(2024, 1, 1), 6),
+            arrival_time=utc(date(2024, 1, 1), 8)
+        )
+        # The airplane is on another route on Jan 2nd
+        sample_flight(
+            airplane=self.airplane,
+            departure_time=utc(date(2024, 1, 2), 5),
+            arrival_time=utc(date(2024, 1, 2), 7)
+        )
+        # The crew member is on another flight on Jan 3rd
+        sample_flight(
+            departure_time=utc(date(2024, 1, 3), 7),
+            arrival_time=utc(date(2024, 1, 3), 9)
+        ).crews.add(self.crew)
+
+        extension = extend_schedule(self.schedule, date(2024, 1, 3))
+
+        self.assertEqual(extension, (1, 1, 1))
+        self.assertEqual(Flight.objects.filter(route=self.route).count(), 2)
+        self.assertIn(self.crew, existing.crews.all())
+        self.assertEqual(self.crew.flights.count(), 2)
+
+    def test_command_extends_up_to_horizon(self) -> None:
+        today = django_timezone.localdate()
+        self.schedule.weekdays = []
+        self.schedule.start_date = today
+        self.schedule.end_date = today + timedelta(days=365)
+        self.schedule.save()
+        out = StringIO()
+
+        call_command("extend_flight_schedules", days=9, stdout=out)
+        call_command("extend_flight_schedules", days=9, stdout=out)
+
+        self.assertIn("Created 10 flights", out.getvalue())
+        self.assertIn("Created 0 flights", out.getvalue())
+        self.assertEqual(Flight.objects.filter(route=self.route).count(), 10)
@@ -0,0 +1,115 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Airplane, City, FlightSearchRow, Order, Ticket
+from airport.tests.helpers import (
+    sample_airplane,
+    sample_airport,
+    sample_city,
+    sample_flight,
+    sample_route
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+class FlightSearchRowTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.city = sample_city(name="Lviv")
+        self.route = sample_route(
+            source=sample_airport(name="LWO", closest_big_city=self.city),
+            destination=sample_airport(name="KBP", closest_big_city=None)
+        )
+        self.airplane = sample_airplane(rows=2, seats_in_row=3)
+        self.flight = sample_flight(route=self.route, airplane=self.airplane)
+
+    def search_row(self) -> FlightSearchRow:
+        return FlightSearchRow.objects.get(flight=self.flight)
+
+    def test_flight_write_builds_row(self) -> None:
+        row = self.search_row()
+
+        self.assertEqual(
+            (row.source_name, row.source_city, row.source_country),
+            ("LWO", "Lviv", self.city.country.name)
+        )
+        self.assertEqual((row.destination_name, row.destination_city), ("KBP", None))
+        self.assertEqual((row.capacity, row.available_seats), (6, 6))
+
+    def test_purchase_refreshes_available_seats_after_commit(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                ORDER_URL,
+                data=json.dumps({"tickets": [{"flight": self.flight.id}] * 2}),
+                content_type="application/json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.search_row().available_seats, 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.get(pk=response.data["id"]).delete()
+        self.assertEqual(self.search_row().available_seats, 6)
+
+    def test_related_writes_update_row(self) -> None:
+        self.route.source.name = "LWX"
+        self.route.source.save()
+        self.airplane.name = "Renamed"
+        self.airplane.save()
+        self.city.delete()
+
+        row = self.search_row()
+        self.assertEqual(
+            (row.source_name, row.source_city, row.airplane_name),
+            ("LWX", None, "Renamed")
+        )
+
+        Airplane.objects.all().delete()
+        self.assertEqual(
+            (self.search_row().capacity, self.search_row().airplane_name),
+            (None, None)
+        )
+
+    def test_flight_list_filters_by_city_on_one_table(self) -> None:
+        sample_flight(route=sample_route())
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(FLIGHT_URL, {"source_city": "Lviv"})
+
+        self.assertEqual(
+            [flight["id"] for flight in response.data["results"]],
+            [self.flight.id]
+        )
+        search_queries = [
+            query["sql"] for query in queries.captured_queries
+            if "airport_flightsearchrow" in query["sql"]
+        ]
+        self.assertTrue(search_queries)
+        self.assertFalse(any("JOIN" in sql for sql in search_queries))
+
+    def test_rebuild_command(self) -> None:
+        Ticket.objects.bulk_create(
+            [Ticket(row=1, seat=1, flight=self.flight, order=Order.objects.create(user=self.user))]
+        )
+        City.objects.filter(pk=self.city.pk).update(name="Lemberg")
+
+        call_command("rebuild_flight_search", stdout=StringIO())
+
+        row = self.search_row()
+        self.assertEqual((row.source_city, row.available_seats), ("Lemberg", 5))
@@ -0,0 +1,116 @@
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipIf
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from airport.models import Flight
+from airport.parsers import FastJSONParser
+from airport.renderers import FastJSONRenderer, orjson
+
+PAYLOAD = {
+    "utc": datetime(2024, 5, 1, 10, 30, 15, 123456, tzinfo=dt_timezone.utc),
+    "kyiv": datetime(2024, 5, 1, 10, 30, tzinfo=dt_timezone(timedelta(hours=3))),
+    "naive": datetime(2024, 5, 1, 10, 30),
+    "date": date(2024, 5, 1),
+    "time": time(10, 30, 0, 500),
+    "duration": timedelta(hours=1, seconds=1),
+    "price": Decimal("12.50"),
+    "lazy": gettext_lazy("Not found."),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "separators": "line\u2028paragraph\u2029",
+    "unicode": "Київ",
+    "nested": [{"flights": (1, 2)}, None, True, 1.5],
+    1: "integer key",
+}
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    def test_output_matches_json_renderer(self) -> None:
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD),
+            JSONRenderer().render(PAYLOAD)
+        )
+
+    def test_fallbacks_match_json_renderer(self) -> None:
+        payload = {"big": 2 ** 70, **PAYLOAD}
+        for media_type in (None, "application/json; indent=4"):
+            self.assertEqual(
+                FastJSONRenderer().render(payload, media_type),
+                JSONRenderer().render(payload, media_type)
+            )
+
+    def test_stdlib_is_used_without_orjson(self) -> None:
+        with mock.patch("airport.renderers.orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(PAYLOAD),
+                JSONRenderer().render(PAYLOAD)
+            )
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_float_exponents_are_written_without_padding(self) -> None:
+        payload = {"small": 1e-7, "big": 1e16, "plain": 0.1}
+
+        rendered = FastJSONRenderer().render(payload)
+
+        self.assertEqual(rendered, b'{"small":1e-7,"big":1e16,"plain":0.1}')
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(payload)))
+
+    def test_errors_of_encoder_are_kept(self) -> None:
+        with self.assertRaisesMessage(ValueError, "timezone-aware times"):
+            FastJSONRenderer().render({"time": time(10, tzinfo=dt_timezone.utc)})
+
+
+class FastJSONParserTest(SimpleTestCase):
+    def parse(self, parser: JSONParser, body: bytes, **context):
+        return parser.parse(io.BytesIO(body), parser_context=context)
+
+    def test_result_matches_json_parser(self) -> None:
+        for body in (
+            b'{"tickets": [{"flight": 1, "row": 2}], "price": 1.5, "a": null}',
+            b'{"big": 123456789012345678901234567890}',
+            b'{"below_int64": -9223372036854775809}',
+            b'{"above_uint64": 18446744073709551616}',
+            '{"city": "Київ"}'.encode(),
+            b'"\\ud800"',
+        ):
+            self.assertEqual(
+                self.parse(FastJSONParser(), body),
+                self.parse(JSONParser(), body)
+            )
+
+    def test_other_encodings(self) -> None:
+        body = '{"city": "Київ"}'.encode("utf-16")
+
+        self.assertEqual(
+            self.parse(FastJSONParser(), body, encoding="utf-16"),
+            {"city": "Київ"}
+        )
+
+    def test_errors_match_json_parser(self) -> None:
+        for body in (b'{"flight": NaN}', b'{"flight": '):
+            with self.assertRaises(ParseError) as expected:
+                self.parse(JSONParser(), body)
+            with self.assertRaises(ParseError) as raised:
+                self.parse(FastJSONParser(), body)
+            self.assertEqual(str(raised.exception), str(expected.exception))
+
+
+class BenchJsonRenderTest(TestCase):
+    def test_command_runs(self) -> None:
+        out = StringIO()
+
+        call_command("bench_json_render", flights=5, repeat=1, stdout=out)
+
+        self.assertIn("5 flights", out.getvalue())
+        self.assertIn("FastJSONParser", out.getvalue())
+        self.assertFalse(Flight.objects.exists())
@@ -0,0 +1,133 @@
+import tempfile
+import uuid
+from pathlib import Path
+
+from django.http import Http404
+from django.test import TestCase, RequestFactory, override_settings
+
+from airport.images import variant_name
+from airport.media import serve_media
+
+
+class ServeMediaTest(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        override = override_settings(
+            MEDIA_ROOT=self.media_root.name,
+            MEDIA_SERVE_MODE="python"
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.path = f"upload/airplane/test-{uuid.uuid4()}.jpg"
+        self.content = bytes(range(256)) * 4
+        self.write(self.path, self.content)
+        self.factory = RequestFactory()
+
+    def write(self, path: str, content: bytes) -> None:
+        full_path = Path(self.media_root.name, path)
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(content)
+
+    def test_serve_media_with_immutable_cache_headers(self) -> None:
+        response = serve_media(self.factory.get("/"), self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response.headers["Content-Type"], "image/jpeg")
+        self.assertEqual(response.headers["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", response.headers["Cache-Control"])
+
+    def test_serve_media_without_uuid_is_not_immutable(self) -> None:
+        self.write("upload/plain.jpg", self.content)
+
+        response = serve_media(self.factory.get("/"), "upload/plain.jpg")
+
+        self.assertNotIn("immutable", response.headers["Cache-Control"])
+
+    def test_serve_media_range(self) -> None:
+        request = self.factory.get("/", HTTP_RANGE="bytes=10-19")
+
+        response = serve_media(request, self.path)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+        self.assertEqual(
+            response.headers["Content-Range"],
+            f"bytes 10-19/{len(self.content)}"
+        )
+
+    def test_serve_media_suffix_range(self) -> None:
+        request = self.factory.get("/", HTTP_RANGE="bytes=-5")
+
+        response = serve_media(request, self.path)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.content[-5:])
+
+    def test_serve_media_unsatisfiable_range(self) -> None:
+        request = self.factory.get("/", HTTP_RANGE="bytes=5000-")
+
+        response = serve_media(request, self.path)
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(
+            response.headers["Content-Range"],
+            f"bytes */{len(self.content)}"
+        )
+
+    def test_serve_media_precompressed(self) -> None:
+        self.write(self.path + ".gz", b"compressed")
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING="gzip, br;q=0")
+
+        response = serve_media(request, self.path)
+
+        self.assertEqual(b"".join(response.streaming_content), b"compressed")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Content-Type"], "image/jpeg")
+
+    def test_serve_media_variant(self) -> None:
+        self.write(variant_name(self.path, "thumbnail"), b"thumbnail")
+
+        response = serve_media(
+            self.factory.get("/", {"variant": "thumbnail"}),
+            self.path
+        )
+
+        self.assertEqual(b"".join(response.streaming_content), b"thumbnail")
+        self.assertIn("immutable", response.headers["Cache-Control"])
+
+    def test_serve_media_missing_variant_falls_back_to_original(self) -> None:
+        response = serve_media(
+            self.factory.get("/", {"variant": "thumbnail"}),
+            self.path
+        )
+
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertNotIn("immutable", response.headers["Cache-Control"])
+
+    @override_settings(MEDIA_SERVE_MODE="x-accel-redirect")
+    def test_serve_media_x_accel_redirect(self) -> None:
+        response = serve_media(self.factory.get("/"), self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response.headers["X-Accel-Redirect"],
+            f"/protected-media/{self.path}"
+        )
+        self.assertIn("immutable", response.headers["Cache-Control"])
+
+    @override_settings(MEDIA_SERVE_MODE="x-sendfile")
+    def test_serve_media_x_sendfile(self) -> None:
+        response = serve_media(self.factory.get("/"), self.path)
+
+        self.assertEqual(
+            response.headers["X-Sendfile"],
+            str(Path(self.media_root.name, self.path).resolve())
+        )
+
+    def test_serve_media_missing_file(self) -> None:
+        with self.assertRaises(Http404):
+            serve_media(self.factory.get("/"), "upload/missing.jpg")
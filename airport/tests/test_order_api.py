@@ -1,12 +1,16 @@
 import json
+from datetime import datetime, timedelta
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from airport.models import Order, Ticket
+from airport.models import Order, Ticket, IdempotencyKey
 from airport.serializers import OrderListDetailSerializer, TicketSerializer
 from airport.tests.helpers import detail_url, sample_flight, sample_airplane
 
@@ -115,6 +119,59 @@ class AuthenticatedOrderApiTest(TestCase):
         serializer = OrderListDetailSerializer(self.order)
         self.assertEqual(response.data, serializer.data)
 
+    def test_order_detail_expanded_tickets(self) -> None:
+        flight = sample_flight(airplane=sample_airplane(rows=10, seats_in_row=10))
+        ticket = Ticket.objects.create(row=1, seat=2, flight=flight, order=self.order)
+        flight.refresh_from_db()
+
+        response = self.client.get(self.detail_url, {"expand": "tickets"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["tickets"],
+            [
+                {
+                    "id": ticket.id,
+                    "row": 1,
+                    "seat": 2,
+                    "flight": {
+                        "id": flight.id,
+                        "source": flight.route.source.name,
+                        "destination": flight.route.destination.name,
+                        "departure_time": flight.departure_time.isoformat().replace("+00:00", "Z"),
+                        "arrival_time": flight.arrival_time.isoformat().replace("+00:00", "Z"),
+                        "airplane": flight.airplane.name
+                    }
+                }
+            ]
+        )
+
+    def test_order_list_expanded_tickets_in_constant_queries(self) -> None:
+        airplane = sample_airplane(rows=10, seats_in_row=10)
+
+        def queries_for_list() -> int:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(ORDER_URL, {"expand": "tickets"})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries.captured_queries)
+
+        Ticket.objects.create(row=1, seat=1, flight=sample_flight(airplane=airplane), order=self.order)
+        queries = queries_for_list()
+
+        for seat in range(2, 7):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                flight=sample_flight(
+                    airplane=airplane,
+                    departure_time=datetime(2024, 1, seat, 6),
+                    arrival_time=datetime(2024, 1, seat, 8)
+                ),
+                order=Order.objects.create(user=self.user)
+            )
+
+        self.assertEqual(queries_for_list(), queries)
+
     def test_order_create_add_authenticated_user_to_order(self) -> None:
         response = self.client.post(ORDER_URL)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -150,8 +207,10 @@ class AuthenticatedOrderApiTest(TestCase):
 
         created_order = Order.objects.get(id=response.data["id"])
 
-        for ticket in created_order.tickets.all():
-            payload_ticket = payload["tickets"][ticket.id - 1]
+        for ticket, payload_ticket in zip(
+                created_order.tickets.order_by("id"),
+                payload["tickets"]
+        ):
             self.assertEqual(ticket.seat, payload_ticket["seat"])
             self.assertEqual(ticket.row, payload_ticket["row"])
             self.assertEqual(ticket.flight.id, payload_ticket["flight"])
@@ -363,6 +422,24 @@ class AuthenticatedTicketNestedViewApiTest(TestCase):
         for key, value in self.payload.items():
             self.assertEqual(serializer.data[key], value)
 
+    def test_ticket_create_with_idempotency_key_is_replayed(self) -> None:
+        responses = [
+            self.client.post(
+                self.list_url,
+                self.payload,
+                HTTP_IDEMPOTENCY_KEY="ticket-key"
+            )
+            for _ in range(2)
+        ]
+
+        self.assertEqual(responses[0].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(responses[1].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(responses[0].data, responses[1].data)
+        self.assertEqual(
+            Ticket.objects.filter(order=self.order).count(),
+            2
+        )
+
     def test_user_can_crete_ticket_only_for_own_order(self) -> None:
         another_user = get_user_model().objects.create_user(
             email="antother_user@antother.com",
@@ -454,3 +531,91 @@ class AuthenticatedTicketNestedViewApiTest(TestCase):
 
         response = self.client.delete(detail_url_with_another_user_order)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class IdempotentOrderApiTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_order_create_with_idempotency_key_is_replayed(self) -> None:
+        airplane = sample_airplane(rows=10, seats_in_row=10)
+        flight = sample_flight(airplane=airplane)
+        payload = {
+            "tickets": [
+                {
+                    "seat": 1,
+                    "row": 1,
+                    "flight": flight.id
+                }
+            ]
+        }
+
+        responses = [
+            self.client.post(
+                ORDER_URL,
+                data=json.dumps(payload),
+                content_type="application/json",
+                HTTP_IDEMPOTENCY_KEY="order-key"
+            )
+            for _ in range(2)
+        ]
+
+        self.assertEqual(responses[0].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(responses[1].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(responses[0].data, responses[1].data)
+        self.assertEqual(responses[1].headers["Idempotent-Replayed"], "true")
+        self.assertEqual(Ticket.objects.filter(flight=flight).count(), 1)
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 1)
+
+    def test_order_create_idempotency_key_with_other_payload(self) -> None:
+        airplane = sample_airplane(rows=10, seats_in_row=10)
+        flight = sample_flight(airplane=airplane)
+        self.client.post(ORDER_URL, HTTP_IDEMPOTENCY_KEY="order-key")
+
+        response = self.client.post(
+            ORDER_URL,
+            data=json.dumps(
+                {"tickets": [{"seat": 1, "row": 1, "flight": flight.id}]}
+            ),
+            content_type="application/json",
+            HTTP_IDEMPOTENCY_KEY="order-key"
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertFalse(Ticket.objects.filter(flight=flight).exists())
+
+    def test_order_create_expired_idempotency_key_is_not_replayed(self) -> None:
+        first_response = self.client.post(
+            ORDER_URL,
+            HTTP_IDEMPOTENCY_KEY="order-key"
+        )
+        IdempotencyKey.objects.filter(key="order-key").update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        response = self.client.post(ORDER_URL, HTTP_IDEMPOTENCY_KEY="order-key")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(response.data["id"], first_response.data["id"])
+        self.assertNotIn("Idempotent-Replayed", response.headers)
+
+    def test_order_create_failed_request_does_not_store_key(self) -> None:
+        payload = {"tickets": [{"seat": 1, "row": 1, "flight": 0}]}
+
+        response = self.client.post(
+            ORDER_URL,
+            data=json.dumps(payload),
+            content_type="application/json",
+            HTTP_IDEMPOTENCY_KEY="order-key"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
@@ -0,0 +1,122 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.tests.helpers import sample_airplane, sample_flight
+
+BULK_ORDER_URL = reverse("airport:order-bulk")
+
+
+class UnauthenticatedBulkOrderApiTest(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def test_auth_required(self) -> None:
+        response = self.client.post(BULK_ORDER_URL, data=[], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BulkOrderApiTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        self.flight = sample_flight(airplane=sample_airplane(rows=5, seats_in_row=4))
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=self.flight,
+            order=Order.objects.create(user=self.user)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def post(self, orders: list, atomic: bool = False):
+        url = BULK_ORDER_URL + ("?atomic=true" if atomic else "")
+        return self.client.post(
+            url,
+            data=json.dumps(orders),
+            content_type="application/json"
+        )
+
+    def test_orders_fail_on_their_own(self) -> None:
+        response = self.post(
+            [
+                {"tickets": [{"flight": self.flight.id, "row": 2, "seat": 1}]},
+                {"tickets": [{"flight": 0, "row": 2, "seat": 2}]},
+                {"tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]},
+                {"tickets": [{"flight": self.flight.id, "row": 2, "seat": 1}]},
+                {"tickets": [{"flight": self.flight.id, "row": 9, "seat": 1}]},
+                {"tickets": [{"flight": self.flight.id}]},
+            ]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.data["results"]
+        self.assertEqual(
+            [result["status"] for result in results],
+            [201, 400, 400, 400, 400, 201]
+        )
+        self.assertEqual(results[0]["order"]["tickets"][0]["row"], 2)
+        self.assertIn("flight", results[1]["errors"]["tickets"][0])
+        self.assertIn("non_field_errors", results[2]["errors"]["tickets"][0])
+        self.assertIn("row", results[4]["errors"]["tickets"][0])
+        self.assertEqual(Order.objects.count(), 3)
+
+    def test_atomic_batch_with_invalid_order(self) -> None:
+        response = self.post(
+            [
+                {"tickets": [{"flight": self.flight.id}]},
+                {"tickets": [{"flight": self.flight.id, "row": 1}]},
+            ],
+            atomic=True
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            [424, 400]
+        )
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_atomic_batch_queries_do_not_grow_with_orders(self) -> None:
+        query_counts = []
+        for count in (2, 8):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post(
+                    [
+                        {"tickets": [{"flight": self.flight.id}]}
+                        for _ in range(count)
+                    ],
+                    atomic=True
+                )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertEqual(Ticket.objects.count(), 11)
+        self.assertEqual(
+            Ticket.objects.values("flight", "row", "seat").distinct().count(),
+            11
+        )
+
+    def test_request_must_be_a_list(self) -> None:
+        response = self.post({"tickets": []})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(BULK_ORDER_MAX_SIZE=1)
+    def test_batch_size_limit(self) -> None:
+        response = self.post([{}, {}])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Order.objects.count(), 1)
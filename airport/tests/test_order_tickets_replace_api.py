@@ -0,0 +1,149 @@
+import json
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.inventory import generate_seats
+from airport.models import FlightSearchRow, Order, Seat, Ticket
+from airport.tests.helpers import sample_airplane, sample_flight
+
+
+def tickets_url(order_id: int) -> str:
+    return reverse("airport:order-ticket-list", args=[order_id])
+
+
+class ReplaceOrderTicketsApiTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        airplane = sample_airplane(rows=5, seats_in_row=4)
+        self.flight = sample_flight(airplane=airplane)
+        self.other_flight = sample_flight(
+            airplane=airplane,
+            departure_time=datetime(2024, 1, 2, 6),
+            arrival_time=datetime(2024, 1, 2, 8)
+        )
+        self.order = Order.objects.create(user=self.user)
+        self.tickets = [
+            Ticket.objects.create(row=1, seat=seat, flight=self.flight, order=self.order)
+            for seat in (1, 2, 3)
+        ]
+
+    def put(self, seats: list[tuple], order_id: int = None):
+        return self.client.put(
+            tickets_url(order_id or self.order.id),
+            data=json.dumps(
+                [{"flight": flight.id, "row": row, "seat": seat} for flight, row, seat in seats]
+            ),
+            content_type="application/json"
+        )
+
+    def seats(self) -> set[tuple]:
+        return set(self.order.tickets.values_list("id", "flight_id", "row", "seat"))
+
+    def test_only_changed_tickets_are_written(self) -> None:
+        kept, moved, deleted = self.tickets
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.put(
+                    [(self.flight, 1, 1), (self.flight, 4, 4), (self.other_flight, 2, 2)]
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        seats = self.seats()
+        self.assertIn((kept.id, self.flight.id, 1, 1), seats)
+        # One of the tickets leaving row 1 moves to row 4, the other is deleted
+        self.assertEqual(
+            [
+                (flight, row, seat) for ticket_id, flight, row, seat in seats
+                if ticket_id in (moved.id, deleted.id)
+            ],
+            [(self.flight.id, 4, 4)]
+        )
+        self.assertEqual(
+            {(flight, row, seat) for _, flight, row, seat in seats},
+            {(self.flight.id, 1, 1), (self.flight.id, 4, 4), (self.other_flight.id, 2, 2)}
+        )
+        updates = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "airport_ticket"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            FlightSearchRow.objects.get(flight=self.flight).available_seats, 18
+        )
+
+    def test_same_seats_write_nothing(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.put([(self.flight, 1, seat) for seat in (3, 2, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any(
+                query["sql"].startswith(("UPDATE", "INSERT", "DELETE"))
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_empty_list_deletes_all_tickets(self) -> None:
+        response = self.put([])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(self.order.tickets.exists())
+
+    def test_invalid_seats_change_nothing(self) -> None:
+        Ticket.objects.create(
+            row=5,
+            seat=4,
+            flight=self.flight,
+            order=Order.objects.create(user=self.user)
+        )
+        before = self.seats()
+
+        response = self.put(
+            [(self.flight, 1, 1), (self.flight, 5, 4), (self.flight, 9, 1), (self.flight, 1, 1)]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("non_field_errors", response.data[1])
+        self.assertIn("row", response.data[2])
+        self.assertIn("non_field_errors", response.data[3])
+        self.assertEqual(self.seats(), before)
+
+    def test_inventory_seats_follow_tickets(self) -> None:
+        generate_seats(self.flight)
+
+        response = self.put([(self.flight, 1, 1), (self.flight, 2, 2)])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(
+                Seat.objects.filter(
+                    flight=self.flight, ticket__isnull=False
+                ).values_list("row", "seat")
+            ),
+            {(1, 1), (2, 2)}
+        )
+
+    def test_other_users_order(self) -> None:
+        other_order = Order.objects.create(
+            user=get_user_model().objects.create_user(email="other@user.com")
+        )
+
+        response = self.put([(self.flight, 4, 1)], order_id=other_order.id)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Crew
+
+CREW_URL = reverse("airport:crew-list")
+
+
+@override_settings(ESTIMATED_COUNT_THRESHOLD=0)
+class EstimatedCountPaginationTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        Crew.objects.bulk_create(
+            [Crew(first_name="John", last_name=f"Doe {number}") for number in range(6)]
+        )
+
+    def get_page(self, page: int = 1, estimate: int = 2) -> dict:
+        with mock.patch("airport.pagination.planner_estimate", return_value=estimate):
+            response = self.client.get(CREW_URL, {"page": page})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=10_000)
+    def test_small_results_are_counted_exactly(self) -> None:
+        response = self.client.get(CREW_URL)
+
+        self.assertEqual(response.data["count"], 6)
+        self.assertFalse(response.data["count_is_estimate"])
+
+    def test_estimate_below_real_count_keeps_next_pages(self) -> None:
+        first_page = self.get_page(1)
+
+        self.assertEqual(first_page["count"], 2)
+        self.assertTrue(first_page["count_is_estimate"])
+        self.assertIsNotNone(first_page["next"])
+
+        last_page = self.get_page(2)
+
+        self.assertEqual(len(last_page["results"]), 2)
+        self.assertIsNone(last_page["next"])
+        self.assertEqual(last_page["count"], 6)
+        self.assertFalse(last_page["count_is_estimate"])
+
+    def test_estimate_above_real_count(self) -> None:
+        response = self.client.get(CREW_URL, {"page": 3})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        first_page = self.get_page(1, estimate=100)
+        self.assertEqual((first_page["count"], first_page["count_is_estimate"]), (100, True))
+        self.assertEqual(self.get_page(2, estimate=100)["count"], 6)
+
+    @override_settings(ESTIMATED_COUNT_CACHE_TIMEOUT=60)
+    def test_cached_exact_count(self) -> None:
+        self.assertEqual(self.get_page()["count"], 6)
+
+        Crew.objects.create(first_name="Jane", last_name="Doe")
+
+        with self.assertNumQueries(1):
+            first_page = self.get_page()
+        self.assertEqual(first_page["count"], 6)
+        self.assertTrue(first_page["count_is_estimate"])
@@ -0,0 +1,107 @@
+from datetime import date, datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from airport.filters import FlightSearchFilter
+from airport.models import Flight, FlightSearchRow
+from airport.partitions import (
+    DEFAULT_PARTITION,
+    create_partition,
+    detach_partition,
+    is_partitioned,
+    month_start,
+    partition_months
+)
+from airport.tests.helpers import sample_flight
+
+
+def flight_in(month: int, day: int = 1):
+    return sample_flight(
+        departure_time=datetime(2024, month, day, 6),
+        arrival_time=datetime(2024, month, day, 8)
+    )
+
+
+class FlightSearchPartitionsTest(TestCase):
+    def setUp(self) -> None:
+        # The rows go to the default partition, creating the partitions of
+        # their months moves them
+        self.january = flight_in(1)
+        self.march = flight_in(3)
+        create_partition(date(2024, 1, 1))
+        create_partition(date(2024, 3, 1))
+
+    def test_rows_are_moved_to_their_partitions(self) -> None:
+        self.assertTrue(is_partitioned())
+        self.assertFalse(create_partition(date(2024, 1, 15)))
+        self.assertEqual(partition_months(), [date(2024, 1, 1), date(2024, 3, 1)])
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{DEFAULT_PARTITION}"')
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(
+            set(FlightSearchRow.objects.values_list("flight_id", flat=True)),
+            {self.january.id, self.march.id}
+        )
+
+    def test_departure_window_reads_its_partitions_only(self) -> None:
+        search_qs = FlightSearchFilter(
+            {"start_departure_date": "2024-01-01", "end_departure_date": "2024-01-31"},
+            queryset=FlightSearchRow.objects.all()
+        ).qs
+
+        plan = search_qs.explain()
+
+        self.assertEqual(list(search_qs.values_list("flight_id", flat=True)), [self.january.id])
+        self.assertIn("flightsearchrow_202401", plan)
+        self.assertNotIn("flightsearchrow_202403", plan)
+        self.assertNotIn(DEFAULT_PARTITION, plan)
+
+    def test_flight_moved_to_another_month_keeps_one_row(self) -> None:
+        self.january.departure_time = datetime(2024, 3, 2, 6)
+        self.january.arrival_time = datetime(2024, 3, 2, 8)
+        self.january.save()
+
+        rows = FlightSearchRow.objects.filter(flight=self.january)
+        self.assertEqual(rows.count(), 1)
+        self.assertEqual(rows.get().departure_time.month, 3)
+
+    def test_command_creates_partitions_ahead_and_detaches_old_ones(self) -> None:
+        # Goes to the default partition until its month gets one
+        flight_in(5)
+        this_month = month_start(timezone.localdate())
+        out = StringIO()
+
+        call_command(
+            "flight_search_partitions",
+            "--ahead=1",
+            "--detach-before=2024-02",
+            stdout=out
+        )
+
+        self.assertIn("Detached airport_flightsearchrow_202401", out.getvalue())
+        months = partition_months()
+        self.assertNotIn(date(2024, 1, 1), months)
+        self.assertIn(this_month, months)
+        self.assertEqual(len([month for month in months if month > this_month]), 1)
+        self.assertFalse(FlightSearchRow.objects.filter(flight=self.january).exists())
+
+        call_command("flight_search_partitions", ahead=0, stdout=StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{DEFAULT_PARTITION}"')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_flights_of_detached_partition_can_be_deleted(self) -> None:
+        detach_partition(date(2024, 1, 1))
+
+        self.january.delete()
+
+        self.assertFalse(Flight.objects.filter(pk=self.january.pk).exists())
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM "airport_flightsearchrow_202401"')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            # Deferred foreign keys are checked at commit
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
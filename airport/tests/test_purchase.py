@@ -0,0 +1,193 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.test import APIClient
+
+from airport.models import Order, Seat, Ticket
+from airport.purchase import STRATEGIES, SeatTaken, get_purchase_strategy
+from airport.tests.helpers import sample_airplane, sample_flight
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class PurchaseStrategyTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        airplane = sample_airplane(rows=2, seats_in_row=3)
+        self.flight = sample_flight(airplane=airplane)
+        self.taken_ticket = Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=self.flight,
+            order=Order.objects.create(user=self.user)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_tickets(self, strategy_name: str, tickets_data: list[dict]) -> list[Ticket]:
+        with transaction.atomic():
+            order = Order.objects.create(user=self.user)
+            return get_purchase_strategy(strategy_name).create_tickets(
+                order,
+                tickets_data
+            )
+
+    def test_order_create_with_every_strategy(self) -> None:
+        for name in STRATEGIES:
+            with self.subTest(strategy=name), override_settings(
+                    SEAT_PURCHASE_STRATEGY=name
+            ):
+                Ticket.objects.exclude(pk=self.taken_ticket.pk).delete()
+                payload = {
+                    "tickets": [
+                        {"flight": self.flight.id, "row": 2, "seat": 3},
+                        {"flight": self.flight.id},
+                    ]
+                }
+
+                response = self.client.post(
+                    ORDER_URL,
+                    data=json.dumps(payload),
+                    content_type="application/json"
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+                seats = {
+                    (ticket["row"], ticket["seat"])
+                    for ticket in response.data["tickets"]
+                }
+                self.assertIn((2, 3), seats)
+                self.assertNotIn((1, 1), seats)
+
+    def test_taken_seat_aborts_order(self) -> None:
+        for name in ("unique_constraint", "flight_lock", "advisory_lock"):
+            with self.subTest(strategy=name):
+                with self.assertRaises(SeatTaken):
+                    self.create_tickets(
+                        name,
+                        [{"flight": self.flight, "row": 1, "seat": 1}]
+                    )
+                self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_optimistic_moves_ticket_to_nearest_free_seat(self) -> None:
+        tickets = self.create_tickets(
+            "optimistic",
+            [{"flight": self.flight, "row": 1, "seat": 1}]
+        )
+
+        self.assertEqual((tickets[0].row, tickets[0].seat), (1, 2))
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    def test_sold_out_flight(self) -> None:
+        for name in STRATEGIES:
+            with self.subTest(strategy=name):
+                with self.assertRaises(APIException):
+                    self.create_tickets(name, [{"flight": self.flight}] * 6)
+                self.assertEqual(Ticket.objects.count(), 1)
+
+    @override_settings(SEAT_PURCHASE_STRATEGY="unknown")
+    def test_unknown_strategy(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            get_purchase_strategy()
+
+
+class SeatInventoryTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        airplane = sample_airplane(rows=2, seats_in_row=3)
+        self.flight = sample_flight(airplane=airplane)
+        self.order = Order.objects.create(user=self.user)
+        self.sold_ticket = Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=self.flight,
+            order=self.order
+        )
+        call_command("generate_seat_inventory", self.flight.id, stdout=StringIO())
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def free_seats(self) -> set[tuple[int, int]]:
+        return set(
+            Seat.objects.filter(
+                flight=self.flight,
+                ticket__isnull=True
+            ).values_list("row", "seat")
+        )
+
+    def create_order(self, tickets: list[dict]):
+        return self.client.post(
+            ORDER_URL,
+            data=json.dumps({"tickets": tickets}),
+            content_type="application/json"
+        )
+
+    def test_generate_marks_sold_seats(self) -> None:
+        self.assertEqual(Seat.objects.filter(flight=self.flight).count(), 6)
+        self.assertEqual(self.sold_ticket.inventory_seat.row, 1)
+        self.assertNotIn((1, 1), self.free_seats())
+
+    def test_order_claims_inventory_seats(self) -> None:
+        response = self.create_order(
+            [
+                {"flight": self.flight.id, "row": 2, "seat": 2},
+                {"flight": self.flight.id},
+            ]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.free_seats(), {(1, 3), (2, 1), (2, 3)})
+        for ticket in Ticket.objects.exclude(pk=self.sold_ticket.pk):
+            seat = ticket.inventory_seat
+            self.assertEqual((seat.row, seat.seat), (ticket.row, ticket.seat))
+
+    def test_sold_inventory_seat_is_rejected(self) -> None:
+        with self.assertRaises(SeatTaken):
+            with transaction.atomic():
+                get_purchase_strategy().create_tickets(
+                    Order.objects.create(user=self.user),
+                    [{"flight": self.flight, "row": 1, "seat": 1}]
+                )
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_deleted_ticket_frees_seat(self) -> None:
+        self.order.delete()
+
+        self.assertEqual(len(self.free_seats()), 6)
+
+    def test_moved_ticket_moves_seat(self) -> None:
+        response = self.client.patch(
+            reverse(
+                "airport:order-ticket-detail",
+                kwargs={"order_pk": self.order.pk, "pk": self.sold_ticket.pk}
+            ),
+            {"row": 2, "seat": 3}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn((1, 1), self.free_seats())
+        self.assertNotIn((2, 3), self.free_seats())
+
+    def test_remove_inventory(self) -> None:
+        call_command(
+            "generate_seat_inventory",
+            self.flight.id,
+            remove=True,
+            stdout=StringIO()
+        )
+
+        self.assertFalse(Seat.objects.exists())
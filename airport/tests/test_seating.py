@@ -0,0 +1,127 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.seating import SeatMap
+from airport.tests.helpers import sample_airplane, sample_flight
+
+ORDER_URL = reverse("airport:order-list")
+TICKET_LIST_VIEW_NAME = "airport:order-ticket-list"
+
+
+class SeatMapTest(TestCase):
+    def test_find_adjacent_skips_taken_seats(self) -> None:
+        seat_map = SeatMap(rows=2, seats_in_row=4, taken=[(1, 2)])
+
+        self.assertEqual(seat_map.find_adjacent(2), [(1, 3), (1, 4)])
+        self.assertEqual(seat_map.find_adjacent(3), [(2, 1), (2, 2), (2, 3)])
+
+    def test_find_adjacent_without_enough_seats_in_a_row(self) -> None:
+        seat_map = SeatMap(rows=2, seats_in_row=4, taken=[(1, 2), (2, 3)])
+
+        self.assertIsNone(seat_map.find_adjacent(3))
+
+    def test_allocate_falls_back_to_nearest_seats(self) -> None:
+        seat_map = SeatMap(
+            rows=3,
+            seats_in_row=3,
+            taken=[(1, 2), (2, 2), (3, 1), (3, 2)]
+        )
+
+        seats = seat_map.allocate(3)
+
+        self.assertEqual(seats, [(1, 1), (1, 3), (2, 1)])
+        for row, seat in seats:
+            self.assertFalse(seat_map.is_free(row, seat))
+
+    def test_allocate_more_than_free_seats(self) -> None:
+        seat_map = SeatMap(rows=1, seats_in_row=2, taken=[(1, 1)])
+
+        self.assertIsNone(seat_map.allocate(2))
+        self.assertEqual(seat_map.free_count, 1)
+
+
+class AutoSeatAssignmentApiTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        self.airplane = sample_airplane(rows=3, seats_in_row=4)
+        self.flight = sample_flight(airplane=self.airplane)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_order(self, tickets: list[dict]):
+        return self.client.post(
+            ORDER_URL,
+            data=json.dumps({"tickets": tickets}),
+            content_type="application/json"
+        )
+
+    def test_order_tickets_without_seats_are_seated_together(self) -> None:
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=order)
+
+        response = self.create_order([{"flight": self.flight.id}] * 3)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        seats = sorted(
+            (ticket["row"], ticket["seat"])
+            for ticket in response.data["tickets"]
+        )
+        self.assertEqual(seats, [(2, 1), (2, 2), (2, 3)])
+
+    def test_order_assigned_seats_avoid_requested_seats(self) -> None:
+        response = self.create_order(
+            [
+                {"flight": self.flight.id, "row": 1, "seat": 1},
+                {"flight": self.flight.id},
+            ]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        seats = {
+            (ticket["row"], ticket["seat"])
+            for ticket in response.data["tickets"]
+        }
+        self.assertEqual(seats, {(1, 1), (1, 2)})
+
+    def test_order_not_enough_free_seats(self) -> None:
+        response = self.create_order([{"flight": self.flight.id}] * 13)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_order_ticket_with_row_only_is_rejected(self) -> None:
+        response = self.create_order([{"flight": self.flight.id, "row": 1}])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_order_on_flight_without_airplane_is_rejected(self) -> None:
+        flight = sample_flight(airplane=None)
+
+        for ticket in ({"flight": flight.id}, {"flight": flight.id, "row": 1, "seat": 1}):
+            with self.subTest(ticket=ticket):
+                response = self.create_order([ticket])
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("has no airplane", str(response.data["tickets"][0]["flight"]))
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_nested_ticket_create_without_seat(self) -> None:
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=order)
+
+        response = self.client.post(
+            reverse(TICKET_LIST_VIEW_NAME, kwargs={"order_pk": order.pk}),
+            {"flight": self.flight.id}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["row"], response.data["seat"]), (1, 2))
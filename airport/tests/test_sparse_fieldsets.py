@@ -0,0 +1,89 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Crew
+from airport.tests.helpers import detail_url, sample_airplane, sample_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+ROUTE_URL = reverse("airport:route-list")
+
+
+class SparseFieldsetsTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com",
+            password="password1234"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.flight = sample_flight(airplane=sample_airplane(rows=2, seats_in_row=2))
+        self.flight.crews.add(Crew.objects.create(first_name="Jane", last_name="Doe"))
+
+    def test_fields_limit_flight_list_and_skip_crews_query(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                FLIGHT_URL,
+                {"fields": "id,departure_time,available_tickets"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "departure_time", "available_tickets"}
+        )
+        self.assertFalse(
+            any("airport_crew" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_omit_drops_fields(self) -> None:
+        response = self.client.get(FLIGHT_URL, {"omit": "crews,route"})
+
+        flight = response.data["results"][0]
+        self.assertNotIn("crews", flight)
+        self.assertNotIn("route", flight)
+        self.assertIn("airplane", flight)
+
+    def test_fields_on_flight_detail_skip_joins(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                detail_url("airport:flight-detail", self.flight.id),
+                {"fields": "id,departure_time"}
+            )
+
+        self.assertEqual(set(response.data), {"id", "departure_time"})
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertNotIn("JOIN", queries.captured_queries[0]["sql"])
+
+    def test_fields_on_route_list_skip_airport_joins(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(ROUTE_URL, {"fields": "id,distance"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0]), {"id", "distance"})
+        route_queries = [
+            query["sql"] for query in queries.captured_queries
+            if 'FROM "airport_route"' in query["sql"]
+        ]
+        self.assertTrue(route_queries)
+        for sql in route_queries:
+            self.assertNotIn("JOIN", sql)
+
+    def test_nested_and_written_serializers_are_not_trimmed(self) -> None:
+        response = self.client.post(
+            f"{ORDER_URL}?fields=id",
+            data=json.dumps({"tickets": [{"flight": self.flight.id}]}),
+            content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(response.data["tickets"][0]), {"id", "seat", "row", "flight", "order"})
+        self.assertIn("created_at", response.data)
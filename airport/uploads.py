@@ -0,0 +1,147 @@
+import os
+import tempfile
+from io import BytesIO
+
+from PIL import Image
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import (
+    FileUploadHandler,
+    TemporaryFileUploadHandler
+)
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+ALLOWED_IMAGE_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+HEADER_SNIFF_SIZE = 256 * 2 ** 10
+MULTIPART_OVERHEAD = 64 * 2 ** 10
+
+
+class ImageTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "The uploaded image is too large."
+    default_code = "image_too_large"
+
+
+class MediaTemporaryUploadedFile(TemporaryUploadedFile):
+    """Temporary upload kept in ``AIRPLANE_IMAGE_UPLOAD_TEMP_DIR``.
+
+    The directory is outside MEDIA_ROOT so unfinished and rejected uploads
+    are never served. FileSystemStorage moves the file with ``os.rename``
+    when both paths live on the same file system and copies it otherwise.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            content_type: str,
+            size: int,
+            charset: str,
+            content_type_extra: dict = None
+    ) -> None:
+        temp_dir = settings.AIRPLANE_IMAGE_UPLOAD_TEMP_DIR
+        os.makedirs(temp_dir, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(
+            suffix=".upload" + os.path.splitext(name)[1],
+            dir=temp_dir
+        )
+        UploadedFile.__init__(
+            self, file, name, content_type, size, charset, content_type_extra
+        )
+
+
+class LimitedImageUploadHandler(TemporaryFileUploadHandler):
+    """Streams an image upload to disk and rejects it as early as possible.
+
+    The request is refused before reading when its Content-Length is over
+    the limit, otherwise the chunks are counted while they are written and
+    the image header is sniffed to check the format and pixel dimensions.
+    """
+
+    chunk_size = 64 * 2 ** 10
+
+    def handle_raw_input(
+            self,
+            input_data,
+            META: dict,
+            content_length: int,
+            boundary: bytes,
+            encoding: str = None
+    ) -> None:
+        max_size = settings.AIRPLANE_IMAGE_MAX_UPLOAD_SIZE
+        if content_length > max_size + MULTIPART_OVERHEAD:
+            raise ImageTooLarge(
+                f"The image can't be larger than {max_size} bytes."
+            )
+
+    def new_file(self, *args, **kwargs) -> None:
+        FileUploadHandler.new_file(self, *args, **kwargs)
+        self.file = MediaTemporaryUploadedFile(
+            self.file_name, self.content_type, 0, self.charset,
+            self.content_type_extra
+        )
+        self.received = 0
+        self.header = b""
+        self.header_checked = False
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        self.received += len(raw_data)
+        max_size = settings.AIRPLANE_IMAGE_MAX_UPLOAD_SIZE
+        if self.received > max_size:
+            self.reject(
+                ImageTooLarge(
+                    f"The image can't be larger than {max_size} bytes."
+                )
+            )
+
+        if not self.header_checked:
+            self.header += raw_data
+            self.check_header()
+
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size: int) -> UploadedFile:
+        if not self.header_checked:
+            self.check_header(complete=True)
+        return super().file_complete(file_size)
+
+    def check_header(self, complete: bool = False) -> None:
+        try:
+            with Image.open(BytesIO(self.header)) as image:
+                image_format, (width, height) = image.format, image.size
+        except Image.DecompressionBombError:
+            self.reject(
+                ImageTooLarge("The image has too many pixels.")
+            )
+        except (OSError, ValueError):
+            if complete or len(self.header) >= HEADER_SNIFF_SIZE:
+                self.reject(
+                    ValidationError(
+                        {"image": "Upload a valid image."}
+                    )
+                )
+            return
+
+        self.header_checked = True
+        self.header = b""
+        if image_format not in ALLOWED_IMAGE_FORMATS:
+            self.reject(
+                ValidationError(
+                    {
+                        "image": f"Unsupported image format: {image_format}. "
+                                 f"Allowed: {', '.join(ALLOWED_IMAGE_FORMATS)}"
+                    }
+                )
+            )
+
+        max_pixels = settings.AIRPLANE_IMAGE_MAX_PIXELS
+        if width * height > max_pixels:
+            self.reject(
+                ImageTooLarge(
+                    f"The image can't have more than {max_pixels} pixels."
+                )
+            )
+
+    def reject(self, error: APIException) -> None:
+        self.file.close()
+        raise error
@@ -13,6 +13,18 @@ from airport.views import (
     TicketNestedViewSet
 )
 
+
+class BulkReplaceNestedRouter(nested_routers.NestedSimpleRouter):
+    """Nested router that also maps ``PUT`` on the list URL to ``replace``"""
+
+    routes = [
+        route._replace(mapping={**route.mapping, "put": "replace"})
+        if isinstance(route, routers.Route) and route.name == "{basename}-list"
+        else route
+        for route in nested_routers.NestedSimpleRouter.routes
+    ]
+
+
 router = routers.DefaultRouter()
 
 router.register("countries", CountryViewSet, basename="country")
@@ -25,7 +37,7 @@ router.register("airplanes", AirplaneViewSet, basename="airplane")
 router.register("airplane-types", AirplaneTypeViewSet, basename="airplane-type")
 router.register("orders", OrderViewSet, basename="order")
 
-orders_router = nested_routers.NestedSimpleRouter(router, "orders", lookup="order")
+orders_router = BulkReplaceNestedRouter(router, "orders", lookup="order")
 orders_router.register("tickets", TicketNestedViewSet, basename="order-ticket")
 
 urlpatterns = router.urls + orders_router.urls
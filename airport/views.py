@@ -1,16 +1,33 @@
+from datetime import timedelta
 from typing import Type
 
-from django.db.models import QuerySet, F, Count, Q
+from django.conf import settings
+from django.db.models import Prefetch, QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 
-from airport.filters import FlightFilter
+from airport.availability import route_calendar
+from airport.boards import board_cache
+from airport.bulk_orders import create_orders
+from airport.bulk_tickets import replace_tickets
+from airport.crew_schedule import assign_crews, roster_conflicts, roster_queryset
+from airport.fieldsets import field_expanded, field_requested
+from airport.filters import (
+    CrewRosterFilter,
+    CrewRostersFilter,
+    FlightFilter,
+    FlightSearchFilter,
+    start_of_day
+)
+from airport.idempotency import IdempotentCreateMixin
+from airport.images import schedule_airplane_image_processing
 from airport.models import (
     Country,
     City,
@@ -21,8 +38,10 @@ from airport.models import (
     Airplane,
     AirplaneType,
     Order,
-    Ticket
+    Ticket,
+    FlightSearchRow
 )
+from airport.pagination import EstimatedCountPagination, RosterPagination
 from airport.permissions import IsAuthenticatedReadOnlyOrIsAdmin
 from airport.serializers import (
     CountrySerializer,
@@ -30,21 +49,31 @@ from airport.serializers import (
     CityListDetailSerializer,
     AirportSerializer,
     AirportListDetailSerializer,
+    AirportBoardSerializer,
     RouteSerializer,
     RouteListSerializer,
     CrewSerializer,
+    CrewAssignmentSerializer,
+    CrewConflictQuerySerializer,
+    CrewConflictSerializer,
+    CrewRosterSerializer,
     FlightShortListSerializer,
     FlightSerializer,
     FlightDetailSerializer,
-    FlightListSerializer,
+    FlightSearchRowSerializer,
+    FlightCalendarQuerySerializer,
+    FlightCalendarDaySerializer,
     AirplaneTypeSerializer,
     AirplaneSerializer,
     AirplaneImageSerializer,
     OrderCreateSerializer,
+    BulkOrderSerializer,
     OrderSerializer,
     OrderListDetailSerializer,
+    OrderExpandedSerializer,
     TicketSerializer
 )
+from airport.uploads import LimitedImageUploadHandler
 
 
 class CountryViewSet(viewsets.ModelViewSet):
@@ -58,7 +87,7 @@ class CityViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self) -> QuerySet:
         city_qs = super().get_queryset()
-        if self.action == "list":
+        if self.action == "list" and field_requested(self.request, "country"):
             return city_qs.select_related("country")
         return city_qs
 
@@ -74,15 +103,41 @@ class AirportViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self) -> QuerySet:
         airport_qs = super().get_queryset()
-        if self.action == "list":
+        if self.action == "list" and field_requested(
+            self.request, "closest_big_city"
+        ):
             return airport_qs.select_related("closest_big_city")
         return airport_qs
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action in ["list", "retrieve"]:
             return AirportListDetailSerializer
+        if self.action == "board":
+            return AirportBoardSerializer
         return super().get_serializer_class()
 
+    @action(
+        methods=["get"],
+        detail=True,
+        url_path="board",
+        url_name="board",
+        permission_classes=(IsAuthenticated,)
+    )
+    def board(self, request: Request, pk: int = None) -> Response:
+        """Endpoint returns the next departures and arrivals of the airport.
+
+        Served from memory, the board can be ``AIRPORT_BOARD_TTL`` seconds
+        old, see ``updated_at``.
+        """
+        try:
+            board = board_cache.get(int(pk))
+        except ValueError:
+            board = None
+        if board is None:
+            raise NotFound()
+        serializer = self.get_serializer(board)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 class RouteViewSet(viewsets.ModelViewSet):
     queryset = Route.objects.all()
@@ -92,7 +147,13 @@ class RouteViewSet(viewsets.ModelViewSet):
     def get_queryset(self) -> QuerySet:
         route_qs = super().get_queryset()
         if self.action == "list":
-            return route_qs.select_related("source", "destination")
+            # select_related() without names would follow every foreign key
+            related = tuple(
+                name for name in ("source", "destination")
+                if field_requested(self.request, name)
+            )
+            if related:
+                return route_qs.select_related(*related)
         return route_qs
 
     def get_serializer_class(self) -> Type[Serializer]:
@@ -104,10 +165,17 @@ class RouteViewSet(viewsets.ModelViewSet):
 class CrewViewSet(viewsets.ModelViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
+    pagination_class = EstimatedCountPagination
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "flight_short_list":
             return FlightShortListSerializer
+        if self.action == "assignments":
+            return CrewAssignmentSerializer
+        if self.action == "conflicts":
+            return CrewConflictSerializer
+        if self.action in ("roster", "bulk_roster"):
+            return CrewRosterSerializer
         return super().get_serializer_class()
 
     @action(
@@ -124,36 +192,173 @@ class CrewViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(flight_qs, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def _roster_response(
+            self,
+            request: Request,
+            roster_qs: QuerySet,
+            filterset_class: Type[CrewRosterFilter]
+    ) -> Response:
+        filterset = filterset_class(request.query_params, queryset=roster_qs)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        paginator = RosterPagination()
+        page = paginator.paginate_queryset(filterset.qs, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(
+        methods=["get"],
+        detail=True,
+        url_path="roster",
+        url_name="roster"
+    )
+    def roster(self, request: Request, pk=None) -> Response:
+        """Endpoint returns the flights of the specific crew by departure
+        time, filtered with ``?start_departure_date=&end_departure_date=``
+        and paginated with a cursor"""
+
+        crew = self.get_object()
+        return self._roster_response(
+            request,
+            roster_queryset().filter(crew_id=crew.pk),
+            CrewRosterFilter
+        )
+
+    @action(
+        methods=["get"],
+        detail=False,
+        url_path="rosters",
+        url_name="bulk-roster"
+    )
+    def bulk_roster(self, request: Request) -> Response:
+        """Endpoint returns the flights of the ``?crews=1,2,3`` crew members
+        by departure time, filtered and paginated like the roster of one"""
+
+        crews = request.query_params.get("crews", "")
+        if not crews:
+            raise ValidationError({"crews": "Give a comma separated list of crew ids."})
+        if len(crews.split(",")) > settings.CREW_ROSTER_MAX_CREWS:
+            raise ValidationError(
+                {
+                    "crews": f"Ensure there are no more than "
+                             f"{settings.CREW_ROSTER_MAX_CREWS} crew ids."
+                }
+            )
+        return self._roster_response(request, roster_queryset(), CrewRostersFilter)
+
+    @action(
+        methods=["post"],
+        detail=False,
+        url_path="assignments",
+        url_name="assignments"
+    )
+    def assignments(self, request: Request) -> Response:
+        """Endpoint for assigning crew members to flights in one request.
+
+        Either all assignments are added or, when a crew member would be on
+        overlapping flights, none.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {"non_field_errors": "Expected a list of assignments."}
+            )
+        if len(request.data) > settings.CREW_ASSIGNMENTS_MAX_SIZE:
+            raise ValidationError(
+                {
+                    "non_field_errors": f"Ensure there are no more than "
+                                        f"{settings.CREW_ASSIGNMENTS_MAX_SIZE} assignments."
+                }
+            )
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        assign_crews(serializer.validated_data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(
+        methods=["get"],
+        detail=False,
+        url_path="conflicts",
+        url_name="conflicts"
+    )
+    def conflicts(self, request: Request) -> Response:
+        """Endpoint returns the pairs of overlapping flights of the same crew
+        member in the ``?month=YYYY-MM`` roster"""
+
+        query = CrewConflictQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start = start_of_day(query.validated_data["month"])
+        end = (start + timedelta(days=32)).replace(day=1)
+        serializer = self.get_serializer(roster_conflicts(start, end), many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 class FlightViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Flight.objects.all().order_by("-departure_time", "id")
     serializer_class = FlightDetailSerializer
     filter_backends = [DjangoFilterBackend]
-    filterset_class = FlightFilter
+    pagination_class = EstimatedCountPagination
     permission_classes = (IsAuthenticated,)
 
+    @property
+    def filterset_class(self) -> type:
+        if self.action == "list":
+            return FlightSearchFilter
+        return FlightFilter
+
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "list":
-            return FlightListSerializer
+            return FlightSearchRowSerializer
+        if self.action == "calendar":
+            return FlightCalendarDaySerializer
         return super().get_serializer_class()
 
     def get_queryset(self) -> QuerySet:
-        flight_qs = super().get_queryset().select_related(
-            "airplane",
-            "route__source",
-            "route__destination"
-        ).prefetch_related(
-            "crews"
-        )
+        crews_requested = field_requested(self.request, "crews")
         if self.action == "list":
-            return flight_qs.annotate(
-                available_tickets=(
-                                          F("airplane__rows") *
-                                          F("airplane__seats_in_row")
-                                  ) - Count("tickets")
+            search_qs = FlightSearchRow.objects.order_by(
+                "-departure_time",
+                "flight_id"
+            )
+            if crews_requested:
+                return search_qs.prefetch_related("flight__crews")
+            return search_qs
+
+        flight_qs = super().get_queryset()
+        if field_requested(self.request, "airplane"):
+            flight_qs = flight_qs.select_related("airplane")
+        if field_requested(self.request, "route"):
+            flight_qs = flight_qs.select_related(
+                "route__source",
+                "route__destination"
             )
+        if crews_requested:
+            flight_qs = flight_qs.prefetch_related("crews")
         return flight_qs
 
+    @action(
+        methods=["get"],
+        detail=False,
+        url_path="calendar",
+        url_name="calendar"
+    )
+    def calendar(self, request: Request) -> Response:
+        """Endpoint returns the number of flights and the available seats
+        per day for a source and destination"""
+
+        query = FlightCalendarQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        route = Route.objects.filter(
+            source__name=query.validated_data["source"],
+            destination__name=query.validated_data["destination"]
+        ).first()
+        days = route_calendar(
+            route.pk if route else None,
+            query.validated_data["start"],
+            query.validated_data["end"]
+        )
+        serializer = self.get_serializer(days, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 class AirplaneTypeViewSet(viewsets.ModelViewSet):
     serializer_class = AirplaneTypeSerializer
@@ -177,38 +382,90 @@ class AirplaneViewSet(viewsets.ModelViewSet):
     )
     def upload_image(self, request: Request, pk: int = None) -> Response:
         """Endpoint for uploading image to specific airplane"""
+        request._request.upload_handlers = [
+            LimitedImageUploadHandler(request._request)
+        ]
         airplane = self.get_object()
         serializer = self.get_serializer(airplane, data=self.request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        # The variants of the previous image are replaced by the job
+        serializer.save(image_variant_names={})
+        schedule_airplane_image_processing(airplane.id)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class OrderViewSet(
+    IdempotentCreateMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet
 ):
     serializer_class = OrderListDetailSerializer
-    queryset = Order.objects.all().prefetch_related("tickets", "user")
+    queryset = Order.objects.all()
+    pagination_class = EstimatedCountPagination
     permission_classes = (IsAuthenticated,)
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "create":
             return OrderCreateSerializer
+        if self.action == "bulk_create":
+            return BulkOrderSerializer
+        if self.action in ("list", "retrieve") and field_expanded(self.request, "tickets"):
+            return OrderExpandedSerializer
         return super().get_serializer_class()
 
     def get_queryset(self) -> QuerySet:
-        return super().get_queryset().filter(
-            user=self.request.user
-        )
+        order_qs = super().get_queryset().filter(user=self.request.user)
+        if field_requested(self.request, "user"):
+            order_qs = order_qs.select_related("user")
+        if not field_requested(self.request, "tickets"):
+            return order_qs
+        if field_expanded(self.request, "tickets"):
+            return order_qs.prefetch_related(
+                Prefetch(
+                    "tickets",
+                    queryset=Ticket.objects.select_related(
+                        "flight__route__source",
+                        "flight__route__destination",
+                        "flight__airplane"
+                    ).order_by("id")
+                )
+            )
+        return order_qs.prefetch_related("tickets")
 
     def perform_create(self, serializer: OrderCreateSerializer) -> None:
         serializer.save(user=self.request.user)
 
+    @action(
+        methods=["post"],
+        detail=False,
+        url_path="bulk",
+        url_name="bulk"
+    )
+    def bulk_create(self, request: Request) -> Response:
+        """Endpoint for creating a list of orders in one request.
+
+        Every order is created or rejected on its own, with ``?atomic=true``
+        either all orders are created or none.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {"non_field_errors": "Expected a list of orders."}
+            )
+        if len(request.data) > settings.BULK_ORDER_MAX_SIZE:
+            raise ValidationError(
+                {
+                    "non_field_errors": f"Ensure there are no more than "
+                                        f"{settings.BULK_ORDER_MAX_SIZE} orders."
+                }
+            )
+        atomic = request.query_params.get("atomic", "").lower() in ("1", "true")
+        results, status_code = create_orders(request.user, request.data, atomic)
+        return Response({"results": results}, status=status_code)
 
-class TicketNestedViewSet(viewsets.ModelViewSet):
+
+class TicketNestedViewSet(IdempotentCreateMixin, viewsets.ModelViewSet):
     serializer_class = TicketSerializer
     queryset = Ticket.objects.all()
     permission_classes = (IsAuthenticated,)
@@ -230,3 +487,22 @@ class TicketNestedViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer: TicketSerializer) -> None:
         serializer.save(order=self._get_order())
+
+    def replace(self, request: Request, *args, **kwargs) -> Response:
+        """Endpoint for ``PUT`` on the ticket list, replacing the tickets of
+        the order with a ticket per given seat. Only the changed tickets are
+        written."""
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {"non_field_errors": "Expected a list of tickets."}
+            )
+        if len(request.data) > settings.ORDER_TICKETS_MAX_SIZE:
+            raise ValidationError(
+                {
+                    "non_field_errors": f"Ensure there are no more than "
+                                        f"{settings.ORDER_TICKETS_MAX_SIZE} tickets."
+                }
+            )
+        tickets = replace_tickets(self._get_order(), request.data)
+        serializer = self.get_serializer(tickets, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
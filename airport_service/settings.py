@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -47,11 +48,13 @@ INSTALLED_APPS = [
     "django_filters",
     "drf_spectacular",
     "user",
-    "airport"
+    "airport",
+    "jobs"
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    "airport.compression.CompressionMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -135,6 +138,31 @@ STATIC_URL = 'static/'
 MEDIA_URL = "media/"
 MEDIA_ROOT = "media/"
 
+# Resized copies of airplane images, (max width, max height) per variant.
+# Variants are created after the upload by the background job worker.
+AIRPLANE_IMAGE_VARIANTS = {
+    "thumbnail": (160, 120),
+    "card": (640, 480),
+    "full": (1920, 1440),
+}
+AIRPLANE_IMAGE_VARIANT_FORMAT = "WEBP"
+AIRPLANE_IMAGE_VARIANT_QUALITY = 80
+
+# Airplane image uploads are streamed to a temporary file in chunks and
+# rejected as soon as one of the limits is exceeded. The temporary files
+# stay outside MEDIA_ROOT, which is served publicly.
+AIRPLANE_IMAGE_MAX_UPLOAD_SIZE = 10 * 2 ** 20
+AIRPLANE_IMAGE_MAX_PIXELS = 40_000_000
+AIRPLANE_IMAGE_UPLOAD_TEMP_DIR = os.path.join(tempfile.gettempdir(), "airport-uploads")
+
+# How MEDIA_URL is served: "static" (django.conf.urls.static, DEBUG only),
+# "python" (FileResponse with range support), "x-accel-redirect" (nginx) or
+# "x-sendfile" (Apache / lighttpd).
+MEDIA_SERVE_MODE = os.environ.get("MEDIA_SERVE_MODE", "static")
+MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+MEDIA_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+MEDIA_MAX_AGE = 60 * 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -148,10 +176,68 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAdminUser"
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # orjson when installed, the stdlib json otherwise, with the same output.
+    # Compare them with `python manage.py bench_json_render`.
+    "DEFAULT_RENDERER_CLASSES": [
+        "airport.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "airport.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "PAGE_SIZE": 4,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Background jobs, run with `python manage.py run_worker`. Delays in seconds.
+JOBS_CONCURRENCY = int(os.environ.get("JOBS_CONCURRENCY", 4))
+JOBS_POLL_INTERVAL = 1.0
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BACKOFF = 10
+JOBS_RETRY_BACKOFF_MAX = 60 * 60
+JOBS_LOCK_TIMEOUT = 15 * 60
+JOBS_HOUSEKEEPING_INTERVAL = 60
+JOBS_RETENTION_DAYS = 7
+
+# How concurrent ticket purchases of a flight are coordinated:
+# "unique_constraint", "flight_lock", "advisory_lock" or "optimistic".
+# Compare them with `python manage.py bench_seat_purchase`.
+SEAT_PURCHASE_STRATEGY = os.environ.get(
+    "SEAT_PURCHASE_STRATEGY",
+    "unique_constraint"
+)
+SEAT_PURCHASE_MAX_RETRIES = 5
+
+# Directory of the files written by `python manage.py archive_flights`
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", BASE_DIR / "archive")
+
+# Largest number of orders accepted by POST /orders/bulk/
+BULK_ORDER_MAX_SIZE = 500
+
+# Largest number of seats accepted by PUT /orders/{id}/tickets/
+ORDER_TICKETS_MAX_SIZE = 500
+
+# Largest number of assignments accepted by POST /crews/assignments/
+CREW_ASSIGNMENTS_MAX_SIZE = 500
+
+# Largest number of crew ids accepted by GET /crews/rosters/
+CREW_ROSTER_MAX_CREWS = 100
+
+# GET /flights/calendar/, cached per route and month
+FLIGHT_CALENDAR_MAX_DAYS = 93
+FLIGHT_CALENDAR_CACHE_TIMEOUT = 60
+
+# GET /airports/{id}/board/, kept in process memory. Seconds.
+AIRPORT_BOARD_SIZE = 10
+AIRPORT_BOARD_TTL = 15
+AIRPORT_BOARD_MAX_STALE = 5 * 60
+
+# Responses of order and ticket creates sent with an Idempotency-Key header
+# are replayed for retries within this period.
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=360),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=5),
@@ -167,3 +253,30 @@ SPECTACULAR_SETTINGS = {
         "persistAuthorization": True
     }
 }
+
+# Response compression, Brotli when the `brotli` package is installed, gzip
+# otherwise. Bodies up to COMPRESSION_CACHE_MAX_SIZE bytes are kept compressed
+# in the cache for COMPRESSION_CACHE_TIMEOUT seconds (0 disables it).
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CONTENT_TYPES = (
+    "application/json",
+    "application/vnd.oai.openapi",
+    "application/vnd.oai.openapi+json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+)
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE_TIMEOUT = 60
+COMPRESSION_CACHE_MAX_SIZE = 2 ** 20
+
+# Above this many rows in the planner estimate, admin changelists and large
+# API lists show the estimate instead of running an exact COUNT(*). With a
+# cache timeout they show an exact count cached for that many seconds instead.
+ESTIMATED_COUNT_THRESHOLD = 10_000
+ESTIMATED_COUNT_CACHE_TIMEOUT = 0
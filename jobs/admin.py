@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "task",
+        "queue",
+        "status",
+        "attempts",
+        "run_at",
+        "locked_by",
+        "finished_at"
+    )
+    list_filter = ("status", "queue")
+    search_fields = ("task",)
+    readonly_fields = ("created_at", "locked_at", "finished_at", "last_error")
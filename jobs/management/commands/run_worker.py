@@ -0,0 +1,64 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandParser
+
+from jobs.queue import queue_depth
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Queue to process, can be repeated (default: default)"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.JOBS_CONCURRENCY,
+            help="Number of jobs run in parallel"
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds to wait when the queue is empty"
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once there are no more due jobs"
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print the queue depth and exit"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["stats"]:
+            for row in queue_depth():
+                self.stdout.write(
+                    f"{row['queue']:<20} {row['status']:<8} "
+                    f"{row['count']:>8}  oldest: {row['oldest_run_at']}"
+                )
+            return
+
+        queues = options["queues"] or ["default"]
+        self.stdout.write(
+            f"Worker started, queues: {', '.join(queues)}, "
+            f"concurrency: {options['concurrency']}"
+        )
+        Worker(
+            queues=queues,
+            concurrency=options["concurrency"],
+            poll_interval=options["poll_interval"],
+            burst=options["burst"],
+            log=self.stdout.write
+        ).run()
+        self.stdout.write(self.style.SUCCESS("Worker stopped"))
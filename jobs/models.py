@@ -0,0 +1,46 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    task = models.CharField(max_length=255)
+    queue = models.CharField(max_length=50, default="default")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [
+            models.Index(
+                fields=["queue", "run_at", "id"],
+                condition=Q(status="queued"),
+                name="job_queued_run_at_idx"
+            ),
+            models.Index(
+                fields=["locked_at"],
+                condition=Q(status="running"),
+                name="job_running_locked_at_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.id}. {self.task} ({self.status})"
@@ -0,0 +1,177 @@
+import random
+import traceback
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import get_task
+
+
+class LeaseLost(Exception):
+    """The job was requeued while it ran, its outcome belongs to the worker
+    that holds it now"""
+
+
+def enqueue(
+        task: str,
+        payload: Optional[dict] = None,
+        *,
+        queue: str = "default",
+        run_at: Optional[datetime] = None,
+        delay: Optional[timedelta] = None,
+        max_attempts: Optional[int] = None
+) -> Job:
+    """Store a job for the worker.
+
+    The job is part of the current transaction, so it is only picked up
+    once the data it refers to has been committed.
+    """
+    if run_at is None:
+        run_at = timezone.now() + (delay or timedelta())
+    return Job.objects.create(
+        task=task,
+        payload=payload or {},
+        queue=queue,
+        run_at=run_at,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS
+    )
+
+
+def claim(worker_id: str, queues: Iterable[str], limit: int) -> list[Job]:
+    """Lock up to ``limit`` due jobs for the worker.
+
+    ``SKIP LOCKED`` lets concurrent workers claim different jobs without
+    waiting on each other.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True).filter(
+                status=Job.Status.QUEUED,
+                queue__in=list(queues),
+                run_at__lte=now
+            ).order_by("run_at", "id")[:limit]
+        )
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status=Job.Status.RUNNING,
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=F("attempts") + 1
+            )
+    for job in jobs:
+        job.status = Job.Status.RUNNING
+        job.locked_by = worker_id
+        job.locked_at = now
+        job.attempts += 1
+    return jobs
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with up to 10% jitter"""
+    seconds = min(
+        settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1),
+        settings.JOBS_RETRY_BACKOFF_MAX
+    )
+    return timedelta(seconds=seconds * random.uniform(1, 1.1))
+
+
+def finish_job(job: Job, **changes) -> None:
+    """Record the outcome of a claimed job unless its lock timed out and
+    the job was requeued, or claimed again, meanwhile.
+
+    ``attempts`` goes up with every claim, so it tells apart two claims of
+    the same worker.
+    """
+    updated = Job.objects.filter(
+        pk=job.pk,
+        status=Job.Status.RUNNING,
+        locked_by=job.locked_by,
+        attempts=job.attempts
+    ).update(**changes)
+    if not updated:
+        raise LeaseLost(f"Job {job.pk} is no longer locked by {job.locked_by}")
+
+
+def run_job(job: Job) -> bool:
+    """Run a claimed job and record the outcome, returns True on success.
+    Raises ``LeaseLost`` when the outcome can't be recorded."""
+    try:
+        get_task(job.task)(**job.payload)
+    except Exception:
+        fail_job(job, traceback.format_exc())
+        return False
+
+    finish_job(
+        job,
+        status=Job.Status.DONE,
+        finished_at=timezone.now(),
+        last_error=""
+    )
+    return True
+
+
+def fail_job(job: Job, error: str) -> None:
+    now = timezone.now()
+    if job.attempts >= job.max_attempts:
+        changes = {"status": Job.Status.FAILED, "finished_at": now}
+    else:
+        changes = {
+            "status": Job.Status.QUEUED,
+            "run_at": now + retry_delay(job.attempts)
+        }
+    finish_job(job, last_error=error, **changes)
+
+
+def requeue_stale(timeout: timedelta) -> int:
+    """Give jobs of crashed workers back to the queue"""
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        locked_at__lt=timezone.now() - timeout
+    )
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED,
+        finished_at=timezone.now(),
+        last_error="Worker lock timed out."
+    )
+    return failed + stale.update(status=Job.Status.QUEUED)
+
+
+def purge_finished(older_than: timedelta) -> int:
+    deleted, _ = Job.objects.filter(
+        status__in=(Job.Status.DONE, Job.Status.FAILED),
+        finished_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+def queue_depth() -> list[dict]:
+    """Number of jobs and the oldest run_at per queue and status"""
+    return list(
+        Job.objects.values("queue", "status").annotate(
+            count=Count("id"),
+            oldest_run_at=Min("run_at")
+        ).order_by("queue", "status")
+    )
+
+
+def run_pending(
+        queues: Iterable[str] = ("default",),
+        worker_id: str = "inline"
+) -> int:
+    """Run every due job in the current thread, returns the number run"""
+    queues = list(queues)
+    processed = 0
+    while jobs := claim(worker_id, queues, limit=10):
+        for job in jobs:
+            try:
+                run_job(job)
+            except LeaseLost:
+                continue
+            processed += 1
+    return processed
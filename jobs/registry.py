@@ -0,0 +1,25 @@
+from typing import Callable
+
+_tasks: dict[str, Callable] = {}
+
+
+def task(name: str) -> Callable:
+    """Register a function that can be run by the job worker.
+
+    Tasks are looked up by name, so the name has to stay stable while jobs
+    for it are still queued. ``tasks`` modules of installed apps are
+    imported on startup.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        _tasks[name] = func
+        return func
+
+    return decorator
+
+
+def get_task(name: str) -> Callable:
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise LookupError(f"Task {name!r} is not registered.") from None
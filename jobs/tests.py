@@ -0,0 +1,149 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import (
+    LeaseLost,
+    claim,
+    enqueue,
+    queue_depth,
+    requeue_stale,
+    run_job,
+    run_pending
+)
+from jobs.registry import task
+
+calls = []
+
+
+@task("jobs.tests.record")
+def record(value: int) -> None:
+    calls.append(value)
+
+
+@task("jobs.tests.fail")
+def fail() -> None:
+    raise RuntimeError("Task failed")
+
+
+class JobQueueTest(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+
+    def test_enqueue_and_run_pending(self) -> None:
+        job = enqueue("jobs.tests.record", {"value": 1})
+
+        self.assertEqual(run_pending(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(calls, [1])
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_scheduled_job_is_not_claimed_before_run_at(self) -> None:
+        enqueue("jobs.tests.record", {"value": 1}, delay=timedelta(hours=1))
+
+        self.assertEqual(claim("worker", ["default"], 10), [])
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(calls, [])
+
+    def test_claim_only_requested_queues(self) -> None:
+        enqueue("jobs.tests.record", {"value": 1}, queue="other")
+        default_job = enqueue("jobs.tests.record", {"value": 2})
+
+        jobs = claim("worker", ["default"], 10)
+
+        self.assertEqual(jobs, [default_job])
+        self.assertEqual(jobs[0].status, Job.Status.RUNNING)
+        self.assertEqual(jobs[0].locked_by, "worker")
+
+    def test_claim_respects_limit(self) -> None:
+        for value in range(3):
+            enqueue("jobs.tests.record", {"value": value})
+
+        self.assertEqual(len(claim("worker", ["default"], 2)), 2)
+        self.assertEqual(len(claim("worker", ["default"], 2)), 1)
+
+    def test_failed_job_is_retried_with_backoff(self) -> None:
+        job = enqueue("jobs.tests.fail", max_attempts=3)
+
+        run_job(claim("worker", ["default"], 1)[0])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("Task failed", job.last_error)
+
+    def test_job_fails_after_max_attempts(self) -> None:
+        job = enqueue("jobs.tests.fail", max_attempts=1)
+
+        run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 1)
+
+    def test_unknown_task_fails_job(self) -> None:
+        job = enqueue("jobs.tests.unknown", max_attempts=1)
+
+        run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn("not registered", job.last_error)
+
+    def test_requeue_stale(self) -> None:
+        job = enqueue("jobs.tests.record", {"value": 1})
+        claim("worker", ["default"], 1)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(requeue_stale(timedelta(minutes=15)), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+
+    def test_stale_worker_does_not_overwrite_new_owner(self) -> None:
+        job = enqueue("jobs.tests.record", {"value": 1})
+        stale = claim("worker-1", ["default"], 1)[0]
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        requeue_stale(timedelta(minutes=15))
+        claim("worker-2", ["default"], 1)
+
+        with self.assertRaises(LeaseLost):
+            run_job(stale)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.RUNNING)
+        self.assertEqual(job.locked_by, "worker-2")
+        self.assertEqual(job.attempts, 2)
+
+    def test_queue_depth(self) -> None:
+        enqueue("jobs.tests.record", {"value": 1})
+        enqueue("jobs.tests.record", {"value": 2})
+        enqueue("jobs.tests.record", {"value": 3}, queue="other")
+
+        depth = {
+            (row["queue"], row["status"]): row["count"]
+            for row in queue_depth()
+        }
+
+        self.assertEqual(depth[("default", Job.Status.QUEUED)], 2)
+        self.assertEqual(depth[("other", Job.Status.QUEUED)], 1)
+
+    def test_run_worker_stats(self) -> None:
+        enqueue("jobs.tests.record", {"value": 1})
+
+        out = StringIO()
+        call_command("run_worker", "--stats", stdout=out)
+
+        self.assertIn("default", out.getvalue())
+        self.assertIn("queued", out.getvalue())
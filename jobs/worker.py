@@ -0,0 +1,96 @@
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import timedelta
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from jobs.models import Job
+from jobs.queue import LeaseLost, claim, purge_finished, requeue_stale, run_job
+
+
+class Worker:
+    """Polls the job table and runs claimed jobs in a thread pool"""
+
+    def __init__(
+            self,
+            queues: Iterable[str],
+            concurrency: int,
+            poll_interval: float,
+            burst: bool = False,
+            log: Callable[[str], None] = print
+    ) -> None:
+        self.queues = list(queues)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.log = log
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = False
+        self.housekeeping_at = 0.0
+
+    def stop(self, *args) -> None:
+        self.log("Stopping after the running jobs are finished...")
+        self.stopping = True
+
+    def execute(self, job: Job) -> None:
+        try:
+            if run_job(job):
+                self.log(f"Job {job.id} {job.task} done")
+            else:
+                self.log(f"Job {job.id} {job.task} failed")
+        except LeaseLost:
+            self.log(
+                f"Job {job.id} {job.task} lost its lock, its outcome is "
+                "left to the worker running it again"
+            )
+        finally:
+            close_old_connections()
+
+    def housekeeping(self) -> None:
+        if time.monotonic() < self.housekeeping_at:
+            return
+        self.housekeeping_at = (
+            time.monotonic() + settings.JOBS_HOUSEKEEPING_INTERVAL
+        )
+        requeued = requeue_stale(
+            timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+        )
+        if requeued:
+            self.log(f"Requeued {requeued} stale jobs")
+        purge_finished(timedelta(days=settings.JOBS_RETENTION_DAYS))
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        running: set[Future] = set()
+
+        with ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix="job-worker"
+        ) as pool:
+            while not self.stopping:
+                close_old_connections()
+                self.housekeeping()
+                jobs = []
+                free_slots = self.concurrency - len(running)
+                if free_slots:
+                    jobs = claim(self.worker_id, self.queues, free_slots)
+                    running.update(
+                        pool.submit(self.execute, job) for job in jobs
+                    )
+
+                if self.burst and not jobs and not running:
+                    break
+                if running:
+                    _, running = wait(
+                        running,
+                        timeout=self.poll_interval,
+                        return_when=FIRST_COMPLETED
+                    )
+                elif not jobs:
+                    time.sleep(self.poll_interval)